@@ -5,7 +5,7 @@ from flask_migrate import Migrate
 from flask_login import LoginManager
 from flask_wtf.csrf import CSRFProtect
 
-from config import Config
+from config import get_config
 
 db = SQLAlchemy()
 login_manager = LoginManager()
@@ -14,9 +14,12 @@ csrf = CSRFProtect()
 
 login_manager.login_view = 'auth.login'
 
-def create_app(config_class=Config):
+def create_app(config_class=None):
     app = Flask(__name__)
-    app.config.from_object(config_class)
+    # Sin clase explícita se usa el perfil de APP_ENV (development, production, testing)
+    app.config.from_object(config_class or get_config())
+    if not app.config.get("SECRET_KEY"):
+        raise RuntimeError("SECRET_KEY no está configurada")
 
     db.init_app(app)
     migrate.init_app(app, db)
@@ -24,9 +27,22 @@ def create_app(config_class=Config):
     csrf.init_app(app)
 
     with app.app_context():
+        from .database import configurar_sqlite
+        configurar_sqlite(db.engine, app.config.get("SQLITE_PRAGMAS"))
+        from .servicios.instrumentacion import instrumentacion
+        instrumentacion.init_app(app, db.engine)
+
         #from app import routes, models, errors  # Import routes and models
         # Importá los modelos aquí para que Flask-Migrate los detecte
         from . import models
+        from .servicios.user_cache import user_cache
+        user_cache.init_app(app)
+        from .servicios.passwords import password_hasher
+        password_hasher.init_app(app)
+        from .servicios.sync_jobs import sync_jobs
+        sync_jobs.init_app(app)
+        from .servicios.registro_sheets import sheets
+        sheets.init_app(app)
         from .routes.main import main as main_blueprint
         from .routes.auth import auth as auth_blueprint
         app.register_blueprint(main_blueprint)
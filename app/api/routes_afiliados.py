@@ -1,73 +1,354 @@
-import os
+import hmac
+from datetime import date
+from functools import wraps
 
-from dotenv import load_dotenv
-from flask import Blueprint, jsonify
-from ..servicios.sheets_service import SheetsService
-from ..servicios.repository import GoogleSheetsRepository
-from ..servicios.transformer import DataTransformer
-from ..servicios.sheets_client import GoogleSheetsClient
-#from ..models.afiliado import Afiliado, Conyuge
-from .. import db
+import click
 
-# Cargar variables de entorno
-load_dotenv()
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context, url_for
+from flask_login import current_user
+from ..servicios.registro_sheets import sheets
+from ..servicios.sync_state import SincronizacionConcurrente, SyncStateRepository
+from ..servicios.loader import AfiliadoBulkLoader
+from ..servicios.consultas import listar_afiliados, listar_familias, obtener_afiliado_con_familia
+from ..servicios.busqueda import buscar_afiliados
+from ..servicios.estadisticas import leer_estadisticas, recalcular_estadisticas
+from ..servicios.serializadores import afiliado_con_familia_a_dict, sync_job_a_dict
+from ..servicios.sync_jobs import sync_jobs
+from ..models.modelo_sync_job import SyncJob
+from ..servicios.kits import AsignadorKits
+from ..servicios.resiliencia import CircuitoAbierto
+from .streaming import agrupar, gzip_chunks, json_array_chunks, ndjson_chunks
+from .. import csrf, db
 
-# Ruta al archivo
-SERVICE_ACCOUNT_FILE = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+# Definir el Blueprint
+afiliados_bp = Blueprint("afiliados", __name__, url_prefix="/api/afiliados")
 
-# Archivo JSON de la cuenta de servicio de Google
-SPREADSHEET_ID = os.getenv("SPREADSHEET_ID")
+# El cliente, el servicio y la cache de Google Sheets se arman en el primer uso
+# (ver servicios/registro_sheets.py); la hoja se lee recién en el primer pedido
 
-RANGE_NAME = os.getenv("RANGE_NAME")
 
-# Definir el Blueprint
-afiliados_bp = Blueprint("afiliados", __name__, url_prefix="/api/afiliados")
+@afiliados_bp.errorhandler(CircuitoAbierto)
+def sheets_no_disponible(error):
+    # Google Sheets viene fallando: se responde rápido en lugar de esperar reintentos
+    response = jsonify({"status": "error", "message": str(error)})
+    if error.reintentar_en is not None:
+        response.headers["Retry-After"] = str(max(1, round(error.reintentar_en)))
+    return response, 503
+
+
+@afiliados_bp.route("/sync", methods=["GET"])
+def sync_afiliados():
+    if request.args.get("modo") == "incremental":
+        # La carga incremental escribe en la base y avanza la marca de agua: un GET
+        # (prefetch, crawler, reintento) no debe consumir filas
+        return jsonify({
+            "status": "error",
+            "message": "La sincronización incremental se encola con POST /api/afiliados/sync?modo=incremental"
+        }), 400
 
-# Instanciar cliente y servicio
-# Inicialización
-client = GoogleSheetsClient(credentials_file=SERVICE_ACCOUNT_FILE, 
-                            spreadsheet_id=SPREADSHEET_ID)
-repo = GoogleSheetsRepository(client)
+    formato = formato_streaming()
+    if formato is not None:
+        return sync_streaming(formato)
 
-service = SheetsService(repo, DataTransformer())
+    data, etag = sheets.cached.get_con_etag(range_name=sheets.range_name)
+    if etag_coincide(etag):
+        return no_modificado(etag)
 
+    response = jsonify({
+        "status": "ok",
+        "total": len(data),
+        "data": data,
+        "message": "Datos sincronizados correctamente"
+        
+    })
+    response.set_etag(etag, weak=True)
+    return response, 200
 
-sheets_service = service.get_normalized_data(range_name=RANGE_NAME)
 
+def etag_coincide(etag):
+    """True si el cliente ya tiene esta versión de los datos (If-None-Match)."""
+    return etag is not None and request.if_none_match.contains_weak(etag)
 
-# @afiliados_bp.route("/sync", methods=["POST"])
-# def sync_afiliados():
-#     # 1️⃣ Obtener datos normalizados
-#     data = sheets_service
 
-#     # 2️⃣ Convertir a modelos SQLAlchemy
-#     # afiliados_instances = []
-#     # for row in data:
-#     #     #afiliado = Afiliado()
-#     #     #afiliados_instances.append(afiliado)
+def no_modificado(etag):
+    """Respuesta 304 sin cuerpo: el cliente reutiliza la copia que ya tiene."""
+    response = Response(status=304)
+    response.set_etag(etag, weak=True)
+    return response
 
-#     #     # Si tiene cónyuge
-#     #     if row.get("conyuge"):
-#     #         conyuge = Conyuge(
-#     #             nombre_apellido=row["conyuge"]["nombre_apellido"],
-#     #             dni=row["conyuge"]["dni"],
-#     #             afiliado_id=None  # asignar después si necesitas
-#     #         )
-#     #         db.session.add(conyuge)
 
-#     # # 3️⃣ Guardar en la base de datos
-#     # db.session.add_all(afiliados_instances)
-#     # db.session.commit()
+def formato_streaming():
+    """
+    Decide si la respuesta se envía en streaming y en qué formato.
 
-#     return jsonify({"status": "ok", "total_afiliados": len(data)}), 200
-@afiliados_bp.route("/sync", methods=["GET"])
-def sync_afiliados():
-    
+    - ?formato=ndjson o Accept: application/x-ndjson -> una línea JSON por afiliado
+    - ?stream=1 -> el mismo objeto JSON de siempre, codificado de a un afiliado
+
+    Returns:
+        str | None: "ndjson", "json" o None para la respuesta tradicional
+    """
+    formato = request.args.get("formato")
+    if formato == "ndjson":
+        return "ndjson"
+    if formato is None and request.accept_mimetypes.best == "application/x-ndjson":
+        return "ndjson"
+    if request.args.get("stream") in ("1", "true") or formato == "json-stream":
+        return "json"
+    return None
+
+
+def sync_streaming(formato):
+    """Envía los afiliados a medida que se codifican, opcionalmente comprimidos con gzip."""
+    items, etag = sheets.cached.iter_con_etag(range_name=sheets.range_name)
+    if etag is not None and formato == "ndjson":
+        # Otra representación de los mismos datos: necesita su propio ETag
+        etag = f"{etag}-ndjson"
+    if etag_coincide(etag):
+        return no_modificado(etag)
+
+    if formato == "ndjson":
+        chunks = ndjson_chunks(items)
+        mimetype = "application/x-ndjson"
+    else:
+        chunks = json_array_chunks(items, {
+            "status": "ok",
+            "message": "Datos sincronizados correctamente",
+        })
+        mimetype = "application/json"
+
+    chunks = agrupar(chunks)
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    # Calidad y no "in": "gzip;q=0" significa que el cliente no acepta gzip
+    if request.accept_encodings["gzip"] > 0:
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+
+    response = Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
+    if etag is not None:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def requiere_autorizacion(vista):
+    """
+    Permite la vista a clientes con el token SYNC_API_TOKEN (Authorization: Bearer ...)
+    o a usuarios con sesión iniciada. Con sesión se valida además el token CSRF: la
+    vista es csrf.exempt solo para los clientes con token, que el navegador no envía solo.
+    """
+    @wraps(vista)
+    def decorada(*args, **kwargs):
+        token = current_app.config.get("SYNC_API_TOKEN")
+        if token and hmac.compare_digest(request.headers.get("Authorization", ""),
+                                         f"Bearer {token}"):
+            return vista(*args, **kwargs)
+        if current_app.config.get("LOGIN_DISABLED") or current_user.is_authenticated:
+            if current_app.config.get("WTF_CSRF_ENABLED", True):
+                csrf.protect()
+            return vista(*args, **kwargs)
+        return jsonify({"status": "error", "message": "No autorizado"}), 401, \
+            {"WWW-Authenticate": "Bearer"}
+    return decorada
+
+
+@afiliados_bp.route("/sync", methods=["POST"])
+@csrf.exempt
+@requiere_autorizacion
+def encolar_sync():
+    """
+    Encola una sincronización en segundo plano y responde enseguida con 202.
+    ?modo=incremental carga solo las filas nuevas; por defecto se carga la hoja completa.
+    """
+    modo = request.args.get("modo", "completo")
+    if modo not in ("completo", "incremental"):
+        return jsonify({"status": "error", "message": f"Modo inválido: {modo}"}), 400
+
+    job = sync_jobs.encolar(modo, sheets.range_name,
+                            lambda loader: ejecutar_carga(loader, incremental=modo == "incremental"))
+    estado_url = url_for(".estado_sync", id_job=job.id)
     return jsonify({
         "status": "ok",
-        "total": len(sheets_service),
-        "data": sheets_service,
-        "message": "Datos sincronizados correctamente"
-        
+        "data": sync_job_a_dict(job),
+        "estado_url": estado_url,
+        "message": "Sincronización encolada"
+    }), 202, {"Location": estado_url}
+
+
+@afiliados_bp.route("/sync/jobs/<int:id_job>", methods=["GET"])
+def estado_sync(id_job):
+    """Estado y progreso de una sincronización encolada."""
+    job = db.session.get(SyncJob, id_job)
+    if job is None:
+        return jsonify({"status": "error", "message": "Sincronización no encontrada"}), 404
+
+    return jsonify({"status": "ok", "data": sync_job_a_dict(job)}), 200
+
+
+def ejecutar_carga(loader, incremental=False):
+    """Carga la hoja completa en streaming, o solo las filas nuevas, y devuelve el resumen."""
+    if incremental:
+        return cargar_incremental(loader)[3]
+    # Se carga en streaming: cada lote se escribe apenas se normaliza
+    return loader.load(sheets.service.iter_normalized_data(range_name=sheets.range_name))
+
+
+def cargar_incremental(loader):
+    """
+    Lee las filas nuevas de la hoja, las carga con `loader` y recién entonces
+    avanza la marca de agua guardada en SYNC_ESTADO. Si otra sincronización la
+    movió mientras tanto, la marca no se toca (las filas cargadas de nuevo no
+    cambian nada: la carga es un upsert) y se lanza SincronizacionConcurrente.
+
+    Returns:
+        tuple: (fila desde la que se leyó, nueva última fila, filas normalizadas, resumen de la carga)
+    """
+    range_name = sheets.range_name
+    estados = SyncStateRepository()
+    desde = estados.get(range_name).ultima_fila
+    db.session.commit()
+
+    data, ultima_fila = sheets.service.get_incremental_data(range_name=range_name, ultima_fila=desde)
+    resumen = loader.load(data)
+    try:
+        estados.avanzar(range_name, desde, ultima_fila, data)
+    except SincronizacionConcurrente:
+        db.session.rollback()
+        raise
+    db.session.commit()
+    return desde, ultima_fila, data, resumen
+
+
+@afiliados_bp.route("/listado", methods=["GET"])
+def listado_afiliados():
+    """Listado paginado por cursor y filtrable de los afiliados cargados en la base."""
+    try:
+        data, siguiente = listar_afiliados(request.args)
+    except ValueError as error:
+        return jsonify({"status": "error", "message": str(error)}), 400
+
+    return jsonify({
+        "status": "ok",
+        "total": len(data),
+        "data": data,
+        "siguiente": siguiente,
+    }), 200
+
+
+@afiliados_bp.route("/search", methods=["GET"])
+def buscar():
+    """Búsqueda por nombre, DNI o legajo (del afiliado o su familia), por relevancia."""
+    try:
+        data, siguiente = buscar_afiliados(request.args)
+    except ValueError as error:
+        return jsonify({"status": "error", "message": str(error)}), 400
+
+    return jsonify({
+        "status": "ok",
+        "total": len(data),
+        "data": data,
+        "siguiente": siguiente,
+    }), 200
+
+
+@afiliados_bp.route("/stats", methods=["GET"])
+def estadisticas_afiliados():
+    """Conteos de afiliados por dimensión y de hijos por edad, precalculados en ESTADISTICAS."""
+    fecha = request.args.get("fecha")
+    try:
+        referencia = date.fromisoformat(fecha) if fecha else None
+    except ValueError:
+        return jsonify({"status": "error",
+                        "message": "'fecha' debe tener el formato AAAA-MM-DD"}), 400
+
+    return jsonify({"status": "ok", "data": leer_estadisticas(referencia)}), 200
+
+
+@afiliados_bp.route("/<int:id_afiliado>", methods=["GET"])
+def detalle_afiliado(id_afiliado):
+    """Afiliado con cónyuges, hijos y kits, cargados en una cantidad fija de consultas."""
+    afiliado = obtener_afiliado_con_familia(id_afiliado)
+    if afiliado is None:
+        return jsonify({"status": "error", "message": "Afiliado no encontrado"}), 404
+
+    return jsonify({"status": "ok", "data": afiliado_con_familia_a_dict(afiliado)}), 200
+
+
+@afiliados_bp.route("/familias", methods=["GET"])
+def listado_familias():
+    """Página de afiliados con su familia y kits, paginada por cursor."""
+    try:
+        afiliados, siguiente = listar_familias(request.args)
+    except ValueError as error:
+        return jsonify({"status": "error", "message": str(error)}), 400
+
+    return jsonify({
+        "status": "ok",
+        "total": len(afiliados),
+        "data": [afiliado_con_familia_a_dict(afiliado) for afiliado in afiliados],
+        "siguiente": siguiente,
     }), 200
 
+
+@afiliados_bp.cli.command("cargar")
+@click.option("--incremental", is_flag=True,
+              help="Cargar solo las filas agregadas desde la última carga.")
+@click.option("--batch-size", default=500, show_default=True,
+              help="Cantidad de afiliados por lote.")
+@click.option("--eliminar-ausentes", is_flag=True,
+              help="Borrar los afiliados que ya no están en la hoja (solo carga completa).")
+@click.option("--max-eliminaciones", default=100, show_default=True,
+              help="Con --eliminar-ausentes, no borrar nada si hay más ausentes que este número.")
+@click.option("--simular-eliminacion", is_flag=True,
+              help="Con --eliminar-ausentes, listar los ausentes sin borrarlos.")
+def cargar_afiliados(incremental, batch_size, eliminar_ausentes, max_eliminaciones,
+                     simular_eliminacion):
+    """Carga los afiliados de la hoja en AFILIADOS, CONYUGES e HIJOS."""
+    if incremental and eliminar_ausentes:
+        raise click.UsageError("--eliminar-ausentes requiere la carga completa")
+    if simular_eliminacion and not eliminar_ausentes:
+        raise click.UsageError("--simular-eliminacion requiere --eliminar-ausentes")
+    loader = AfiliadoBulkLoader(batch_size=batch_size, eliminar_ausentes=eliminar_ausentes,
+                                max_eliminaciones=max_eliminaciones,
+                                simular_eliminacion=simular_eliminacion)
+    try:
+        resumen = ejecutar_carga(loader, incremental=incremental)
+    except SincronizacionConcurrente as error:
+        raise click.ClickException(str(error)) from None
+
+    click.echo(
+        f"Afiliados: {resumen['afiliados']}, cónyuges: {resumen['conyuges']}, "
+        f"hijos: {resumen['hijos']}, omitidos: {resumen['omitidos']}"
+    )
+    click.echo(
+        f"Insertados: {resumen['insertados']}, actualizados: {resumen['actualizados']}, "
+        f"sin cambios: {resumen['sin_cambios']}, eliminados: {resumen['eliminados']}"
+    )
+    for motivo, cantidad in sorted(loader.rechazos.por_motivo.items(), key=lambda m: -m[1]):
+        click.echo(f"  Rechazados ({motivo}): {cantidad}")
+    if loader.eliminacion_omitida is not None:
+        click.echo(f"Ausentes sin borrar ({loader.eliminacion_omitida}): {resumen['ausentes']}")
+        for dni in loader.ausentes:
+            click.echo(f"  {dni}")
+
+
+@afiliados_bp.cli.command("asignar-kits")
+@click.option("--fecha", default=None,
+              help="Fecha de referencia para calcular las edades (AAAA-MM-DD). Por defecto hoy.")
+@click.option("--dry-run", is_flag=True, help="Calcular sin insertar los kits.")
+def asignar_kits(fecha, dry_run):
+    """Asigna los kits del catálogo a todos los hijos según su edad."""
+    referencia = date.fromisoformat(fecha) if fecha else None
+    resumen = AsignadorKits().asignar(fecha_referencia=referencia, dry_run=dry_run)
+    click.echo(
+        f"Hijos: {resumen['hijos']}, kits asignados: {resumen['asignados']}, "
+        f"ya existentes: {resumen['existentes']}, sin kit: {resumen['sin_kit']}"
+    )
+
+
+@afiliados_bp.cli.command("recalcular-estadisticas")
+def recalcular_conteos():
+    """Recalcula desde cero los conteos de ESTADISTICAS (la carga los mantiene al día)."""
+    resumen = recalcular_estadisticas()
+    click.echo(
+        f"Afiliados: {resumen['afiliados']}, hijos: {resumen['hijos']}, "
+        f"filas de estadísticas: {resumen['filas']}"
+    )
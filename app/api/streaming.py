@@ -0,0 +1,75 @@
+import zlib
+from typing import Any, Dict, Iterable, Iterator
+
+from flask import current_app
+
+# Codificación incremental de respuestas JSON
+
+# Tamaño aproximado de cada fragmento enviado al cliente
+CHUNK_BYTES = 64 * 1024
+
+
+def json_array_chunks(items: Iterable[Any], envelope: Dict[str, Any],
+                      key: str = "data") -> Iterator[bytes]:
+    """
+    Codifica un objeto JSON cuyo campo `key` es un arreglo, serializando los
+    elementos de a uno a medida que se consumen.
+
+    Como la cantidad de elementos se conoce recién al final, el campo "total" se
+    escribe después del arreglo.
+
+    Parameters:
+        items(Iterable[Any]): Elementos del arreglo.
+        envelope(Dict[str, Any]): Resto de los campos del objeto (status, message, ...).
+        key(str): Nombre del campo que contiene el arreglo.
+
+    Returns:
+        Iterator[bytes]: Fragmentos del documento JSON
+    """
+    dumps = current_app.json.dumps
+    cabecera = dumps(envelope)[:-1]
+    separador = ", " if envelope else ""
+    yield f'{cabecera}{separador}"{key}": ['.encode()
+
+    total = 0
+    for item in items:
+        prefijo = ", " if total else ""
+        yield (prefijo + dumps(item)).encode()
+        total += 1
+
+    yield f'], "total": {total}}}'.encode()
+
+
+def ndjson_chunks(items: Iterable[Any]) -> Iterator[bytes]:
+    """Codifica cada elemento como una línea JSON (application/x-ndjson)."""
+    dumps = current_app.json.dumps
+    for item in items:
+        yield (dumps(item) + "\n").encode()
+
+
+def agrupar(chunks: Iterable[bytes], size: int = CHUNK_BYTES) -> Iterator[bytes]:
+    """Junta fragmentos chicos en bloques de ~`size` bytes para no escribir de a pocos bytes."""
+    buffer = []
+    acumulado = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        acumulado += len(chunk)
+        if acumulado >= size:
+            yield b"".join(buffer)
+            buffer = []
+            acumulado = 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """
+    Comprime al vuelo una secuencia de fragmentos en formato gzip.
+
+    Cada fragmento se vacía con Z_SYNC_FLUSH para que el cliente pueda empezar a
+    descomprimir sin esperar el final de la respuesta.
+    """
+    compresor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        yield compresor.compress(chunk) + compresor.flush(zlib.Z_SYNC_FLUSH)
+    yield compresor.flush()
@@ -0,0 +1,23 @@
+# Ajustes de conexión a la base de datos
+from sqlalchemy import event
+
+
+def configurar_sqlite(engine, pragmas):
+    """
+    Aplica los PRAGMA de SQLITE_PRAGMAS a cada conexión nueva del engine.
+
+    Con WAL las lecturas no bloquean la escritura, synchronous=NORMAL evita un
+    fsync por transacción y busy_timeout hace que un worker espere el lock en
+    lugar de fallar con "database is locked".
+    """
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _aplicar_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for nombre, valor in pragmas.items():
+                cursor.execute(f"PRAGMA {nombre}={valor}")
+        finally:
+            cursor.close()
@@ -3,3 +3,6 @@ from .modelo_conyuge import Conyuge
 from .modelo_hijo import Hijo
 from .modelo_catalogo_kit import Kit, CatalogoKit
 #from .modelo_login import Login
+from .modelo_sync_estado import SyncEstado
+from .modelo_sync_job import SyncJob
+from .modelo_estadistica import Estadistica
@@ -8,6 +8,16 @@ class Afiliado(db.Model):
     """
 
     __tablename__ = "AFILIADOS"
+    __table_args__ = (
+        # Índices (columna, id) para el listado filtrado con paginación por cursor
+        db.Index("ix_afiliados_provincia_id", "provincia", "id"),
+        db.Index("ix_afiliados_localidad_id", "localidad", "id"),
+        db.Index("ix_afiliados_comuna_id", "comuna_donde_trabaja", "id"),
+        db.Index("ix_afiliados_relacion_dependencia_id", "relacion_dependencia", "id"),
+        db.Index("ix_afiliados_fecha_ingreso_id", "fecha_ingreso", "id"),
+        db.Index("ix_afiliados_fecha_nacimiento_id", "fecha_nacimiento", "id"),
+        db.Index("ix_afiliados_creacion_id", "marca_temporal_creacion", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     # Atributos del afiliado
@@ -48,6 +58,9 @@ class Afiliado(db.Model):
         db.String(50), nullable=False
     )  # 'monotributista', 'planta_transitoria', 'planta_permanente'
 
+    # Hash de los datos del afiliado y su familia en la hoja; None hasta la primera carga masiva
+    huella = db.Column(db.String(32), nullable=True)
+
     # Marca temporal de creación y actualización
     marca_temporal_creacion = db.Column(
         db.DateTime, nullable=False, default=db.func.current_timestamp()
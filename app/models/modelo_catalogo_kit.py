@@ -24,6 +24,11 @@ class Kit(db.Model):
     """
 
     __tablename__ = "KITS"
+    __table_args__ = (
+        # Un hijo recibe cada tipo de kit una sola vez, aunque la asignación corra en paralelo
+        db.UniqueConstraint("id_hijo", "tipo_kit", name="uq_kits_hijo_tipo"),
+    )
+
     id_kit = db.Column(db.Integer, primary_key=True)
     id_hijo = db.Column(db.Integer, db.ForeignKey("HIJOS.id_hijo"), nullable=False)
     tipo_kit = db.Column(
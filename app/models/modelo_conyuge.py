@@ -8,6 +8,10 @@ class Conyuge(db.Model):
     """
 
     __tablename__ = "CONYUGES"
+    __table_args__ = (
+        # Carga de las familias y triggers de la búsqueda (AFILIADOS_BUSQUEDA)
+        db.Index("ix_conyuges_id_afiliado", "id_afiliado"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     id_afiliado = db.Column(
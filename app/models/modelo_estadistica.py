@@ -0,0 +1,15 @@
+from .. import db
+
+
+class Estadistica(db.Model):
+    """
+    Modelo para guardar conteos precalculados de afiliados e hijos por valor de una
+    dimensión (provincia, comuna, fecha de nacimiento de los hijos, etc.).
+
+    """
+
+    __tablename__ = "ESTADISTICAS"
+
+    dimension = db.Column(db.String(30), primary_key=True)
+    valor = db.Column(db.String(100), primary_key=True)
+    cantidad = db.Column(db.Integer, nullable=False, default=0)
@@ -8,6 +8,11 @@ class Hijo(db.Model):
     """
 
     __tablename__ = "HIJOS"
+    __table_args__ = (
+        # Clave natural usada por la carga masiva desde la hoja
+        db.UniqueConstraint("id_afiliado", "dni", name="uq_hijos_afiliado_dni"),
+    )
+
     id_hijo = db.Column(db.Integer, primary_key=True)
     id_afiliado = db.Column(
         db.Integer, db.ForeignKey("AFILIADOS.id"), nullable=False
@@ -0,0 +1,25 @@
+from .. import db
+
+
+class SyncEstado(db.Model):
+    """
+    Modelo para guardar hasta qué fila de la hoja se sincronizó cada rango.
+
+    """
+
+    __tablename__ = "SYNC_ESTADO"
+
+    id = db.Column(db.Integer, primary_key=True)
+    range_name = db.Column(db.String(100), nullable=False, unique=True)
+
+    # Última fila de la hoja (1-based) ya procesada
+    ultima_fila = db.Column(db.Integer, nullable=False, default=0)
+    # "Marca temporal" de la última fila procesada
+    ultima_marca_temporal = db.Column(db.DateTime, nullable=True)
+
+    marca_temporal_actualizacion = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=db.func.current_timestamp(),
+        onupdate=db.func.current_timestamp(),
+    )
@@ -0,0 +1,43 @@
+from .. import db
+
+
+class SyncJob(db.Model):
+    """
+    Modelo para seguir una sincronización de afiliados que corre en segundo plano.
+
+    """
+
+    __tablename__ = "SYNC_JOBS"
+
+    PENDIENTE = "pendiente"
+    EN_CURSO = "en_curso"
+    COMPLETADO = "completado"
+    ERROR = "error"
+
+    id = db.Column(db.Integer, primary_key=True)
+    # "completo" o "incremental"
+    modo = db.Column(db.String(20), nullable=False)
+    range_name = db.Column(db.String(100), nullable=True)
+    estado = db.Column(db.String(20), nullable=False, default=PENDIENTE, index=True)
+
+    # Progreso, actualizado al terminar cada lote
+    filas_leidas = db.Column(db.Integer, nullable=False, default=0)
+    afiliados = db.Column(db.Integer, nullable=False, default=0)
+    conyuges = db.Column(db.Integer, nullable=False, default=0)
+    hijos = db.Column(db.Integer, nullable=False, default=0)
+    omitidos = db.Column(db.Integer, nullable=False, default=0)
+    # Informe de filas rechazadas (InformeRechazos.a_dict())
+    rechazos = db.Column(db.JSON, nullable=True)
+    # Mensaje del error que detuvo el trabajo
+    error = db.Column(db.Text, nullable=True)
+
+    # Proceso que ejecuta el trabajo ("host:pid") y último latido de ese proceso: si el
+    # latido vence, el proceso se detuvo y el trabajo ya no va a terminar
+    propietario = db.Column(db.String(100), nullable=True)
+    latido = db.Column(db.DateTime, nullable=True)
+
+    marca_temporal_creacion = db.Column(
+        db.DateTime, nullable=False, default=db.func.current_timestamp()
+    )
+    marca_temporal_inicio = db.Column(db.DateTime, nullable=True)
+    marca_temporal_fin = db.Column(db.DateTime, nullable=True)
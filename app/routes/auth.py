@@ -1,23 +1,34 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request
-from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import login_user, logout_user, login_required
 
 from app.models.modelo_login import User
 from .. import db, login_manager
 from ..forms import LoginForm, RegisterForm
+from ..servicios.user_cache import user_cache
+from ..servicios.passwords import password_hasher
 
 auth = Blueprint('auth', __name__)
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    return user_cache.get_user(int(user_id))
 
 @auth.route('/login', methods=['GET', 'POST'])
 def login():
     form = LoginForm()
     if form.validate_on_submit():
         user = User.query.filter_by(username=form.username.data).first()
-        if user and check_password_hash(user.password, form.password.data):
+        try:
+            valida = user is not None and password_hasher.verify(user.password, form.password.data)
+        except TimeoutError:
+            # El pool de verificación está saturado: mejor reintentar que encolar sin límite
+            flash('El servidor está ocupado, intenta de nuevo en unos segundos')
+            return render_template('login.html', form=form), 503
+        if valida:
+            if password_hasher.needs_rehash(user.password):
+                # Los parámetros de hash cambiaron: se actualiza con la contraseña en claro
+                user.password = password_hasher.hash(form.password.data)
+                db.session.commit()
             login_user(user)
             return redirect(url_for('main.index'))
         flash('Usuario o contraseña incorrectos')
@@ -27,7 +38,7 @@ def login():
 def register():
     form = RegisterForm()
     if form.validate_on_submit():
-        hashed_pw = generate_password_hash(form.password.data)
+        hashed_pw = password_hasher.hash(form.password.data)
         new_user = User(username=form.username.data, password=hashed_pw)
         db.session.add(new_user)
         db.session.commit()
@@ -1,4 +1,5 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask import Blueprint, render_template, redirect, url_for, flash, request, abort
+from ..servicios.consultas import obtener_afiliado_con_familia
 #from ..servicios.google_sheets_service import FactoryGoogleSheetsService
 
 # asignar un nombre al blueprint
@@ -18,8 +19,13 @@ def crear_afiliado():
 
 @crud.route('/afiliado/<string:id>', methods=['GET','POST'])
 def obtener_afiliado(id):
-    # Lógica para obtener un afiliado por ID
-    return render_template('afiliados/detalles.html', id=id)
+    # Afiliado con cónyuges, hijos y kits cargados de antemano (sin consultas N+1)
+    if not id.isdigit():
+        abort(404)
+    afiliado = obtener_afiliado_con_familia(int(id))
+    if afiliado is None:
+        abort(404)
+    return render_template('afiliados/detalles.html', id=id, afiliado=afiliado)
 
 @crud.route('/update/afiliado/<string:id>', methods=['GET']) #metodo put 
 def actualizar_afiliado(id):
@@ -0,0 +1,207 @@
+import logging
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .resiliencia import es_rechazo_por_cuota
+from .sheets_client import ISheetsClient
+
+# 12. Escrituras agrupadas en Google Sheets
+
+logger = logging.getLogger(__name__)
+
+
+class AppendIncierto(Exception):
+    """
+    Falló el envío de un append y no se sabe si la API lo aplicó (5xx, timeout).
+    Las filas no se vuelven a encolar, para no duplicarlas: quien llama debe
+    revisar la hoja. `range_name` y `filas` indican qué se intentó agregar.
+    """
+
+    def __init__(self, range_name: str, filas: List[List[Any]]):
+        super().__init__(f"No se sabe si se agregaron {len(filas)} filas en {range_name}")
+        self.range_name = range_name
+        self.filas = filas
+
+
+class BufferEscrituraSheets(ISheetsClient):
+    """
+    ISheetsClient que acumula las escrituras y las envía agrupadas.
+
+    - write_range / batch_update: se juntan y se envían en un único
+      values().batchUpdate. Si el mismo rango se escribe dos veces antes del envío,
+      solo viaja el último valor.
+    - append_rows: las filas se juntan por rango y se envían en un único append
+      con todas las filas.
+
+    El envío (flush) ocurre al superar `max_celdas` pendientes, cuando pasan
+    `intervalo` segundos desde la primera escritura pendiente (en un hilo aparte),
+    al llamar a flush() o close(), o al salir del bloque `with`. Las lecturas y
+    clear_range envían antes lo pendiente para no leer datos viejos. En cada envío
+    se escriben primero las actualizaciones y después los appends.
+
+    Si un envío falla, lo que no se llegó a escribir vuelve a quedar pendiente y
+    el error se propaga (o se registra en el log, si el envío era por tiempo).
+    La excepción es un append que falló sin que se sepa si se aplicó: sus filas
+    no vuelven a la cola (se duplicarían) y se lanza AppendIncierto con ellas.
+
+    Parameters:
+        client(ISheetsClient): Cliente que hace los pedidos a la API.
+        max_celdas(int): Celdas pendientes a partir de las cuales se envía.
+        max_rangos(int): Máximo de rangos por pedido de batchUpdate.
+        intervalo(float | None): Segundos máximos que una escritura espera; None
+            desactiva el envío por tiempo.
+
+    Methods:
+        flush(): Envía lo pendiente.
+        close(): Envía lo pendiente y detiene el envío por tiempo.
+    """
+
+    def __init__(self, client: ISheetsClient, max_celdas: int = 10_000,
+                 max_rangos: int = 100, intervalo: Optional[float] = 5.0):
+        self.client = client
+        self.max_celdas = max_celdas
+        self.max_rangos = max_rangos
+        self.intervalo = intervalo
+        self._updates: Dict[str, List[List[Any]]] = {}
+        self._appends: Dict[str, List[List[Any]]] = {}
+        self._celdas = 0
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        # Serializa los envíos para que lleguen a la API en el orden en que se hicieron
+        self._lock_envio = threading.Lock()
+
+    def __enter__(self) -> "BufferEscrituraSheets":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @property
+    def pendientes(self) -> int:
+        """Celdas a la espera de ser enviadas."""
+        return self._celdas
+
+    # Escrituras (se acumulan)
+
+    def write_range(self, range_name: str, values: List[List[Any]]) -> Dict:
+        self._encolar(self._updates, range_name, values, reemplazar=True)
+        return {"updatedRange": range_name, "updatedRows": len(values), "pendiente": True}
+
+    def batch_update(self, updates: Sequence[Tuple[str, List[List[Any]]]]) -> Dict:
+        for range_name, values in updates:
+            self._encolar(self._updates, range_name, values, reemplazar=True)
+        return {"totalUpdatedRows": sum(len(values) for _, values in updates), "pendiente": True}
+
+    def append_rows(self, range_name: str, values: List[List[Any]]) -> Dict:
+        self._encolar(self._appends, range_name, values, reemplazar=False)
+        return {"updates": {"updatedRows": len(values)}, "pendiente": True}
+
+    # Operaciones que necesitan ver lo escrito: envían lo pendiente antes
+
+    def read_range(self, range_name: str) -> List[List[Any]]:
+        self.flush()
+        return self.client.read_range(range_name)
+
+    def read_range_chunked(self, range_name: str, chunk_rows: int = 1000,
+                           windows_per_request: int = 1) -> Iterator[List[List[Any]]]:
+        self.flush()
+        return self.client.read_range_chunked(range_name, chunk_rows, windows_per_request)
+
+    def clear_range(self, range_name: str) -> Dict:
+        self.flush()
+        return self.client.clear_range(range_name)
+
+    # Envío
+
+    def flush(self) -> None:
+        with self._lock_envio:
+            with self._lock:
+                updates, appends = self._updates, self._appends
+                self._updates, self._appends = {}, {}
+                self._celdas = 0
+                self._cancelar_timer()
+            self._enviar(updates, appends)
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._cancelar_timer()
+
+    def _enviar(self, updates: Dict[str, List[List[Any]]],
+                appends: Dict[str, List[List[Any]]]) -> None:
+        pares = list(updates.items())
+        try:
+            while pares:
+                self.client.batch_update(pares[:self.max_rangos])
+                pares = pares[self.max_rangos:]
+        except Exception:
+            # Las actualizaciones reemplazan valores: repetirlas no cambia el resultado
+            self._devolver(dict(pares), appends)
+            raise
+        while appends:
+            range_name = next(iter(appends))
+            try:
+                self.client.append_rows(range_name, appends[range_name])
+            except Exception as error:
+                if es_rechazo_por_cuota(error):
+                    # Rechazado sin procesar: se puede volver a enviar tal cual
+                    self._devolver({}, appends)
+                    raise
+                filas = appends.pop(range_name)
+                self._devolver({}, appends)
+                raise AppendIncierto(range_name, filas) from error
+            del appends[range_name]
+
+    def _devolver(self, updates: Dict[str, List[List[Any]]],
+                  appends: Dict[str, List[List[Any]]]) -> None:
+        """Vuelve a dejar pendiente lo que no se envió, delante de lo encolado mientras tanto."""
+        with self._lock:
+            for range_name, values in self._updates.items():
+                updates.pop(range_name, None)
+                updates[range_name] = values
+            for range_name, values in self._appends.items():
+                appends.setdefault(range_name, []).extend(values)
+            self._updates, self._appends = updates, appends
+            self._celdas = sum(_celdas(v) for v in updates.values()) + \
+                sum(_celdas(v) for v in appends.values())
+            if self._celdas:
+                self._programar_timer()
+
+    def _encolar(self, pendientes: Dict[str, List[List[Any]]], range_name: str,
+                 values: List[List[Any]], reemplazar: bool) -> None:
+        with self._lock:
+            if reemplazar:
+                anterior = pendientes.pop(range_name, None)
+                if anterior is not None:
+                    self._celdas -= _celdas(anterior)
+                pendientes[range_name] = values
+            else:
+                pendientes.setdefault(range_name, []).extend(values)
+            self._celdas += _celdas(values)
+            lleno = self._celdas >= self.max_celdas
+            if not lleno:
+                self._programar_timer()
+        if lleno:
+            self.flush()
+
+    def _programar_timer(self) -> None:
+        if self.intervalo is None or self._timer is not None:
+            return
+        self._timer = threading.Timer(self.intervalo, self._flush_por_tiempo)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _cancelar_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _flush_por_tiempo(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Error enviando escrituras pendientes a Google Sheets")
+
+
+def _celdas(values: List[List[Any]]) -> int:
+    return sum(len(row) for row in values)
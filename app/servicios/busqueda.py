@@ -0,0 +1,172 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, exists, func, literal_column, or_, select, text
+
+from .. import db
+from ..models.modelo_afiliado import Afiliado
+from ..models.modelo_conyuge import Conyuge
+from ..models.modelo_hijo import Hijo
+from .consultas import _campos, _limite
+from .serializadores import afiliado_a_dict
+
+# 13. Búsqueda de afiliados por nombre, DNI o legajo
+
+# Campos devueltos por defecto: los necesarios para identificar a la persona
+CAMPOS_BUSQUEDA = (
+    "id", "apellido", "nombre", "dni", "numero_legajo", "provincia", "comuna_donde_trabaja",
+)
+
+# Los índices de trigramas no pueden buscar textos más cortos
+LARGO_MINIMO = 3
+MAXIMO_TERMINOS = 8
+
+# Peso de cada columna de AFILIADOS_BUSQUEDA para bm25(), en el orden de la tabla: una
+# coincidencia en DNI o legajo pesa más que en un nombre, y la de un familiar menos
+PESOS_COLUMNAS = (("apellido", 10), ("nombre", 10), ("dni", 20), ("numero_legajo", 20),
+                  ("familiares", 2))
+
+# Columnas que identifican a la persona: un término igual al valor completo de una de
+# ellas es la mejor coincidencia posible (el apellido exacto, el DNI exacto)
+COLUMNAS_EXACTAS = ("apellido", "nombre", "dni", "numero_legajo")
+
+# Los nombres se indexan sin tildes (migración c5e8a2d47b19); los términos se normalizan igual
+CON_TILDE = "áéíóúüñÁÉÍÓÚÜÑ"
+SIN_TILDE = "aeiouunAEIOUUN"
+_SIN_TILDES = str.maketrans(CON_TILDE, SIN_TILDE)
+
+# Números con puntos o guiones ("20.123.456"): se buscan sin separadores, como se guardan
+_NUMERO_CON_SEPARADORES = re.compile(r"\d[\d.\-]*\d")
+
+
+def terminos_busqueda(consulta: str) -> List[str]:
+    """
+    Separa la consulta en términos: cada afiliado devuelto contiene todos.
+
+    Raises:
+        ValueError: Si no queda ningún término de al menos LARGO_MINIMO caracteres.
+    """
+    terminos = []
+    for termino in consulta.translate(_SIN_TILDES).split():
+        if _NUMERO_CON_SEPARADORES.fullmatch(termino):
+            termino = termino.replace(".", "").replace("-", "")
+        if len(termino) >= LARGO_MINIMO and termino not in terminos:
+            terminos.append(termino)
+    if not terminos:
+        raise ValueError(f"La búsqueda necesita al menos un término de {LARGO_MINIMO} caracteres")
+    return terminos[:MAXIMO_TERMINOS]
+
+
+def buscar_afiliados(params: Dict[str, str]) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    Busca afiliados por coincidencia parcial en apellido, nombre, DNI, legajo y en
+    los nombres de sus cónyuges e hijos, ordenados por relevancia.
+
+    En SQLite se consulta la tabla FTS5 AFILIADOS_BUSQUEDA (tokenizador trigram,
+    coincidencias exactas primero y después bm25 con PESOS_COLUMNAS); en PostgreSQL, los índices GIN de pg_trgm (ranking por
+    word_similarity). Ambos se crean en la migración c5e8a2d47b19 y se mantienen
+    solos: triggers en SQLite, los propios índices en PostgreSQL.
+
+    Parameters:
+        params(Dict[str, str]): Parámetros del pedido:
+            - q: texto a buscar (términos separados por espacios)
+            - campos: lista de campos a devolver separados por coma
+            - limite: tamaño de página (máximo LIMITE_MAXIMO)
+            - pagina: número de página, desde 1
+
+    Returns:
+        tuple(List[Dict[str, Any]], int | None): Afiliados de la página y número de la siguiente
+
+    Raises:
+        ValueError: Si algún parámetro es inválido.
+    """
+    terminos = terminos_busqueda(params.get("q", ""))
+    campos = _campos(params.get("campos") or ",".join(CAMPOS_BUSQUEDA))
+    limite = _limite(params)
+    pagina = _pagina(params)
+
+    # Se pide una fila de más para saber si existe una página siguiente
+    desde = (pagina - 1) * limite
+    if db.session.get_bind().dialect.name == "sqlite":
+        ids = _buscar_fts5(terminos, limite + 1, desde)
+    else:
+        ids = _buscar_trigramas(terminos, limite + 1, desde)
+
+    siguiente = None
+    if len(ids) > limite:
+        ids = ids[:limite]
+        siguiente = pagina + 1
+
+    query = select(*(getattr(Afiliado, campo) for campo in campos)).where(Afiliado.id.in_(ids))
+    por_id = {row.id: row for row in db.session.execute(query)}
+    return [afiliado_a_dict(por_id[id_afiliado], campos) for id_afiliado in ids
+            if id_afiliado in por_id], siguiente
+
+
+def _buscar_fts5(terminos: List[str], limite: int, desde: int) -> List[int]:
+    """
+    Ordena todas las coincidencias en SQLite: primero las filas donde más términos
+    son el valor completo de una columna de COLUMNAS_EXACTAS (el apellido o el DNI
+    buscado), después por bm25() con PESOS_COLUMNAS y por último por id, así el
+    orden es estable entre páginas.
+    """
+    # Cada término va como frase entre comillas: con trigram equivale a "contiene"
+    params = {"consulta": " AND ".join('"' + t.replace('"', '""') + '"' for t in terminos),
+              "limite": limite, "desde": desde}
+    exactas = []
+    for i, termino in enumerate(terminos):
+        params[f"t{i}"] = termino
+        exactas.append("(" + " OR ".join(f"{columna} = :t{i} COLLATE NOCASE"
+                                         for columna in COLUMNAS_EXACTAS) + ")")
+    pesos = ", ".join(str(peso) for _, peso in PESOS_COLUMNAS)
+    query = text(
+        "SELECT rowid FROM AFILIADOS_BUSQUEDA WHERE AFILIADOS_BUSQUEDA MATCH :consulta "
+        f"ORDER BY {' + '.join(exactas)} DESC, bm25(AFILIADOS_BUSQUEDA, {pesos}), rowid "
+        "LIMIT :limite OFFSET :desde"
+    )
+    return db.session.execute(query, params).scalars().all()
+
+
+def _buscar_trigramas(terminos: List[str], limite: int, desde: int) -> List[int]:
+    postgres = db.session.get_bind().dialect.name == "postgresql"
+    # En PostgreSQL, mismas expresiones que los índices de trigramas, para que la base los use;
+    # otras bases no tienen translate() y comparan con tildes
+    normalizar = _sin_tildes if postgres else (lambda expresion: expresion)
+    espacio = literal_column("' '")
+    texto = normalizar(Afiliado.apellido + espacio + Afiliado.nombre + espacio
+                       + Afiliado.dni + espacio + Afiliado.numero_legajo)
+
+    condiciones = []
+    for termino in terminos:
+        patron = "%" + re.sub(r"([!%_])", r"!\1", termino) + "%"
+        condiciones.append(or_(
+            texto.ilike(patron, escape="!"),
+            exists().where(and_(Conyuge.id_afiliado == Afiliado.id,
+                                normalizar(Conyuge.nombre_apellido).ilike(patron, escape="!"))),
+            exists().where(and_(Hijo.id_afiliado == Afiliado.id,
+                                normalizar(Hijo.nombre_apellido).ilike(patron, escape="!"))),
+        ))
+
+    query = select(Afiliado.id).where(*condiciones)
+    if postgres:
+        query = query.order_by(func.word_similarity(" ".join(terminos), texto).desc(), Afiliado.id)
+    else:
+        # Otras bases: sin índice ni ranking, por orden de id
+        query = query.order_by(Afiliado.id)
+    return db.session.execute(query.limit(limite).offset(desde)).scalars().all()
+
+
+def _sin_tildes(expresion):
+    # Literales en el SQL (no parámetros): la expresión tiene que coincidir con la del índice
+    return func.translate(expresion, literal_column(f"'{CON_TILDE}'"),
+                          literal_column(f"'{SIN_TILDE}'"))
+
+
+def _pagina(params: Dict[str, str]) -> int:
+    try:
+        pagina = int(params.get("pagina", 1))
+    except ValueError:
+        raise ValueError("'pagina' debe ser un número entero") from None
+    if pagina < 1:
+        raise ValueError("'pagina' debe ser mayor o igual a 1")
+    return pagina
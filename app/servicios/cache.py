@@ -0,0 +1,281 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .sheets_service import SheetsService
+
+# 6. Cache del servicio de Google Sheets
+
+logger = logging.getLogger(__name__)
+
+
+def huella_datos(data: List[Dict[str, Any]]) -> str:
+    """Hash del contenido de un rango; cambia si y solo si cambian los datos."""
+    h = hashlib.blake2b(digest_size=16)
+    for row in data:
+        h.update(json.dumps(row, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+class _EntradaCache:
+    """
+    Datos normalizados de un rango junto con el momento en que se obtuvieron y
+    su huella (ETag), que se calcula una sola vez por refresco.
+    """
+
+    def __init__(self, data: List[Dict[str, Any]], obtenido: float):
+        self.data = data
+        self.obtenido = obtenido
+        self.etag = huella_datos(data)
+
+
+class CachedSheetsService:
+    """
+    Cache en memoria alrededor de SheetsService.get_normalized_data.
+
+    La primera lectura de un rango bloquea hasta obtener los datos. Mientras la
+    entrada esté dentro del TTL se responde desde memoria; cuando vence se sigue
+    respondiendo con el dato viejo y se lanza un único refresco en segundo plano
+    (stale-while-revalidate).
+
+    Las lecturas bloqueantes (sin entrada, después de invalidate() o pasado
+    max_stale) son de a una por rango: los pedidos que llegan mientras tanto
+    esperan esa lectura y usan su resultado, en lugar de consultar cada uno a
+    Google Sheets.
+
+    Parameters:
+        service(SheetsService): Servicio que obtiene y normaliza los datos.
+        ttl(float): Segundos durante los cuales una entrada se considera fresca.
+        max_stale(float | None): Segundos extra durante los cuales se permite servir
+            un dato vencido. Pasado ese tiempo la lectura vuelve a ser bloqueante.
+
+    Methods:
+        get_normalized_data(range_name): Devuelve los datos del rango desde la cache.
+        get_con_etag(range_name): Igual que get_normalized_data junto con la huella de los datos.
+        iter_normalized_data(range_name): Igual que get_normalized_data pero como iterador;
+            si no hay datos en cache los entrega en streaming mientras los guarda.
+        iter_con_etag(range_name): Igual que iter_normalized_data junto con la huella
+            (None si los datos todavía no están en cache).
+        refresh(range_name): Fuerza una lectura sincrónica y actualiza la cache.
+        invalidate(range_name): Descarta una entrada (o todas si no se indica rango).
+    """
+
+    def __init__(self, service: "SheetsService", ttl: float = 300,
+                 max_stale: Optional[float] = None):
+        self.service = service
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._entradas: Dict[str, _EntradaCache] = {}
+        self._refrescando = set()
+        # Un lock por rango para las lecturas bloqueantes
+        self._lecturas: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get_normalized_data(self, range_name):
+        return self._entrada(range_name).data
+
+    def get_con_etag(self, range_name) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Parameters:
+            range_name(str): Rango en formato 'Hoja1!A1:B2'
+
+        Returns:
+            Tuple[List[Dict], str]: Datos normalizados y la huella de esos mismos datos
+        """
+        entrada = self._entrada(range_name)
+        return entrada.data, entrada.etag
+
+    def _entrada(self, range_name) -> _EntradaCache:
+        with self._lock:
+            entrada = self._entradas.get(range_name)
+
+        if entrada is None:
+            return self._leer_una_vez(range_name, entrada)
+
+        edad = time.monotonic() - entrada.obtenido
+        if edad < self.ttl:
+            return entrada
+
+        if self.max_stale is not None and edad >= self.ttl + self.max_stale:
+            return self._leer_una_vez(range_name, entrada)
+
+        self._refrescar_en_segundo_plano(range_name)
+        return entrada
+
+    def _leer_una_vez(self, range_name, vista: Optional[_EntradaCache]) -> _EntradaCache:
+        """
+        Lectura bloqueante de a una por rango. `vista` es la entrada (o None) que
+        llevó a leer: si al obtener el lock la cache ya tiene otra, la guardó la
+        lectura que se estaba esperando y se usa esa.
+        """
+        with self._lock_lectura(range_name):
+            with self._lock:
+                entrada = self._entradas.get(range_name)
+            if entrada is not None and entrada is not vista:
+                return entrada
+            return self._refresh_entrada(range_name)
+
+    def _lock_lectura(self, range_name) -> threading.Lock:
+        with self._lock:
+            return self._lecturas.setdefault(range_name, threading.Lock())
+
+    def iter_normalized_data(self, range_name):
+        """
+        Devuelve los afiliados del rango uno por uno.
+
+        Si la cache tiene el rango se itera sobre la copia en memoria (con la misma
+        política de TTL y refresco que get_normalized_data). Si no, se consume
+        SheetsService.iter_normalized_data en streaming y, al terminar, el resultado
+        completo queda guardado en la cache. Mientras dura ese streaming, las demás
+        lecturas del rango esperan y después responden desde la cache.
+
+        Parameters:
+            range_name(str): Rango en formato 'Hoja1!A1:B2'
+
+        Returns:
+            Iterator[Dict[str, Any]]: Afiliados normalizados
+        """
+        return self.iter_con_etag(range_name)[0]
+
+    def iter_con_etag(self, range_name) -> Tuple[Iterator[Dict[str, Any]], Optional[str]]:
+        """
+        Returns:
+            Tuple[Iterator[Dict], str | None]: Afiliados normalizados y su huella, o None
+            cuando se leen en streaming desde Google Sheets y la huella aún no se conoce
+        """
+        with self._lock:
+            hay_entrada = range_name in self._entradas
+        if hay_entrada:
+            entrada = self._entrada(range_name)
+            return iter(entrada.data), entrada.etag
+        return self._iter_y_guardar(range_name), None
+
+    def _iter_y_guardar(self, range_name):
+        # El lock se toma al empezar a iterar (no al crear el generador): un generador
+        # que nunca se recorre no llega al finally y lo dejaría tomado
+        lock = self._lock_lectura(range_name)
+        if not lock.acquire(blocking=False):
+            # Otro pedido ya está leyendo el rango: se espera su resultado
+            yield from self._entrada(range_name).data
+            return
+        try:
+            data = []
+            for row in self.service.iter_normalized_data(range_name=range_name):
+                data.append(row)
+                yield row
+            # Solo se guarda si el consumidor recorrió el rango completo
+            self._guardar(range_name, data)
+        finally:
+            lock.release()
+
+    def refresh(self, range_name):
+        """
+        Obtiene los datos del servicio y reemplaza la entrada de la cache.
+
+        Parameters:
+            range_name(str): Rango en formato 'Hoja1!A1:B2'
+
+        Returns:
+            List[Dict[str, Any]]: Datos normalizados recién obtenidos
+        """
+        return self._refresh_entrada(range_name).data
+
+    def _refresh_entrada(self, range_name) -> _EntradaCache:
+        data = self.service.get_normalized_data(range_name=range_name)
+        return self._guardar(range_name, data)
+
+    def invalidate(self, range_name=None) -> None:
+        """
+        Descarta la entrada de un rango, o toda la cache si range_name es None.
+        La siguiente lectura vuelve a consultar Google Sheets.
+        """
+        with self._lock:
+            if range_name is None:
+                self._entradas.clear()
+            else:
+                self._entradas.pop(range_name, None)
+
+    def _guardar(self, range_name, data) -> _EntradaCache:
+        # La huella se calcula fuera del lock: puede llevar un rato en hojas grandes
+        entrada = _EntradaCache(data, time.monotonic())
+        with self._lock:
+            self._entradas[range_name] = entrada
+        return entrada
+
+    def _refrescar_en_segundo_plano(self, range_name) -> None:
+        with self._lock:
+            if range_name in self._refrescando:
+                return
+            self._refrescando.add(range_name)
+
+        def tarea():
+            try:
+                self.refresh(range_name)
+            except Exception:
+                # Si el refresco falla se sigue sirviendo el dato anterior;
+                # el próximo acceso vencido volverá a intentarlo.
+                logger.exception("Error refrescando el rango %s", range_name)
+            finally:
+                with self._lock:
+                    self._refrescando.discard(range_name)
+
+        threading.Thread(target=tarea, name=f"sheets-refresh-{range_name}",
+                         daemon=True).start()
+
+
+class TTLCache:
+    """
+    Cache LRU con vencimiento por tiempo, segura para usar desde varios hilos.
+
+    Parameters:
+        maxsize(int): Máximo de entradas; al superarlo se descarta la menos usada.
+        ttl(float): Segundos de validez de cada entrada.
+
+    Methods:
+        get(key): Devuelve el valor o None si no está o venció.
+        set(key, value): Guarda un valor.
+        invalidate(key): Descarta una entrada.
+        clear(): Vacía la cache.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entrada = self._data.get(key)
+            if entrada is None:
+                return None
+            value, vence = entrada
+            if time.monotonic() >= vence:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
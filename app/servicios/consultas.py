@@ -0,0 +1,183 @@
+import base64
+import json
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
+
+from .. import db
+from ..models.modelo_afiliado import Afiliado
+from ..models.modelo_catalogo_kit import Kit
+from ..models.modelo_hijo import Hijo
+from .serializadores import CAMPOS_AFILIADO, afiliado_a_dict
+
+# Consultas de lectura sobre afiliados
+
+# Filtros por igualdad admitidos en el listado (acepta varios valores separados por coma)
+FILTROS_IGUALDAD = ("provincia", "localidad", "comuna_donde_trabaja", "relacion_dependencia")
+
+# Filtros por rango de fechas: parámetro -> columna
+FILTROS_FECHA = {
+    "fecha_ingreso": Afiliado.fecha_ingreso,
+    "fecha_nacimiento": Afiliado.fecha_nacimiento,
+    "creado": Afiliado.marca_temporal_creacion,
+}
+
+LIMITE_POR_DEFECTO = 50
+LIMITE_MAXIMO = 500
+
+
+# Consultas fijas para cargar un afiliado con su familia, sin importar cuántos sean:
+# afiliados + cónyuges + hijos + (kits JOIN catálogo) = 4 consultas
+CONSULTAS_POR_FAMILIA = 4
+
+
+def opciones_familia():
+    """Estrategia de carga de afiliado -> cónyuges -> hijos -> kits -> catálogo."""
+    return (
+        selectinload(Afiliado.conyuges),
+        selectinload(Afiliado.hijos).selectinload(Hijo.kits).joinedload(Kit.catalogo),
+    )
+
+
+def obtener_afiliado_con_familia(id_afiliado: int) -> Optional[Afiliado]:
+    """
+    Obtiene un afiliado con cónyuges, hijos y kits ya cargados.
+
+    Returns:
+        Afiliado | None: None si no existe
+    """
+    query = select(Afiliado).where(Afiliado.id == id_afiliado).options(*opciones_familia())
+    return db.session.execute(query).scalar_one_or_none()
+
+
+def listar_familias(params: Dict[str, str]) -> Tuple[List[Afiliado], Optional[str]]:
+    """
+    Página de afiliados con su familia cargada, con la misma paginación por cursor
+    que listar_afiliados. La cantidad de consultas no depende del tamaño de la página.
+
+    Parameters:
+        params(Dict[str, str]): limite y cursor
+
+    Returns:
+        tuple(List[Afiliado], str | None): Afiliados de la página y cursor de la siguiente
+    """
+    limite = _limite(params)
+    query = select(Afiliado).options(*opciones_familia())
+    cursor = params.get("cursor")
+    if cursor:
+        query = query.where(Afiliado.id > decodificar_cursor(cursor))
+
+    afiliados = db.session.execute(query.order_by(Afiliado.id).limit(limite + 1)).scalars().all()
+    siguiente = None
+    if len(afiliados) > limite:
+        afiliados = afiliados[:limite]
+        siguiente = codificar_cursor(afiliados[-1].id)
+    return afiliados, siguiente
+
+
+def codificar_cursor(ultimo_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"id": ultimo_id}).encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> int:
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(cursor + relleno))["id"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Cursor inválido") from None
+
+
+def _parse_fecha(nombre: str, valor: str) -> date:
+    try:
+        return date.fromisoformat(valor)
+    except ValueError:
+        raise ValueError(f"'{nombre}' debe tener el formato AAAA-MM-DD") from None
+
+
+def listar_afiliados(params: Dict[str, str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Lista afiliados con paginación por cursor (keyset) sobre el id.
+
+    En lugar de OFFSET se filtra por id > último id de la página anterior, así que
+    cualquier página cuesta lo mismo que la primera: con los índices compuestos
+    (columna, id) la base recorre solo las filas que devuelve.
+
+    Parameters:
+        params(Dict[str, str]): Parámetros del pedido:
+            - provincia, localidad, comuna_donde_trabaja, relacion_dependencia: igualdad
+              (varios valores separados por coma)
+            - fecha_ingreso_desde/_hasta, fecha_nacimiento_desde/_hasta,
+              creado_desde/_hasta: rangos de fechas AAAA-MM-DD (inclusivos)
+            - campos: lista de campos a devolver separados por coma
+            - limite: tamaño de página (máximo LIMITE_MAXIMO)
+            - cursor: valor de "siguiente" de la página anterior
+
+    Returns:
+        tuple(List[Dict[str, Any]], str | None): Afiliados de la página y cursor de la siguiente
+
+    Raises:
+        ValueError: Si algún parámetro es inválido.
+    """
+    campos = _campos(params.get("campos"))
+    limite = _limite(params)
+
+    query = select(*(getattr(Afiliado, campo) for campo in campos))
+
+    for nombre in FILTROS_IGUALDAD:
+        valor = params.get(nombre)
+        if valor:
+            valores = [v.strip() for v in valor.split(",") if v.strip()]
+            query = query.where(getattr(Afiliado, nombre).in_(valores))
+
+    for nombre, columna in FILTROS_FECHA.items():
+        desde = params.get(f"{nombre}_desde")
+        hasta = params.get(f"{nombre}_hasta")
+        if desde:
+            desde = _parse_fecha(f"{nombre}_desde", desde)
+            if nombre == "creado":
+                desde = datetime.combine(desde, time.min)
+            query = query.where(columna >= desde)
+        if hasta:
+            hasta = _parse_fecha(f"{nombre}_hasta", hasta)
+            if nombre == "creado":
+                # Columna DateTime: se incluye todo el día indicado sin aplicar
+                # funciones sobre la columna, para que siga usando el índice
+                query = query.where(columna < datetime.combine(hasta + timedelta(days=1), time.min))
+            else:
+                query = query.where(columna <= hasta)
+
+    cursor = params.get("cursor")
+    if cursor:
+        query = query.where(Afiliado.id > decodificar_cursor(cursor))
+
+    # Se pide una fila de más para saber si existe una página siguiente
+    rows = db.session.execute(query.order_by(Afiliado.id).limit(limite + 1)).all()
+    siguiente = None
+    if len(rows) > limite:
+        rows = rows[:limite]
+        siguiente = codificar_cursor(rows[-1].id)
+
+    return [afiliado_a_dict(row, campos) for row in rows], siguiente
+
+
+def _limite(params: Dict[str, str]) -> int:
+    try:
+        limite = int(params.get("limite", LIMITE_POR_DEFECTO))
+    except ValueError:
+        raise ValueError("'limite' debe ser un número entero") from None
+    if not 1 <= limite <= LIMITE_MAXIMO:
+        raise ValueError(f"'limite' debe estar entre 1 y {LIMITE_MAXIMO}")
+    return limite
+
+
+def _campos(valor: Optional[str]) -> Tuple[str, ...]:
+    if not valor:
+        return CAMPOS_AFILIADO
+    campos = [campo.strip() for campo in valor.split(",") if campo.strip()]
+    invalidos = [campo for campo in campos if campo not in CAMPOS_AFILIADO]
+    if invalidos:
+        raise ValueError(f"Campos desconocidos: {', '.join(invalidos)}")
+    # El id siempre se incluye porque es la clave del cursor
+    return ("id",) + tuple(campo for campo in campos if campo != "id")
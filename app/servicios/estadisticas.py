@@ -0,0 +1,146 @@
+from collections import Counter
+from datetime import date
+from typing import Any, Dict, List, Mapping, Optional
+
+from sqlalchemy import delete, func, insert, select
+
+from .. import db
+from ..models.modelo_afiliado import Afiliado
+from ..models.modelo_estadistica import Estadistica
+from ..models.modelo_hijo import Hijo
+from .kits import calcular_edad
+
+# 14. Estadísticas precalculadas de afiliados e hijos
+
+# Columnas de AFILIADOS por las que se cuentan afiliados
+DIMENSIONES_AFILIADO = ("provincia", "comuna_donde_trabaja", "relacion_dependencia", "nivel_educativo")
+
+# Los hijos se cuentan por fecha de nacimiento (a lo sumo unas miles de filas); los
+# rangos de edad se arman al leer con la edad exacta, así los conteos guardados no envejecen
+DIMENSION_HIJOS = "hijos_fecha_nacimiento"
+
+# Rangos de edad de los hijos: (edad_min, edad_max), None = sin tope
+RANGOS_EDAD_HIJOS = ((0, 2), (3, 5), (6, 11), (12, 17), (18, None))
+
+
+class DeltaEstadisticas:
+    """
+    Cambios a aplicar sobre ESTADISTICAS: cuánto suma o resta cada (dimensión, valor).
+
+    La carga masiva resta los valores anteriores de los afiliados e hijos que
+    modifica o borra y suma los nuevos; al final de cada lote aplica el delta
+    con un único upsert (ver AfiliadoBulkLoader).
+
+    Methods:
+        afiliado(valores, signo): Cuenta (o descuenta, con signo=-1) un afiliado.
+        hijo(fecha_nacimiento, signo): Cuenta (o descuenta) un hijo.
+        filas(): Cambios distintos de cero, listos para insertar.
+    """
+
+    def __init__(self):
+        self.cambios: Counter = Counter()
+
+    def afiliado(self, valores: Mapping[str, Any], signo: int = 1) -> None:
+        for dimension in DIMENSIONES_AFILIADO:
+            self.cambios[(dimension, valores[dimension])] += signo
+
+    def hijo(self, fecha_nacimiento: Optional[date], signo: int = 1) -> None:
+        if fecha_nacimiento is not None:
+            self.cambios[(DIMENSION_HIJOS, fecha_nacimiento.isoformat())] += signo
+
+    def filas(self) -> List[Dict[str, Any]]:
+        return [
+            {"dimension": dimension, "valor": valor, "cantidad": cantidad}
+            for (dimension, valor), cantidad in self.cambios.items()
+            if cantidad
+        ]
+
+
+def recalcular_estadisticas(session=None) -> Dict[str, int]:
+    """
+    Recalcula ESTADISTICAS desde cero con GROUP BY sobre AFILIADOS e HIJOS.
+
+    No hace falta en el uso normal (la carga masiva las mantiene al día); sirve
+    después de cambios hechos por fuera de la carga o para verificar los conteos.
+
+    Returns:
+        Dict[str, int]: Afiliados e hijos contados y filas guardadas
+    """
+    session = session or db.session
+    filas = []
+    for dimension in DIMENSIONES_AFILIADO:
+        columna = getattr(Afiliado, dimension)
+        consulta = select(columna, func.count()).group_by(columna)
+        filas += [{"dimension": dimension, "valor": valor, "cantidad": cantidad}
+                  for valor, cantidad in session.execute(consulta)]
+    consulta = select(Hijo.fecha_nacimiento, func.count()).group_by(Hijo.fecha_nacimiento)
+    filas += [{"dimension": DIMENSION_HIJOS, "valor": fecha.isoformat(), "cantidad": cantidad}
+              for fecha, cantidad in session.execute(consulta)]
+
+    session.execute(delete(Estadistica))
+    if filas:
+        session.execute(insert(Estadistica), filas)
+    session.commit()
+    return {
+        "afiliados": sum(f["cantidad"] for f in filas if f["dimension"] == DIMENSIONES_AFILIADO[0]),
+        "hijos": sum(f["cantidad"] for f in filas if f["dimension"] == DIMENSION_HIJOS),
+        "filas": len(filas),
+    }
+
+
+def leer_estadisticas(referencia: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Lee los conteos precalculados: una consulta sobre ESTADISTICAS, sin recorrer AFILIADOS.
+
+    Parameters:
+        referencia(date | None): Fecha para calcular las edades de los hijos. Por defecto hoy.
+
+    Returns:
+        Dict[str, Any]: Afiliados (total y conteo por valor de cada dimensión) e hijos
+            (total, por rango de edad en el orden de RANGOS_EDAD_HIJOS y por año de nacimiento)
+    """
+    referencia = referencia or date.today()
+    por_dimension: Dict[str, Dict[str, int]] = {d: {} for d in DIMENSIONES_AFILIADO + (DIMENSION_HIJOS,)}
+    consulta = select(Estadistica.dimension, Estadistica.valor, Estadistica.cantidad)
+    for dimension, valor, cantidad in db.session.execute(consulta):
+        if dimension in por_dimension:
+            por_dimension[dimension][valor] = cantidad
+
+    por_fecha = por_dimension.pop(DIMENSION_HIJOS)
+    # Lista y no diccionario: los rangos conservan su orden en el JSON
+    por_edad = [{"rango": _etiqueta(edad_min, edad_max), "edad_min": edad_min,
+                 "edad_max": edad_max, "cantidad": 0}
+                for edad_min, edad_max in RANGOS_EDAD_HIJOS]
+    por_anio: Counter = Counter()
+    for valor, cantidad in por_fecha.items():
+        nacimiento = date.fromisoformat(valor)
+        por_anio[str(nacimiento.year)] += cantidad
+        posicion = _rango_edad(calcular_edad(nacimiento, referencia))
+        if posicion is not None:
+            por_edad[posicion]["cantidad"] += cantidad
+
+    return {
+        "fecha_referencia": referencia.isoformat(),
+        "afiliados": {
+            "total": sum(por_dimension[DIMENSIONES_AFILIADO[0]].values()),
+            **por_dimension,
+        },
+        "hijos": {
+            "total": sum(por_anio.values()),
+            "por_edad": por_edad,
+            "por_anio_nacimiento": dict(sorted(por_anio.items())),
+        },
+    }
+
+
+def _rango_edad(edad: int) -> Optional[int]:
+    """Posición en RANGOS_EDAD_HIJOS del rango que contiene la edad."""
+    for posicion, (edad_min, edad_max) in enumerate(RANGOS_EDAD_HIJOS):
+        if edad >= edad_min and (edad_max is None or edad <= edad_max):
+            return posicion
+    # Nacidos después de la fecha de referencia
+    return None
+
+
+def _etiqueta(edad_min: int, edad_max: Optional[int]) -> str:
+    return f"{edad_min}+" if edad_max is None else f"{edad_min}-{edad_max}"
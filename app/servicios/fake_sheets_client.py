@@ -0,0 +1,275 @@
+import json
+import random
+from collections import deque
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .rangos import RangoA1, columna_a_indice, filas_vacias
+from .resiliencia import PoliticaReintentos
+from .sheets_client import ISheetsClient
+from .sql_input_normalized import MAPPING_AFILIADO, MAPPING_CONYUGE, MAPPING_HIJOS
+
+# Cliente local (en memoria / archivo) para pruebas y benchmarks sin Google Sheets
+
+
+class FakeHttpError(Exception):
+    """Error HTTP simulado; expone status_code como HttpError de googleapiclient."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class FakeSheetsClient(ISheetsClient):
+    """
+    Implementación en memoria de ISheetsClient.
+
+    Reproduce hojas grabadas (JSON) o generadas sintéticamente y respeta la forma
+    en que responde la API: las celdas vacías al final de una fila y las filas
+    vacías al final del rango no se devuelven.
+
+    Parameters:
+        sheets(Dict[str, List[List[Any]]]): Contenido de cada hoja, por nombre.
+        default_sheet(str): Hoja usada cuando el rango no indica una.
+        politica(PoliticaReintentos | None): Política aplicada a cada llamada, como en
+            GoogleSheetsClient. Sin política las fallas inyectadas se propagan tal cual.
+
+    Methods:
+        from_json(path): Carga hojas grabadas en un archivo JSON.
+        to_json(path): Graba las hojas en un archivo JSON.
+        synthetic(rows, ...): Genera una hoja de respuestas del formulario de afiliación.
+        inyectar_fallas(*estados): Hace fallar las próximas llamadas con esos códigos HTTP.
+    """
+
+    def __init__(self, sheets: Optional[Dict[str, List[List[Any]]]] = None,
+                 default_sheet: str = "Respuestas",
+                 politica: Optional[PoliticaReintentos] = None):
+        self.sheets = sheets if sheets is not None else {default_sheet: []}
+        self.default_sheet = default_sheet
+        self.politica = politica
+        # Cantidad de llamadas por método (cada reintento cuenta), útil para medir pedidos a la API
+        self.calls: Dict[str, int] = {}
+        self._fallas = deque()
+
+    @classmethod
+    def from_json(cls, path: str) -> "FakeSheetsClient":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(sheets=data["sheets"], default_sheet=data.get("default_sheet", "Respuestas"))
+
+    def to_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"default_sheet": self.default_sheet, "sheets": self.sheets},
+                      f, ensure_ascii=False)
+
+    @classmethod
+    def synthetic(cls, rows: int = 1000, hijos: int = 7, sparsity: float = 0.1,
+                  seed: int = 0, sheet: str = "Respuestas") -> "FakeSheetsClient":
+        """
+        Genera una hoja con el formato del formulario de afiliación.
+
+        Parameters:
+            rows(int): Cantidad de respuestas (sin contar los encabezados).
+            hijos(int): Máximo de hijos por afiliado (hasta 7).
+            sparsity(float): Proporción de celdas opcionales que quedan vacías.
+            seed(int): Semilla para obtener siempre la misma hoja.
+        """
+        rnd = random.Random(seed)
+        headers = list(MAPPING_AFILIADO) + list(MAPPING_CONYUGE)
+        for mapping in MAPPING_HIJOS:
+            headers += list(mapping)
+
+        def fecha(desde: int, hasta: int) -> str:
+            dia = date(desde, 1, 1) + timedelta(days=rnd.randrange((hasta - desde) * 365))
+            return dia.strftime("%d/%m/%Y")
+
+        def opcional(valor: str) -> str:
+            return "" if rnd.random() < sparsity else valor
+
+        inicio = datetime(2023, 1, 1, 8, 0, 0)
+        data = [headers]
+        for n in range(rows):
+            marca = inicio + timedelta(minutes=n * 7 + rnd.randrange(7))
+            row = [
+                marca.strftime("%d/%m/%Y %H:%M:%S"),
+                rnd.choice(_APELLIDOS),
+                rnd.choice(_NOMBRES),
+                fecha(1960, 2002),
+                str(20_000_000 + n),
+                opcional(f"11{rnd.randrange(10**8):08d}"),
+                f"afiliado{n}@example.com",
+                "Argentina",
+                rnd.choice(("Masculino", "Femenino")),
+                rnd.choice(("Soltero/a", "Casado/a", "Divorciado/a")),
+                f"Calle {rnd.randrange(1, 300)} {rnd.randrange(1, 5000)}",
+                rnd.choice(_LOCALIDADES),
+                rnd.choice(_PROVINCIAS),
+                str(rnd.randrange(1000, 9999)),
+                rnd.choice(("Primario", "Secundario", "Terciario", "Universitario")),
+                opcional(rnd.choice(("", "Técnico", "Profesorado", "Licenciatura"))),
+                str(100_000 + n),
+                f"Comuna {rnd.randrange(1, 16)}",
+                fecha(2005, 2024),
+                rnd.choice(("monotributista", "planta_transitoria", "planta_permanente")),
+            ]
+            if rnd.random() < 0.5:
+                row += [f"{rnd.choice(_NOMBRES)} {rnd.choice(_APELLIDOS)}",
+                        opcional(fecha(1960, 2002)), str(30_000_000 + n)]
+            else:
+                row += ["", "", ""]
+            for i in range(rnd.randrange(min(hijos, 7) + 1)):
+                row += [f"{rnd.choice(_NOMBRES)} {row[1]}", opcional(fecha(2006, 2024)),
+                        opcional(str(50_000_000 + n * 7 + i))]
+            data.append(_recortar(row))
+        return cls(sheets={sheet: data}, default_sheet=sheet)
+
+    def inyectar_fallas(self, *estados: Optional[int]) -> None:
+        """
+        Encola resultados para las próximas llamadas a la API: cada código HTTP hace
+        fallar una llamada con FakeHttpError y None la deja pasar.
+        """
+        self._fallas.extend(estados)
+
+    # Implementación de ISheetsClient
+
+    def read_range(self, range_name: str) -> List[List[Any]]:
+        return self._llamar("read_range", lambda: self._leer(RangoA1.parse(range_name)))
+
+    def write_range(self, range_name: str, values: List[List[Any]]) -> Dict:
+        return self._llamar("write_range", lambda: self._write_range(range_name, values))
+
+    def _write_range(self, range_name: str, values: List[List[Any]]) -> Dict:
+        rango = RangoA1.parse(range_name)
+        self._escribir(rango, rango.fila_inicio, values)
+        return {"updatedRange": range_name, "updatedRows": len(values)}
+
+    def batch_update(self, updates: Sequence[Tuple[str, List[List[Any]]]]) -> Dict:
+        return self._llamar("batch_update", lambda: self._batch_update(updates))
+
+    def _batch_update(self, updates: Sequence[Tuple[str, List[List[Any]]]]) -> Dict:
+        respuestas = [self._write_range(range_name, values) for range_name, values in updates]
+        return {
+            "totalUpdatedRows": sum(r["updatedRows"] for r in respuestas),
+            "responses": respuestas,
+        }
+
+    def append_rows(self, range_name: str, values: List[List[Any]]) -> Dict:
+        return self._llamar("append_rows", lambda: self._append_rows(range_name, values),
+                            idempotente=False)
+
+    def _append_rows(self, range_name: str, values: List[List[Any]]) -> Dict:
+        rango = RangoA1.parse(range_name)
+        grid = self._hoja(rango)
+        fila = len(_recortar_filas([_recortar(row) for row in grid])) + 1
+        self._escribir(rango, max(fila, rango.fila_inicio), values)
+        return {"updates": {"updatedRows": len(values)}}
+
+    def clear_range(self, range_name: str) -> Dict:
+        return self._llamar("clear_range", lambda: self._clear_range(range_name))
+
+    def _clear_range(self, range_name: str) -> Dict:
+        rango = RangoA1.parse(range_name)
+        grid = self._hoja(rango)
+        col_inicio, col_fin = self._columnas(rango)
+        fila_fin = len(grid) if rango.fila_fin is None else min(rango.fila_fin, len(grid))
+        for i in range(rango.fila_inicio - 1, fila_fin):
+            row = grid[i]
+            for j in range(col_inicio, min(col_fin + 1, len(row))):
+                row[j] = ""
+        return {"clearedRange": range_name}
+
+    def read_range_chunked(self, range_name: str, chunk_rows: int = 1000,
+                           windows_per_request: int = 1) -> Iterator[List[List[Any]]]:
+        rango = RangoA1.parse(range_name)
+        inicio = rango.fila_inicio
+        fila_fin = rango.fila_fin
+        blancas = 0
+        grilla_consultada = False
+        while fila_fin is None or inicio <= fila_fin:
+            # Un pedido por tanda de ventanas, como batchGet
+            self._llamar("read_range_chunked", lambda: None)
+            for _ in range(windows_per_request):
+                fin = inicio + chunk_rows - 1
+                if fila_fin is not None:
+                    fin = min(fin, fila_fin)
+                ventana = RangoA1(rango.hoja, rango.col_inicio, inicio, rango.col_fin, fin)
+                rows = self._leer(ventana)
+                if rows:
+                    # Igual que GoogleSheetsClient: se reponen las filas vacías que la
+                    # API omitió desde la última fila con datos
+                    yield filas_vacias(blancas) + rows
+                    blancas = fin - inicio + 1 - len(rows)
+                else:
+                    # Ventana vacía: se sigue por ventanas hasta la última fila de la grilla
+                    if not grilla_consultada:
+                        filas_grilla = self._llamar("filas_grilla", lambda: len(self._hoja(rango)))
+                        fila_fin = filas_grilla if fila_fin is None else min(fila_fin, filas_grilla)
+                        grilla_consultada = True
+                    blancas += fin - inicio + 1
+                inicio = fin + 1
+                if fila_fin is not None and inicio > fila_fin:
+                    return
+
+    # Auxiliares
+
+    def _llamar(self, metodo: str, operacion: Callable[[], Any], idempotente: bool = True) -> Any:
+        def intento():
+            self.calls[metodo] = self.calls.get(metodo, 0) + 1
+            estado = self._fallas.popleft() if self._fallas else None
+            if estado is not None:
+                raise FakeHttpError(estado)
+            return operacion()
+
+        if self.politica is None:
+            return intento()
+        return self.politica.ejecutar(intento, idempotente=idempotente)
+
+    def _hoja(self, rango: RangoA1) -> List[List[Any]]:
+        return self.sheets.setdefault(rango.hoja or self.default_sheet, [])
+
+    @staticmethod
+    def _columnas(rango: RangoA1):
+        return columna_a_indice(rango.col_inicio), columna_a_indice(rango.col_fin)
+
+    def _leer(self, rango: RangoA1) -> List[List[Any]]:
+        grid = self._hoja(rango)
+        col_inicio, col_fin = self._columnas(rango)
+        filas = grid[rango.fila_inicio - 1:rango.fila_fin]
+        return _recortar_filas([_recortar(row[col_inicio:col_fin + 1]) for row in filas])
+
+    def _escribir(self, rango: RangoA1, fila_inicio: int, values: List[List[Any]]) -> None:
+        grid = self._hoja(rango)
+        col_inicio, _ = self._columnas(rango)
+        for i, values_row in enumerate(values):
+            fila = fila_inicio - 1 + i
+            while len(grid) <= fila:
+                grid.append([])
+            row = grid[fila]
+            faltan = col_inicio + len(values_row) - len(row)
+            if faltan > 0:
+                row.extend([""] * faltan)
+            row[col_inicio:col_inicio + len(values_row)] = values_row
+
+
+def _recortar(row: List[Any]) -> List[Any]:
+    """Quita las celdas vacías al final de una fila, como hace la API."""
+    fin = len(row)
+    while fin and row[fin - 1] == "":
+        fin -= 1
+    return row[:fin] if fin != len(row) else list(row)
+
+
+def _recortar_filas(rows: List[List[Any]]) -> List[List[Any]]:
+    """Quita las filas vacías al final de un rango, como hace la API."""
+    fin = len(rows)
+    while fin and not rows[fin - 1]:
+        fin -= 1
+    return rows[:fin]
+
+
+_APELLIDOS = ("González", "Rodríguez", "Gómez", "Fernández", "López", "Díaz",
+              "Martínez", "Pérez", "García", "Sánchez", "Romero", "Sosa")
+_NOMBRES = ("Juan", "María", "Carlos", "Ana", "Luis", "Laura", "Jorge",
+            "Sofía", "Diego", "Lucía", "Martín", "Valentina")
+_LOCALIDADES = ("CABA", "La Plata", "Quilmes", "Morón", "Lanús", "Avellaneda")
+_PROVINCIAS = ("Buenos Aires", "Córdoba", "Santa Fe", "Mendoza", "Tucumán")
@@ -0,0 +1,204 @@
+import hmac
+import ipaddress
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple, Union
+
+from flask import Response, abort, g, has_request_context, request
+from sqlalchemy import event
+
+# Instrumentación de pedidos: tiempos, consultas SQL y llamadas a Google Sheets
+
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+BUCKETS_CONSULTAS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+
+
+class Histograma:
+    """
+    Histograma acumulativo con buckets fijos, al estilo Prometheus.
+
+    Parameters:
+        buckets(Sequence[float]): Límites superiores de cada bucket, ordenados.
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.conteos = [0] * (len(self.buckets) + 1)
+        self.suma = 0.0
+        self.cantidad = 0
+        self._lock = threading.Lock()
+
+    def observar(self, valor: float) -> None:
+        with self._lock:
+            self.conteos[bisect_left(self.buckets, valor)] += 1
+            self.suma += valor
+            self.cantidad += 1
+
+    def exportar(self, nombre: str, etiquetas: str) -> str:
+        with self._lock:
+            lineas = []
+            acumulado = 0
+            for limite, conteo in zip(self.buckets + ("+Inf",), self.conteos):
+                acumulado += conteo
+                lineas.append(f'{nombre}_bucket{{{etiquetas}le="{limite}"}} {acumulado}')
+            sin_le = etiquetas.rstrip(",")
+            lineas.append(f"{nombre}_sum{{{sin_le}}} {self.suma}")
+            lineas.append(f"{nombre}_count{{{sin_le}}} {self.cantidad}")
+            return "\n".join(lineas)
+
+
+class Metricas:
+    """Registro de histogramas por (métrica, endpoint)."""
+
+    DESCRIPCIONES = {
+        "http_request_seconds": ("Duración total de cada pedido", BUCKETS_SEGUNDOS),
+        "db_query_seconds": ("Tiempo en consultas SQL por pedido", BUCKETS_SEGUNDOS),
+        "db_queries": ("Consultas SQL por pedido", BUCKETS_CONSULTAS),
+        "sheets_call_seconds": ("Tiempo en llamadas a Google Sheets por pedido", BUCKETS_SEGUNDOS),
+    }
+
+    def __init__(self):
+        self._histogramas: Dict[Tuple[str, str], Histograma] = {}
+        self._lock = threading.Lock()
+
+    def observar(self, metrica: str, endpoint: str, valor: float) -> None:
+        clave = (metrica, endpoint)
+        histograma = self._histogramas.get(clave)
+        if histograma is None:
+            with self._lock:
+                histograma = self._histogramas.setdefault(
+                    clave, Histograma(self.DESCRIPCIONES[metrica][1]))
+        histograma.observar(valor)
+
+    def exportar(self) -> str:
+        with self._lock:
+            histogramas = sorted(self._histogramas.items())
+        bloques = []
+        for metrica, (descripcion, _) in self.DESCRIPCIONES.items():
+            series = [(endpoint, h) for (nombre, endpoint), h in histogramas if nombre == metrica]
+            if not series:
+                continue
+            bloques.append(f"# HELP {metrica} {descripcion}\n# TYPE {metrica} histogram")
+            for endpoint, histograma in series:
+                bloques.append(histograma.exportar(metrica, f'endpoint="{endpoint}",'))
+        return "\n".join(bloques) + "\n"
+
+
+def _medicion_actual():
+    if has_request_context():
+        return g.get("_instrumentacion")
+    return None
+
+
+@contextmanager
+def medir_llamada_sheets():
+    """
+    Mide una llamada saliente a Google Sheets y la suma al pedido en curso.
+    Fuera de un pedido (o con la instrumentación apagada) no hace nada extra.
+    """
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        medicion = _medicion_actual()
+        if medicion is not None:
+            medicion["sheets_n"] += 1
+            medicion["sheets_t"] += time.perf_counter() - inicio
+
+
+class Instrumentacion:
+    """
+    Extensión opcional que mide cada pedido.
+
+    Registra el tiempo total, la cantidad y duración de las consultas SQL (con
+    eventos del engine) y el tiempo en llamadas a Google Sheets. Agrega un
+    header Server-Timing a cada respuesta y expone los histogramas en formato
+    Prometheus en METRICS_PATH.
+
+    METRICS_PATH responde solo a clientes con el token METRICS_TOKEN
+    (Authorization: Bearer ...) o cuya dirección está en METRICS_ALLOWED_NETWORKS
+    (por defecto, solo localhost); al resto le responde 404.
+
+    Se activa con INSTRUMENTACION_HABILITADA = True en la configuración.
+    """
+
+    def __init__(self):
+        self.metricas = Metricas()
+        self.token = None
+        self.redes: List[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]] = []
+
+    def init_app(self, app, engine) -> None:
+        if not app.config.get("INSTRUMENTACION_HABILITADA"):
+            return
+
+        self.token = app.config.get("METRICS_TOKEN")
+        redes = app.config.get("METRICS_ALLOWED_NETWORKS", "127.0.0.1/32,::1/128")
+        self.redes = [ipaddress.ip_network(red.strip()) for red in redes.split(",") if red.strip()]
+
+        event.listen(engine, "before_cursor_execute", self._antes_de_consulta)
+        event.listen(engine, "after_cursor_execute", self._despues_de_consulta)
+        app.before_request(self._inicio_pedido)
+        app.after_request(self._fin_pedido)
+        app.add_url_rule(app.config.get("METRICS_PATH", "/metrics"), "metricas",
+                         self._vista_metricas)
+
+    @staticmethod
+    def _antes_de_consulta(conn, cursor, statement, parameters, context, executemany):
+        conn.info["_inicio_consulta"] = time.perf_counter()
+
+    @staticmethod
+    def _despues_de_consulta(conn, cursor, statement, parameters, context, executemany):
+        inicio = conn.info.pop("_inicio_consulta", None)
+        medicion = _medicion_actual()
+        if medicion is not None and inicio is not None:
+            medicion["sql_n"] += 1
+            medicion["sql_t"] += time.perf_counter() - inicio
+
+    @staticmethod
+    def _inicio_pedido():
+        g._instrumentacion = {
+            "inicio": time.perf_counter(),
+            "sql_n": 0, "sql_t": 0.0,
+            "sheets_n": 0, "sheets_t": 0.0,
+        }
+
+    def _fin_pedido(self, response):
+        medicion = g.pop("_instrumentacion", None)
+        if medicion is None:
+            return response
+
+        total = time.perf_counter() - medicion["inicio"]
+        endpoint = request.endpoint or "sin_endpoint"
+        self.metricas.observar("http_request_seconds", endpoint, total)
+        self.metricas.observar("db_query_seconds", endpoint, medicion["sql_t"])
+        self.metricas.observar("db_queries", endpoint, medicion["sql_n"])
+        self.metricas.observar("sheets_call_seconds", endpoint, medicion["sheets_t"])
+
+        # En respuestas en streaming el tiempo cubre hasta que se empieza a enviar
+        response.headers.add("Server-Timing", ", ".join((
+            f"app;dur={total * 1000:.1f}",
+            f'db;dur={medicion["sql_t"] * 1000:.1f};desc="{medicion["sql_n"]} consultas"',
+            f'sheets;dur={medicion["sheets_t"] * 1000:.1f};desc="{medicion["sheets_n"]} llamadas"',
+        )))
+        return response
+
+    def _vista_metricas(self):
+        if not self._acceso_permitido():
+            # 404 y no 403: no se revela que las métricas existen
+            abort(404)
+        return Response(self.metricas.exportar(), mimetype="text/plain; version=0.0.4")
+
+    def _acceso_permitido(self) -> bool:
+        if self.token and hmac.compare_digest(request.headers.get("Authorization", ""),
+                                              f"Bearer {self.token}"):
+            return True
+        try:
+            direccion = ipaddress.ip_address(request.remote_addr or "")
+        except ValueError:
+            return False
+        return any(direccion in red for red in self.redes)
+
+
+instrumentacion = Instrumentacion()
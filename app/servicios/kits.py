@@ -0,0 +1,122 @@
+from bisect import bisect_right
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from .. import db
+from ..models.modelo_catalogo_kit import CatalogoKit, Kit
+from ..models.modelo_hijo import Hijo
+from .sql import insert_con_conflictos
+
+# 9. Asignación de kits por edad
+
+
+def calcular_edad(fecha_nacimiento: date, referencia: date) -> int:
+    """Edad en años cumplidos a la fecha de referencia."""
+    cumplio = (referencia.month, referencia.day) >= (fecha_nacimiento.month, fecha_nacimiento.day)
+    return referencia.year - fecha_nacimiento.year - (0 if cumplio else 1)
+
+
+class IndiceEdades:
+    """
+    Índice de intervalos ordenado sobre los rangos de edad del catálogo.
+
+    Los límites de todos los rangos [edad_min, edad_max] se ordenan una vez y
+    dividen la recta de edades en tramos; cada tramo guarda los kits que lo
+    cubren. Buscar los kits de una edad es un bisect sobre los límites, O(log k),
+    y funciona aunque los rangos del catálogo se superpongan.
+
+    Parameters:
+        rangos(Iterable[Tuple[str, int, int]]): (tipo_kit, edad_min, edad_max) del catálogo.
+
+    Methods:
+        kits_para(edad): Tipos de kit que corresponden a una edad.
+    """
+
+    def __init__(self, rangos: Iterable[Tuple[str, int, int]]):
+        rangos = list(rangos)
+        limites = sorted({edad_min for _, edad_min, _ in rangos}
+                         | {edad_max + 1 for _, _, edad_max in rangos})
+        self.limites = limites
+        self.tramos: List[Tuple[str, ...]] = [
+            tuple(sorted(tipo for tipo, edad_min, edad_max in rangos
+                         if edad_min <= inicio <= edad_max))
+            for inicio in limites
+        ]
+
+    def kits_para(self, edad: int) -> Tuple[str, ...]:
+        posicion = bisect_right(self.limites, edad) - 1
+        if posicion < 0:
+            return ()
+        return self.tramos[posicion]
+
+
+class AsignadorKits:
+    """
+    Asigna en lote los kits del catálogo a todos los hijos según su edad.
+
+    Se hacen tres lecturas (catálogo, hijos, kits ya asignados), la edad de cada
+    hijo se resuelve contra el IndiceEdades en memoria y los Kit faltantes se
+    insertan con INSERT masivos dentro de una única transacción. Los INSERT
+    ignoran los pares (hijo, tipo) que ya existen (ON CONFLICT DO NOTHING sobre
+    uq_kits_hijo_tipo), así dos asignaciones simultáneas no duplican kits.
+
+    Parameters:
+        session: Sesión de SQLAlchemy (por defecto db.session).
+        batch_size(int): Filas por cada INSERT masivo.
+
+    Methods:
+        asignar(fecha_referencia, dry_run): Ejecuta la asignación y devuelve un resumen.
+    """
+
+    def __init__(self, session=None, batch_size: int = 5000):
+        self.session = session or db.session
+        self.batch_size = batch_size
+
+    def asignar(self, fecha_referencia: Optional[date] = None,
+                dry_run: bool = False) -> Dict[str, int]:
+        """
+        Parameters:
+            fecha_referencia(date | None): Fecha a la que se calculan las edades (por defecto hoy).
+            dry_run(bool): Si es True solo se calcula el resumen, sin insertar.
+
+        Returns:
+            Dict[str, int]: hijos evaluados, kits asignados, kits ya existentes y hijos sin kit
+        """
+        referencia = fecha_referencia or date.today()
+        indice = IndiceEdades(self.session.execute(
+            select(CatalogoKit.tipo_kit, CatalogoKit.edad_min, CatalogoKit.edad_max)
+        ).all())
+
+        existentes = set(self.session.execute(select(Kit.id_hijo, Kit.tipo_kit)).all())
+
+        resumen = {"hijos": 0, "asignados": 0, "existentes": 0, "sin_kit": 0}
+        nuevos = []
+        hijos = self.session.execute(
+            select(Hijo.id_hijo, Hijo.fecha_nacimiento).execution_options(yield_per=self.batch_size)
+        )
+        for id_hijo, fecha_nacimiento in hijos:
+            resumen["hijos"] += 1
+            tipos = indice.kits_para(calcular_edad(fecha_nacimiento, referencia))
+            if not tipos:
+                resumen["sin_kit"] += 1
+            for tipo_kit in tipos:
+                if (id_hijo, tipo_kit) in existentes:
+                    resumen["existentes"] += 1
+                else:
+                    nuevos.append({"id_hijo": id_hijo, "tipo_kit": tipo_kit})
+
+        resumen["asignados"] = len(nuevos)
+        if dry_run or not nuevos:
+            return resumen
+
+        stmt = insert_con_conflictos(self.session, Kit).on_conflict_do_nothing(index_elements=["id_hijo", "tipo_kit"])
+        try:
+            for inicio in range(0, len(nuevos), self.batch_size):
+                self.session.execute(stmt, nuevos[inicio:inicio + self.batch_size])
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return resumen
@@ -0,0 +1,486 @@
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import delete, func, or_, select
+
+from .. import db
+from ..models.modelo_afiliado import Afiliado
+from ..models.modelo_catalogo_kit import Kit
+from ..models.modelo_conyuge import Conyuge
+from ..models.modelo_estadistica import Estadistica
+from ..models.modelo_hijo import Hijo
+from .estadisticas import DIMENSIONES_AFILIADO, DeltaEstadisticas
+from .parser import InformeRechazos, parse_dni, parse_fecha, parse_marca_temporal
+from .sql import insert_con_conflictos
+
+# 8. Carga masiva en la base de datos
+
+logger = logging.getLogger(__name__)
+
+# Columnas de AFILIADOS que se cargan desde la hoja
+COLUMNAS_AFILIADO = (
+    "apellido", "nombre", "fecha_nacimiento", "dni", "email", "telefono",
+    "nacionalidad", "genero", "estado_civil", "provincia", "localidad",
+    "direccion", "codigo_postal", "nivel_educativo", "titulo_obtenido",
+    "numero_legajo", "fecha_ingreso", "comuna_donde_trabaja", "relacion_dependencia",
+)
+COLUMNAS_AFILIADO_OPCIONALES = ("telefono", "titulo_obtenido")
+COLUMNAS_FECHA_AFILIADO = ("fecha_nacimiento", "fecha_ingreso")
+
+COLUMNAS_FAMILIAR = ("nombre_apellido", "fecha_nacimiento", "dni")
+
+# Columnas únicas de AFILIADOS además del dni, que identifica al afiliado en el upsert
+COLUMNAS_UNICAS = ("numero_legajo", "email")
+
+# Claves del resumen que devuelve AfiliadoBulkLoader.load
+CLAVES_RESUMEN = (
+    "afiliados", "conyuges", "hijos", "omitidos",
+    "insertados", "actualizados", "sin_cambios", "ausentes", "eliminados",
+)
+
+def _valor(valor: Any) -> Optional[Any]:
+    """Devuelve None para celdas vacías o marcadas como 'no_dato'."""
+    if valor is None or valor == "no_dato":
+        return None
+    if isinstance(valor, str):
+        valor = valor.strip()
+        return valor or None
+    return valor
+
+
+def _lectura_completa(rows: Iterable[Dict[str, Any]]) -> bool:
+    """True si `rows` trae la hoja entera: una lista, o una LecturaHoja que llegó al final."""
+    return isinstance(rows, Sequence) or getattr(rows, "completa", False) is True
+
+
+def huella_afiliado(afiliado: Dict[str, Any], marca_temporal: Any,
+                    conyuge: Optional[Dict[str, Any]], hijos: List[Dict[str, Any]]) -> str:
+    """
+    Hash de los datos tipados de un afiliado y su familia tal como llegan de la hoja.
+    Si la huella coincide con la guardada, la fila no cambió y no hace falta escribirla.
+    """
+    partes = [afiliado.get(col) for col in COLUMNAS_AFILIADO]
+    partes.append(marca_temporal)
+    if conyuge is not None:
+        partes.append("conyuge")
+        partes.extend(conyuge.get(col) for col in COLUMNAS_FAMILIAR)
+    for hijo in sorted(hijos, key=lambda h: h["dni"]):
+        partes.append("hijo")
+        partes.extend(hijo.get(col) for col in COLUMNAS_FAMILIAR)
+    texto = "\x1f".join("" if parte is None else str(parte) for parte in partes)
+    return hashlib.blake2b(texto.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class AfiliadoBulkLoader:
+    """
+    Carga masiva (upsert) de la salida de SQLInputNormalized en AFILIADOS, CONYUGES e HIJOS.
+
+    Las filas se procesan en lotes. Por cada lote se ejecuta un único
+    INSERT ... ON CONFLICT por tabla y una única consulta para resolver los ids
+    de los afiliados, sin importar cuántos familiares tenga cada uno.
+
+    Cada afiliado guarda una huella (hash) de sus datos y los de su familia. Antes
+    de escribir, el lote se compara con las huellas guardadas y solo se escriben
+    los afiliados nuevos o modificados; los que no cambiaron no se tocan (ni su
+    marca_temporal_actualizacion). Los familiares que desaparecen de la hoja no
+    se borran de la base.
+
+    En el mismo lote se mantienen los conteos de ESTADISTICAS: se restan los
+    valores anteriores de los afiliados e hijos modificados o borrados y se suman
+    los nuevos (ver estadisticas.py), con un único upsert por lote.
+
+    Los afiliados se identifican por dni, los cónyuges por su dni y los hijos por
+    (afiliado, dni). Antes de escribir, las fechas y los DNI se convierten a su
+    tipo (ver parser.py); las filas con un dato obligatorio faltante o inválido se
+    omiten y quedan registradas en `rechazos`, sin afectar al resto del lote.
+
+    Parameters:
+        session: Sesión de SQLAlchemy (por defecto db.session).
+        batch_size(int): Cantidad de afiliados por lote.
+        commit(bool): Si es True se confirma la transacción al terminar cada lote.
+        progreso(Callable | None): Se llama después de cada lote con la cantidad de
+            filas leídas hasta el momento y el resumen acumulado.
+        eliminar_ausentes(bool): Al terminar, borra los afiliados cuyo dni no vino en
+            `rows` (con sus familiares y kits). Solo se borra si `rows` es una lista o
+            una LecturaHoja que confirmó haber leído la hoja completa.
+        max_eliminaciones(int | None): Si hay más ausentes que este número no se
+            borra ninguno (protege de una hoja leída a medias o vaciada por error).
+        simular_eliminacion(bool): Calcula los ausentes sin borrarlos.
+
+    Attributes:
+        rechazos(InformeRechazos): Filas y familiares omitidos, con el motivo.
+        ausentes(List[str]): DNI de los afiliados que no vinieron en `rows`.
+        eliminacion_omitida(str | None): Por qué no se borraron los ausentes, si
+            se pidió borrarlos y no se hizo.
+
+    Methods:
+        load(rows): Carga un iterable de afiliados normalizados y devuelve un resumen.
+    """
+
+    def __init__(self, session=None, batch_size: int = 500, commit: bool = True,
+                 progreso: Optional[Callable[[int, Dict[str, int]], None]] = None,
+                 eliminar_ausentes: bool = False, max_eliminaciones: Optional[int] = None,
+                 simular_eliminacion: bool = False):
+        self.session = session or db.session
+        self.batch_size = batch_size
+        self.commit = commit
+        self.progreso = progreso
+        self.eliminar_ausentes = eliminar_ausentes
+        self.max_eliminaciones = max_eliminaciones
+        self.simular_eliminacion = simular_eliminacion
+        self.rechazos = InformeRechazos()
+        self.ausentes: List[str] = []
+        self.eliminacion_omitida: Optional[str] = None
+        self._vistos = set()
+
+    def load(self, rows: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Parameters:
+            rows(Iterable[Dict]): Afiliados con la forma {"afiliado": {}, "conyuge": {}, "hijos": []}.
+                Si tiene el atributo `primera_fila` (FilasHoja, LecturaHoja), los rechazos
+                informan la fila de la hoja; si no, la posición en `rows`.
+
+        Returns:
+            Dict[str, int]: Afiliados, cónyuges e hijos escritos, filas omitidas y el diff
+                contra la base (insertados, actualizados, sin_cambios, ausentes, eliminados)
+        """
+        resumen = dict.fromkeys(CLAVES_RESUMEN, 0)
+        primera_fila = getattr(rows, "primera_fila", 1)
+        leidas = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                leidas += len(batch)
+                self._cerrar_lote(batch, leidas, primera_fila, resumen)
+                batch = []
+        if batch:
+            leidas += len(batch)
+            self._cerrar_lote(batch, leidas, primera_fila, resumen)
+        if self.eliminar_ausentes:
+            if not leidas:
+                # Una hoja vacía suele ser un error de lectura
+                self.eliminacion_omitida = "no se leyó ninguna fila"
+            elif not _lectura_completa(rows):
+                self.eliminacion_omitida = "la lectura no confirmó haber llegado al final de la hoja"
+            else:
+                self._eliminar_ausentes(resumen)
+            if self.eliminacion_omitida is not None:
+                logger.warning("No se borraron los afiliados ausentes: %s", self.eliminacion_omitida)
+        return resumen
+
+    def _cerrar_lote(self, batch: List[Dict[str, Any]], leidas: int, primera_fila: int,
+                     resumen: Dict[str, int]) -> None:
+        self._sumar(resumen, self._load_batch(batch, primera_fila + leidas - len(batch)))
+        if self.progreso is not None:
+            self.progreso(leidas, resumen)
+
+    @staticmethod
+    def _sumar(resumen: Dict[str, int], parcial: Dict[str, int]) -> None:
+        for key, value in parcial.items():
+            resumen[key] += value
+
+    def _insert(self, model):
+        return insert_con_conflictos(self.session, model)
+
+    def _load_batch(self, batch: List[Dict[str, Any]], inicio: int = 1) -> Dict[str, int]:
+        resumen = dict.fromkeys(CLAVES_RESUMEN, 0)
+        afiliados = {}
+        familias = {}
+        posiciones = {}
+        for posicion, row in enumerate(batch, inicio):
+            if self.eliminar_ausentes:
+                # También las filas rechazadas cuentan como presentes en la hoja
+                self._vistos.add(parse_dni(_valor(row.get("afiliado", {}).get("dni"))))
+            afiliado = self._afiliado_a_columnas(row.get("afiliado", {}), posicion)
+            if afiliado is None:
+                resumen["omitidos"] += 1
+                continue
+            # Si el dni se repite en el lote gana la última respuesta
+            afiliados[afiliado["dni"]] = afiliado
+            familias[afiliado["dni"]] = row
+            posiciones[afiliado["dni"]] = posicion
+
+        # Diff contra la base en una sola consulta: solo se escriben los que cambiaron.
+        # Trae también los valores contados en ESTADISTICAS, para descontarlos si
+        # cambian, y el legajo y el email guardados
+        guardadas = {
+            fila.dni: fila for fila in self.session.execute(
+                select(Afiliado.id, Afiliado.dni, Afiliado.huella,
+                       *(getattr(Afiliado, columna) for columna in COLUMNAS_UNICAS),
+                       *(getattr(Afiliado, dimension) for dimension in DIMENSIONES_AFILIADO))
+                .where(Afiliado.dni.in_(list(afiliados)))
+            )
+        }
+
+        # Legajo y email también son únicos: una fila que repite el de otro afiliado
+        # (guardado con otro dni o de otra fila del lote) haría fallar el lote completo.
+        # Primero se descartan las que chocan con la base; solo pueden chocar los
+        # afiliados nuevos o que cambiaron de legajo o email...
+        por_columna = {columna: {} for columna in COLUMNAS_UNICAS}
+        for dni, afiliado in afiliados.items():
+            anterior = guardadas.get(dni)
+            for columna in COLUMNAS_UNICAS:
+                if anterior is None or getattr(anterior, columna) != afiliado[columna]:
+                    por_columna[columna].setdefault(afiliado[columna], []).append(dni)
+        if any(por_columna.values()):
+            for fila in self.session.execute(
+                    select(Afiliado.dni, *(getattr(Afiliado, columna) for columna in COLUMNAS_UNICAS))
+                    .where(or_(*(getattr(Afiliado, columna).in_(list(por_columna[columna]))
+                                 for columna in COLUMNAS_UNICAS)))):
+                for columna in COLUMNAS_UNICAS:
+                    for dni in por_columna[columna].get(getattr(fila, columna), ()):
+                        if dni != fila.dni and dni in afiliados:
+                            del afiliados[dni]
+                            resumen["omitidos"] += 1
+                            self.rechazos.agregar(posiciones[dni], "afiliado",
+                                                  f"{columna} registrado con otro dni",
+                                                  getattr(fila, columna), dni)
+
+        # ...y después las repetidas dentro del lote, donde gana la última respuesta
+        for columna in COLUMNAS_UNICAS:
+            por_valor = {}
+            for dni, afiliado in afiliados.items():
+                anterior = por_valor.get(afiliado[columna])
+                if anterior is not None:
+                    resumen["omitidos"] += 1
+                    self.rechazos.agregar(posiciones[anterior], "afiliado",
+                                          f"{columna} repetido en el lote",
+                                          afiliado[columna], anterior)
+                por_valor[afiliado[columna]] = dni
+            conservados = set(por_valor.values())
+            afiliados = {dni: afiliado for dni, afiliado in afiliados.items() if dni in conservados}
+
+        if not afiliados:
+            return resumen
+
+        # Familiares tipados y huella de cada afiliado con su familia
+        conyuges_por_dni = {}
+        hijos_por_dni = {}
+        for dni, afiliado in afiliados.items():
+            row = familias[dni]
+            posicion = posiciones[dni]
+            conyuge = self._familiar_a_columnas(row.get("conyuge") or {}, "conyuge", posicion, dni)
+            hijos = {}
+            for hijo in row.get("hijos") or []:
+                hijo = self._familiar_a_columnas(hijo, "hijo", posicion, dni)
+                if hijo is not None:
+                    hijos[hijo["dni"]] = hijo
+            conyuges_por_dni[dni] = conyuge
+            hijos_por_dni[dni] = list(hijos.values())
+            afiliado["huella"] = huella_afiliado(
+                afiliado, row.get("afiliado", {}).get("marca_temporal_creacion"),
+                conyuge, hijos_por_dni[dni])
+
+        cambiados = {}
+        delta = DeltaEstadisticas()
+        for dni, afiliado in afiliados.items():
+            anterior = guardadas.get(dni)
+            if anterior is None:
+                resumen["insertados"] += 1
+            elif anterior.huella != afiliado["huella"]:
+                resumen["actualizados"] += 1
+                delta.afiliado(anterior._mapping, -1)
+            else:
+                resumen["sin_cambios"] += 1
+                continue
+            delta.afiliado(afiliado)
+            cambiados[dni] = afiliado
+
+        if not cambiados:
+            return resumen
+
+        # Fechas de nacimiento de los hijos ya guardados de los afiliados que cambiaron
+        actualizados = [guardadas[dni].id for dni in cambiados if dni in guardadas]
+        hijos_guardados = {}
+        if actualizados:
+            hijos_guardados = {
+                (id_afiliado, dni): fecha for id_afiliado, dni, fecha in self.session.execute(
+                    select(Hijo.id_afiliado, Hijo.dni, Hijo.fecha_nacimiento)
+                    .where(Hijo.id_afiliado.in_(actualizados))
+                )
+            }
+
+        self._upsert_afiliados(list(cambiados.values()))
+
+        # Resolver los ids de todo el lote en una sola consulta
+        ids = dict(self.session.execute(
+            select(Afiliado.dni, Afiliado.id).where(Afiliado.dni.in_(list(cambiados)))
+        ).all())
+
+        conyuges = {}
+        hijos = {}
+        for dni in cambiados:
+            id_afiliado = ids[dni]
+            conyuge = conyuges_por_dni[dni]
+            if conyuge is not None:
+                conyuges[conyuge["dni"]] = dict(conyuge, id_afiliado=id_afiliado)
+            for hijo in hijos_por_dni[dni]:
+                hijos[(id_afiliado, hijo["dni"])] = dict(hijo, id_afiliado=id_afiliado)
+
+        for clave, hijo in hijos.items():
+            if clave in hijos_guardados:
+                delta.hijo(hijos_guardados[clave], -1)
+            delta.hijo(hijo["fecha_nacimiento"])
+
+        if conyuges:
+            self._upsert_conyuges(list(conyuges.values()))
+        if hijos:
+            self._upsert_hijos(list(hijos.values()))
+        self._aplicar_estadisticas(delta)
+
+        if self.commit:
+            self.session.commit()
+
+        resumen["afiliados"] = len(cambiados)
+        resumen["conyuges"] = len(conyuges)
+        resumen["hijos"] = len(hijos)
+        return resumen
+
+    def _eliminar_ausentes(self, resumen: Dict[str, int]) -> None:
+        """
+        Borra los afiliados (con su familia y kits) cuyo dni ya no está en la hoja,
+        salvo que se esté simulando o que superen max_eliminaciones.
+        """
+        ausentes = []
+        for id_afiliado, dni in self.session.execute(select(Afiliado.id, Afiliado.dni)):
+            if dni not in self._vistos:
+                ausentes.append(id_afiliado)
+                self.ausentes.append(dni)
+        resumen["ausentes"] = len(ausentes)
+        if self.simular_eliminacion:
+            self.eliminacion_omitida = "simulación"
+            return
+        if self.max_eliminaciones is not None and len(ausentes) > self.max_eliminaciones:
+            self.eliminacion_omitida = (f"{len(ausentes)} ausentes superan el máximo de "
+                                        f"{self.max_eliminaciones} eliminaciones")
+            return
+        for i in range(0, len(ausentes), self.batch_size):
+            ids = ausentes[i:i + self.batch_size]
+            delta = DeltaEstadisticas()
+            for fila in self.session.execute(
+                    select(*(getattr(Afiliado, dimension) for dimension in DIMENSIONES_AFILIADO))
+                    .where(Afiliado.id.in_(ids))):
+                delta.afiliado(fila._mapping, -1)
+            for fecha, in self.session.execute(
+                    select(Hijo.fecha_nacimiento).where(Hijo.id_afiliado.in_(ids))):
+                delta.hijo(fecha, -1)
+            hijos = select(Hijo.id_hijo).where(Hijo.id_afiliado.in_(ids))
+            self.session.execute(delete(Kit).where(Kit.id_hijo.in_(hijos)))
+            self.session.execute(delete(Hijo).where(Hijo.id_afiliado.in_(ids)))
+            self.session.execute(delete(Conyuge).where(Conyuge.id_afiliado.in_(ids)))
+            self.session.execute(delete(Afiliado).where(Afiliado.id.in_(ids)))
+            self._aplicar_estadisticas(delta)
+        if self.commit:
+            self.session.commit()
+        resumen["eliminados"] = len(ausentes)
+
+    def _aplicar_estadisticas(self, delta: DeltaEstadisticas) -> None:
+        filas = delta.filas()
+        if not filas:
+            return
+        stmt = self._insert(Estadistica)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["dimension", "valor"],
+            set_={"cantidad": Estadistica.__table__.c.cantidad + stmt.excluded.cantidad},
+        )
+        self.session.execute(stmt, filas)
+        if any(fila["cantidad"] < 0 for fila in filas):
+            # Valores que ya no tiene ningún afiliado o hijo
+            self.session.execute(delete(Estadistica).where(Estadistica.cantidad <= 0))
+
+    def _upsert_afiliados(self, values: List[Dict[str, Any]]) -> None:
+        stmt = self._insert(Afiliado)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["dni"],
+            set_={
+                **{col: stmt.excluded[col] for col in COLUMNAS_AFILIADO if col != "dni"},
+                "huella": stmt.excluded.huella,
+                "marca_temporal_actualizacion": func.current_timestamp(),
+            },
+        )
+        self.session.execute(stmt, values)
+
+    def _upsert_conyuges(self, values: List[Dict[str, Any]]) -> None:
+        stmt = self._insert(Conyuge)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["dni"],
+            set_={
+                "id_afiliado": stmt.excluded.id_afiliado,
+                "nombre_apellido": stmt.excluded.nombre_apellido,
+                "fecha_nacimiento": stmt.excluded.fecha_nacimiento,
+                "marca_temporal_actualizacion": func.current_timestamp(),
+            },
+        )
+        self.session.execute(stmt, values)
+
+    def _upsert_hijos(self, values: List[Dict[str, Any]]) -> None:
+        stmt = self._insert(Hijo)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["id_afiliado", "dni"],
+            set_={
+                "nombre_apellido": stmt.excluded.nombre_apellido,
+                "fecha_nacimiento": stmt.excluded.fecha_nacimiento,
+            },
+        )
+        self.session.execute(stmt, values)
+
+    def _afiliado_a_columnas(self, data: Dict[str, Any],
+                             posicion: int) -> Optional[Dict[str, Any]]:
+        """
+        Convierte el dict normalizado del afiliado en columnas tipadas.
+        Devuelve None (y registra el rechazo) si un dato obligatorio falta o es inválido.
+        """
+        values = {col: _valor(data.get(col)) for col in COLUMNAS_AFILIADO}
+        dni_original = values["dni"]
+        for col, value in values.items():
+            if value is None and col not in COLUMNAS_AFILIADO_OPCIONALES:
+                self.rechazos.agregar(posicion, "afiliado", f"falta {col}", dni=dni_original)
+                return None
+
+        values["dni"] = parse_dni(dni_original)
+        if values["dni"] is None:
+            self.rechazos.agregar(posicion, "afiliado", "dni inválido", dni_original, dni_original)
+            return None
+        for col in COLUMNAS_FECHA_AFILIADO:
+            fecha = parse_fecha(values[col])
+            if fecha is None:
+                self.rechazos.agregar(posicion, "afiliado", f"{col} inválido",
+                                      values[col], values["dni"])
+                return None
+            values[col] = fecha
+
+        # Sin una marca temporal legible se toma el momento de la carga
+        values["marca_temporal_creacion"] = (
+            parse_marca_temporal(data.get("marca_temporal_creacion")) or datetime.now()
+        )
+        return values
+
+    def _familiar_a_columnas(self, data: Dict[str, Any], entidad: str, posicion: int,
+                             dni_afiliado: str) -> Optional[Dict[str, Any]]:
+        """
+        Convierte un cónyuge o hijo normalizado en columnas tipadas; None si está
+        vacío, incompleto o con datos inválidos (solo los dos últimos se registran).
+        """
+        values = {col: _valor(data.get(col)) for col in COLUMNAS_FAMILIAR}
+        if all(value is None for value in values.values()):
+            return None
+        for col, value in values.items():
+            if value is None:
+                self.rechazos.agregar(posicion, entidad, f"falta {col}", dni=dni_afiliado)
+                return None
+
+        dni = parse_dni(values["dni"])
+        if dni is None:
+            self.rechazos.agregar(posicion, entidad, "dni inválido", values["dni"], dni_afiliado)
+            return None
+        fecha = parse_fecha(values["fecha_nacimiento"])
+        if fecha is None:
+            self.rechazos.agregar(posicion, entidad, "fecha_nacimiento inválido",
+                                  values["fecha_nacimiento"], dni_afiliado)
+            return None
+        values["dni"] = dni
+        values["fecha_nacimiento"] = fecha
+        return values
@@ -0,0 +1,159 @@
+import re
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+# 11. Conversión de tipos de las celdas de la hoja
+
+# Fechas de las columnas de tipo Date: 31/12/1990, 31-12-1990 o 1990-12-31
+_FECHA_DMA = re.compile(r"(\d{1,2})[/-](\d{1,2})[/-](\d{4})")
+_FECHA_ISO = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+
+# "Marca temporal" de Google Forms: 31/12/2024 18:05:00 (o mes primero) y formato ISO
+_MARCA_BARRAS = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4}) (\d{1,2}):(\d{2}):(\d{2})")
+_MARCA_ISO = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})[ T](\d{1,2}):(\d{2}):(\d{2})")
+
+# DNI: solo dígitos, una vez quitados puntos, espacios y guiones
+_DNI = re.compile(r"\d{6,9}")
+_SEPARADORES_DNI = str.maketrans("", "", ". -")
+
+# Las fechas se repiten mucho entre filas (nacimientos, ingresos, días de respuesta)
+_TAMANO_CACHE = 8192
+
+
+def _fecha(anio: str, mes: str, dia: str) -> Optional[date]:
+    try:
+        return date(int(anio), int(mes), int(dia))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=_TAMANO_CACHE)
+def _parse_fecha_texto(texto: str) -> Optional[date]:
+    match = _FECHA_DMA.fullmatch(texto)
+    if match:
+        dia, mes, anio = match.groups()
+        return _fecha(anio, mes, dia)
+    match = _FECHA_ISO.fullmatch(texto)
+    if match:
+        return _fecha(*match.groups())
+    return None
+
+
+def parse_fecha(valor: Any) -> Optional[date]:
+    """
+    Convierte una celda de fecha en date.
+
+    Returns:
+        date | None: None si el valor falta o no es una fecha válida
+    """
+    if isinstance(valor, date):
+        return valor
+    if not isinstance(valor, str):
+        return None
+    return _parse_fecha_texto(valor.strip())
+
+
+@lru_cache(maxsize=_TAMANO_CACHE)
+def _parse_marca_texto(texto: str) -> Optional[datetime]:
+    match = _MARCA_BARRAS.fullmatch(texto)
+    if match:
+        primero, segundo, anio, hora, minuto, segundos = map(int, match.groups())
+        # Día primero como escribe Google Forms en es-AR; mes primero si el día no es válido
+        for dia, mes in ((primero, segundo), (segundo, primero)):
+            try:
+                return datetime(anio, mes, dia, hora, minuto, segundos)
+            except ValueError:
+                continue
+        return None
+    match = _MARCA_ISO.fullmatch(texto)
+    if match:
+        try:
+            return datetime(*map(int, match.groups()))
+        except ValueError:
+            return None
+    return None
+
+
+def parse_marca_temporal(valor: Any) -> Optional[datetime]:
+    """
+    Convierte el texto de la columna "Marca temporal" en datetime.
+
+    Returns:
+        datetime | None: None si el valor falta o no tiene un formato conocido
+    """
+    if isinstance(valor, datetime):
+        return valor
+    if not isinstance(valor, str):
+        return None
+    return _parse_marca_texto(valor.strip())
+
+
+def parse_dni(valor: Any) -> Optional[str]:
+    """
+    Normaliza un DNI a sus dígitos ("20.123.456" -> "20123456").
+
+    Returns:
+        str | None: None si el valor falta o no es un DNI válido
+    """
+    if isinstance(valor, int):
+        valor = str(valor)
+    if not isinstance(valor, str):
+        return None
+    dni = valor.translate(_SEPARADORES_DNI)
+    return dni if _DNI.fullmatch(dni) else None
+
+
+class InformeRechazos:
+    """
+    Registro de las filas (o familiares) que no se pudieron cargar y por qué.
+
+    Se guarda la cantidad por motivo y, como muestra, el detalle de los primeros
+    `max_ejemplos` rechazos, para que una carga grande no acumule memoria sin límite.
+
+    Parameters:
+        max_ejemplos(int): Máximo de rechazos guardados con detalle.
+
+    Methods:
+        agregar(fila, entidad, motivo, ...): Registra un rechazo.
+        a_dict(): Devuelve el informe listo para serializar a JSON.
+    """
+
+    def __init__(self, max_ejemplos: int = 100):
+        self.max_ejemplos = max_ejemplos
+        self.total = 0
+        self.por_motivo: Dict[str, int] = {}
+        self.ejemplos: List[Dict[str, Any]] = []
+
+    def agregar(self, fila: int, entidad: str, motivo: str,
+                valor: Any = None, dni: Optional[str] = None) -> None:
+        """
+        Parameters:
+            fila(int): Número de fila en la hoja, o la posición dentro de la carga
+                (1 es la primera) si las filas no lo traen.
+            entidad(str): "afiliado", "conyuge" o "hijo".
+            motivo(str): Descripción breve del problema, p. ej. "fecha_nacimiento inválido".
+            valor: Valor que causó el rechazo, si corresponde.
+            dni(str | None): DNI del afiliado de la fila, para ubicarla.
+        """
+        self.total += 1
+        clave = f"{entidad}: {motivo}"
+        self.por_motivo[clave] = self.por_motivo.get(clave, 0) + 1
+        if len(self.ejemplos) < self.max_ejemplos:
+            self.ejemplos.append({
+                "fila": fila,
+                "entidad": entidad,
+                "motivo": motivo,
+                "valor": valor,
+                "dni": dni,
+            })
+
+    def a_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "por_motivo": dict(self.por_motivo),
+            "ejemplos": list(self.ejemplos),
+        }
+
+    def __len__(self) -> int:
+        return self.total
@@ -0,0 +1,106 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# Hash de contraseñas
+
+
+class PasswordHasher:
+    """
+    Servicio de hash de contraseñas con algoritmo y costo configurables.
+
+    Envuelve generate_password_hash / check_password_hash de werkzeug y permite
+    verificar las contraseñas en un pool acotado de hilos o procesos, para que
+    una ráfaga de logins no ocupe todos los workers con cálculo de hashes.
+
+    Configuración (Config):
+        PASSWORD_HASH_METHOD: método de werkzeug, p. ej. 'scrypt' o 'pbkdf2:sha256:600000'.
+        PASSWORD_SALT_LENGTH: largo del salt.
+        PASSWORD_VERIFY_WORKERS: tamaño del pool de verificación; 0 verifica en el hilo del pedido.
+        PASSWORD_VERIFY_EXECUTOR: 'thread' o 'process'.
+        PASSWORD_VERIFY_TIMEOUT: segundos que una verificación en el pool espera lugar
+            y resultado; pasado ese tiempo verify() lanza TimeoutError.
+
+    Methods:
+        init_app(app): Lee la configuración y crea el pool.
+        hash(password): Genera el hash con los parámetros actuales.
+        verify(pwhash, password): Verifica una contraseña (en el pool si está configurado).
+            Raises TimeoutError si el pool no la resuelve en PASSWORD_VERIFY_TIMEOUT.
+        needs_rehash(pwhash): Indica si el hash fue generado con otros parámetros.
+    """
+
+    def __init__(self, method: str = "scrypt", salt_length: int = 16, workers: int = 0,
+                 executor: str = "thread", timeout: Optional[float] = None):
+        self._configurar(method, salt_length, workers, executor, timeout)
+
+    def init_app(self, app) -> None:
+        self.shutdown()
+        self._configurar(
+            app.config.get("PASSWORD_HASH_METHOD", "scrypt"),
+            app.config.get("PASSWORD_SALT_LENGTH", 16),
+            app.config.get("PASSWORD_VERIFY_WORKERS", 0),
+            app.config.get("PASSWORD_VERIFY_EXECUTOR", "thread"),
+            app.config.get("PASSWORD_VERIFY_TIMEOUT"),
+        )
+
+    def _configurar(self, method: str, salt_length: int, workers: int, executor: str,
+                    timeout: Optional[float]) -> None:
+        self.method = method
+        self.salt_length = salt_length
+        self.timeout = timeout
+        self._method_prefix = None
+
+        self.workers = workers
+        self._pool = None
+        self._lugares = None
+        if workers > 0:
+            if executor == "process":
+                self._pool = ProcessPoolExecutor(max_workers=workers)
+            elif executor == "thread":
+                self._pool = ThreadPoolExecutor(max_workers=workers,
+                                                thread_name_prefix="password-verify")
+            else:
+                raise ValueError(f"PASSWORD_VERIFY_EXECUTOR inválido: {executor!r}")
+            # Acota los pedidos pendientes: quien excede espera en lugar de encolar sin límite
+            self._lugares = threading.BoundedSemaphore(workers * 2)
+
+    def hash(self, password: str) -> str:
+        return generate_password_hash(password, method=self.method, salt_length=self.salt_length)
+
+    def verify(self, pwhash: str, password: str) -> bool:
+        if self._pool is None:
+            return check_password_hash(pwhash, password)
+        if not self._lugares.acquire(timeout=self.timeout):
+            raise TimeoutError("No hay lugar en el pool de verificación de contraseñas")
+        try:
+            return self._pool.submit(check_password_hash, pwhash, password).result(self.timeout)
+        finally:
+            self._lugares.release()
+
+    @property
+    def method_prefix(self) -> str:
+        """
+        Prefijo completo que werkzeug escribe para el método configurado
+        ('scrypt:32768:8:1', 'pbkdf2:sha256:1000000', ...), contra el que se comparan
+        los hashes guardados. Se calcula una vez, en el primer uso.
+        """
+        if self._method_prefix is None:
+            self._method_prefix = self.hash("").split("$", 1)[0]
+        return self._method_prefix
+
+    def needs_rehash(self, pwhash: str) -> bool:
+        try:
+            method, salt, _ = pwhash.split("$", 2)
+        except ValueError:
+            return True
+        return method != self.method_prefix or len(salt) != self.salt_length
+
+    def shutdown(self) -> None:
+        pool = getattr(self, "_pool", None)
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+
+password_hasher = PasswordHasher()
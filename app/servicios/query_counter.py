@@ -0,0 +1,64 @@
+from contextlib import contextmanager
+from typing import List
+
+from sqlalchemy import event
+
+from .. import db
+
+# Conteo de consultas SQL, para detectar problemas N+1
+
+
+class ContadorConsultas:
+    """
+    Context manager que cuenta las sentencias SQL ejecutadas sobre un engine.
+
+    Parameters:
+        engine: Engine de SQLAlchemy (por defecto db.engine de la app actual).
+
+    Attributes:
+        cantidad(int): Sentencias ejecutadas dentro del bloque.
+        sentencias(List[str]): SQL de cada sentencia, en orden.
+
+    Ejemplo:
+        with ContadorConsultas() as contador:
+            obtener_afiliado_con_familia(1)
+        print(contador.cantidad)
+    """
+
+    def __init__(self, engine=None):
+        self.engine = engine
+        self.sentencias: List[str] = []
+
+    @property
+    def cantidad(self) -> int:
+        return len(self.sentencias)
+
+    def _registrar(self, conn, cursor, statement, parameters, context, executemany):
+        self.sentencias.append(statement)
+
+    def __enter__(self) -> "ContadorConsultas":
+        self.engine = self.engine or db.engine
+        event.listen(self.engine, "before_cursor_execute", self._registrar)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._registrar)
+
+
+@contextmanager
+def max_consultas(maximo: int, engine=None):
+    """
+    Falla con AssertionError si el bloque ejecuta más de `maximo` consultas.
+
+    Pensado para pruebas: si una relación vuelve a cargarse de forma perezosa
+    dentro de un bucle, la cantidad de consultas crece con los datos y el
+    límite lo detecta.
+    """
+    with ContadorConsultas(engine) as contador:
+        yield contador
+    if contador.cantidad > maximo:
+        detalle = "\n".join(contador.sentencias)
+        raise AssertionError(
+            f"Se esperaban como máximo {maximo} consultas y se ejecutaron "
+            f"{contador.cantidad}:\n{detalle}"
+        )
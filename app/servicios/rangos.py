@@ -0,0 +1,118 @@
+import re
+from typing import List, Optional
+
+# Utilidades para rangos en notación A1
+
+_PATRON_A1 = re.compile(
+    r"^(?:(?P<hoja>.+)!)?"
+    r"(?P<col_inicio>[A-Za-z]*)(?P<fila_inicio>\d*)"
+    r"(?::(?P<col_fin>[A-Za-z]*)(?P<fila_fin>\d*))?$"
+)
+
+# Referencia a celdas sin nombre de hoja ('A1:C10', 'A2:BZ')
+_PATRON_CELDAS = re.compile(r"^[A-Za-z]{0,3}\d*(?::[A-Za-z]{0,3}\d*)?$")
+
+# Columna usada cuando el rango no indica columnas (solo el nombre de la hoja)
+COLUMNA_MAXIMA = "ZZZ"
+
+
+def columna_a_indice(columna: str) -> int:
+    """Convierte una columna en letras ('A', 'BZ') a índice 0-based."""
+    indice = 0
+    for letra in columna.upper():
+        indice = indice * 26 + (ord(letra) - ord("A") + 1)
+    return indice - 1
+
+
+def indice_a_columna(indice: int) -> str:
+    """Convierte un índice 0-based en la columna en letras."""
+    columna = ""
+    indice += 1
+    while indice:
+        indice, resto = divmod(indice - 1, 26)
+        columna = chr(ord("A") + resto) + columna
+    return columna
+
+
+def filas_vacias(cantidad: int) -> List[List]:
+    """Filas vacías, como las devuelve la API para una fila sin datos."""
+    return [[] for _ in range(cantidad)]
+
+
+class RangoA1:
+    """
+    Representación de un rango en notación A1 ('Hoja1!A1:BZ', 'Hoja1!A2:C10', 'Hoja1').
+
+    Parameters:
+        hoja(str | None): Nombre de la hoja.
+        col_inicio(str): Columna inicial.
+        fila_inicio(int): Fila inicial (1-based).
+        col_fin(str): Columna final.
+        fila_fin(int | None): Fila final; None si el rango es abierto hacia abajo.
+
+    Methods:
+        parse(range_name): Construye un RangoA1 a partir de un string.
+        con_filas(inicio, fin): Devuelve el mismo rango de columnas limitado a otras filas.
+    """
+
+    def __init__(self, hoja: Optional[str], col_inicio: str, fila_inicio: int,
+                 col_fin: str, fila_fin: Optional[int]):
+        self.hoja = hoja
+        self.col_inicio = col_inicio
+        self.fila_inicio = fila_inicio
+        self.col_fin = col_fin
+        self.fila_fin = fila_fin
+
+    @classmethod
+    def parse(cls, range_name: str) -> "RangoA1":
+        range_name = range_name.strip()
+        if "!" not in range_name and not _PATRON_CELDAS.match(range_name):
+            # Solo el nombre de la hoja: se toma la hoja completa
+            return cls(range_name.strip("'"), "A", 1, COLUMNA_MAXIMA, None)
+
+        match = _PATRON_A1.match(range_name)
+        if match is None:
+            raise ValueError(f"Rango A1 inválido: {range_name!r}")
+        partes = match.groupdict()
+
+        col_inicio = (partes["col_inicio"] or "A").upper()
+        fila_inicio = int(partes["fila_inicio"] or 1)
+        if partes["col_fin"] is None and partes["fila_fin"] is None:
+            # Solo la hoja o una única celda/columna
+            if partes["col_inicio"] or partes["fila_inicio"]:
+                col_fin = col_inicio if partes["col_inicio"] else COLUMNA_MAXIMA
+                fila_fin = int(partes["fila_inicio"]) if partes["fila_inicio"] else None
+            else:
+                col_fin, fila_fin = COLUMNA_MAXIMA, None
+        else:
+            col_fin = (partes["col_fin"] or COLUMNA_MAXIMA).upper()
+            fila_fin = int(partes["fila_fin"]) if partes["fila_fin"] else None
+
+        hoja = partes["hoja"]
+        if hoja and hoja.startswith("'") and hoja.endswith("'"):
+            hoja = hoja[1:-1].replace("''", "'")
+        return cls(hoja, col_inicio, fila_inicio, col_fin, fila_fin)
+
+    def con_filas(self, inicio: int, fin: Optional[int] = None) -> str:
+        """
+        Devuelve el rango con las mismas columnas pero restringido a las filas indicadas.
+
+        Parameters:
+            inicio(int): Primera fila (1-based).
+            fin(int | None): Última fila; None para dejar el rango abierto.
+
+        Returns:
+            str: Rango en notación A1
+        """
+        celdas = f"{self.col_inicio}{inicio}:{self.col_fin}{fin if fin is not None else ''}"
+        if self.hoja is None:
+            return celdas
+        return f"{self._hoja_a1()}!{celdas}"
+
+    def _hoja_a1(self) -> str:
+        if re.fullmatch(r"[A-Za-z0-9_]+", self.hoja):
+            return self.hoja
+        return "'" + self.hoja.replace("'", "''") + "'"
+
+    def __str__(self) -> str:
+        return self.con_filas(self.fila_inicio, self.fila_fin)
@@ -0,0 +1,110 @@
+import threading
+from typing import Optional
+
+from flask import current_app
+
+from .cache import CachedSheetsService
+from .repository import GoogleSheetsRepository
+from .sheets_client import GoogleSheetsClient, ISheetsClient, fabrica_compartida
+from .sheets_service import SheetsService
+from .transformer import DataTransformer
+
+# Registro de la pila de Google Sheets por aplicación
+
+
+class _PilaSheets:
+    """Cliente, servicio y cache de una aplicación; cada pieza se arma en su primer uso."""
+
+    def __init__(self, config, client: Optional[ISheetsClient] = None):
+        self.credentials_file = config.get("GOOGLE_APPLICATION_CREDENTIALS")
+        self.spreadsheet_id = config.get("SPREADSHEET_ID")
+        self.range_name = config.get("RANGE_NAME")
+        self.cache_ttl = config.get("SHEETS_CACHE_TTL", 300)
+        self.discovery_cache = config.get("SHEETS_DISCOVERY_CACHE")
+        self._client = client
+        self._service = None
+        self._cached = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> ISheetsClient:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    fabrica = fabrica_compartida(self.credentials_file,
+                                                 cache_path=self.discovery_cache)
+                    self._client = GoogleSheetsClient(credentials_file=self.credentials_file,
+                                                      spreadsheet_id=self.spreadsheet_id,
+                                                      fabrica=fabrica)
+        return self._client
+
+    @property
+    def service(self) -> SheetsService:
+        if self._service is None:
+            client = self.client
+            with self._lock:
+                if self._service is None:
+                    self._service = SheetsService(GoogleSheetsRepository(client), DataTransformer())
+        return self._service
+
+    @property
+    def cached(self) -> CachedSheetsService:
+        if self._cached is None:
+            service = self.service
+            with self._lock:
+                if self._cached is None:
+                    self._cached = CachedSheetsService(service, ttl=self.cache_ttl)
+        return self._cached
+
+
+class RegistroSheets:
+    """
+    Extensión que da acceso a la pila de Google Sheets de la aplicación actual.
+
+    Nada se construye en create_app: el cliente (y con él googleapiclient y las
+    credenciales) se crea recién cuando un pedido, comando o trabajo lo usa por
+    primera vez, y se reutiliza en adelante. Así los comandos que no tocan la hoja
+    (flask db upgrade, asignar-kits...) no pagan ese costo.
+
+    Configuración (Config):
+        GOOGLE_APPLICATION_CREDENTIALS, SPREADSHEET_ID, RANGE_NAME, SHEETS_CACHE_TTL
+        y SHEETS_DISCOVERY_CACHE.
+
+    Methods:
+        init_app(app, client): Registra la extensión; `client` permite inyectar otro
+            ISheetsClient (p. ej. FakeSheetsClient).
+        usar_cliente(client, app): Reemplaza el cliente y descarta el servicio y la cache.
+        client / service / cached / range_name: Piezas de la aplicación actual.
+    """
+
+    def init_app(self, app, client: Optional[ISheetsClient] = None) -> None:
+        app.extensions["sheets"] = _PilaSheets(app.config, client)
+
+    def usar_cliente(self, client: ISheetsClient, app=None) -> None:
+        app = app or current_app
+        app.extensions["sheets"] = _PilaSheets(app.config, client)
+
+    @staticmethod
+    def _pila() -> _PilaSheets:
+        return current_app.extensions["sheets"]
+
+    @property
+    def client(self) -> ISheetsClient:
+        return self._pila().client
+
+    @property
+    def service(self) -> SheetsService:
+        """Servicio sin cache, para las cargas en la base."""
+        return self._pila().service
+
+    @property
+    def cached(self) -> CachedSheetsService:
+        """Servicio con cache, para responder /sync."""
+        return self._pila().cached
+
+    @property
+    def range_name(self) -> Optional[str]:
+        return self._pila().range_name
+
+
+sheets = RegistroSheets()
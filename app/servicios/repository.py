@@ -8,4 +8,10 @@ class GoogleSheetsRepository:
         self.client = client
     
     def get_raw_data(self, range_name):
-        return self.client.read_range(range_name)
\ No newline at end of file
+        return self.client.read_range(range_name)
+
+    def iter_raw_data(self, range_name, chunk_rows=1000, windows_per_request=1):
+        """Devuelve las filas del rango de a una, leyéndolas por ventanas."""
+        for chunk in self.client.read_range_chunked(
+                range_name, chunk_rows=chunk_rows, windows_per_request=windows_per_request):
+            yield from chunk
@@ -0,0 +1,232 @@
+import os
+import random
+import socket
+import threading
+import time
+from typing import Any, Callable, Optional
+
+# Reintentos, límite de tasa y circuit breaker para las llamadas a Google Sheets
+
+# Códigos HTTP que indican un error transitorio (cuota o falla del servidor)
+ESTADOS_REINTENTABLES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class CircuitoAbierto(Exception):
+    """
+    Se rechazó la llamada porque el circuito está abierto tras fallas consecutivas.
+    `reintentar_en` indica cuántos segundos faltan para volver a intentar.
+    """
+
+    def __init__(self, mensaje: str, reintentar_en: Optional[float] = None):
+        super().__init__(mensaje)
+        self.reintentar_en = reintentar_en
+
+
+def estado_http(error: BaseException) -> Optional[int]:
+    """Código HTTP de un error de la API (HttpError de googleapiclient o equivalente)."""
+    estado = getattr(error, "status_code", None)
+    if estado is None:
+        resp = getattr(error, "resp", None)
+        estado = getattr(resp, "status", None)
+    try:
+        return int(estado) if estado is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def es_error_transitorio(error: BaseException) -> bool:
+    """True para 408/429/5xx y errores de red; esos se reintentan."""
+    if isinstance(error, (ConnectionError, TimeoutError, socket.timeout)):
+        return True
+    return estado_http(error) in ESTADOS_REINTENTABLES
+
+
+def es_rechazo_por_cuota(error: BaseException) -> bool:
+    """
+    True para 429: la API rechazó el pedido sin procesarlo. Es el único error
+    transitorio tras el cual se sabe que un pedido no idempotente (un append) no
+    se aplicó; tras un 5xx o un timeout pudo haberse aplicado igual.
+    """
+    return estado_http(error) == 429
+
+
+class TokenBucket:
+    """
+    Limitador de tasa token bucket, seguro entre hilos.
+
+    Parameters:
+        rate(float): Tokens que se reponen por segundo (pedidos/s sostenidos).
+        capacity(float): Máximo de tokens acumulables (tamaño de ráfaga).
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._ultimo = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1) -> None:
+        """Espera hasta que haya `tokens` disponibles y los consume."""
+        while True:
+            with self._lock:
+                ahora = self._clock()
+                self.tokens = min(self.capacity, self.tokens + (ahora - self._ultimo) * self.rate)
+                self._ultimo = ahora
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                espera = (tokens - self.tokens) / self.rate
+            self._sleep(espera)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker: tras `umbral` fallas transitorias consecutivas se abre y
+    rechaza llamadas durante `tiempo_apertura` segundos; después deja pasar una
+    sola llamada de prueba (semiabierto), rechaza las demás mientras la prueba
+    está en curso y se cierra si sale bien.
+    """
+
+    CERRADO, ABIERTO, SEMIABIERTO = "cerrado", "abierto", "semiabierto"
+
+    def __init__(self, umbral: int = 5, tiempo_apertura: float = 30,
+                 clock: Callable[[], float] = time.monotonic):
+        self.umbral = umbral
+        self.tiempo_apertura = tiempo_apertura
+        self.estado = self.CERRADO
+        self.fallas = 0
+        self._abierto_desde = 0.0
+        self._prueba_en_curso = False
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def antes(self) -> None:
+        with self._lock:
+            if self.estado == self.ABIERTO:
+                restante = self.tiempo_apertura - (self._clock() - self._abierto_desde)
+                if restante > 0:
+                    raise CircuitoAbierto("Google Sheets no responde; se reintentará más tarde",
+                                          reintentar_en=restante)
+                self.estado = self.SEMIABIERTO
+                self._prueba_en_curso = False
+            if self.estado == self.SEMIABIERTO:
+                if self._prueba_en_curso:
+                    raise CircuitoAbierto("Google Sheets no responde; se está probando la conexión",
+                                          reintentar_en=1)
+                self._prueba_en_curso = True
+
+    def exito(self) -> None:
+        """La API respondió (aunque sea con un error del pedido): se cierra el circuito."""
+        with self._lock:
+            self.estado = self.CERRADO
+            self.fallas = 0
+            self._prueba_en_curso = False
+
+    def falla(self) -> None:
+        with self._lock:
+            self.fallas += 1
+            if self.estado == self.SEMIABIERTO or self.fallas >= self.umbral:
+                self.estado = self.ABIERTO
+                self._abierto_desde = self._clock()
+            self._prueba_en_curso = False
+
+
+class PoliticaReintentos:
+    """
+    Ejecuta llamadas a la API pasando por el limitador de tasa, el circuit breaker
+    y reintentos con backoff exponencial con jitter ("full jitter").
+
+    Parameters:
+        limiter(TokenBucket | None): Limitador compartido por todas las llamadas.
+        breaker(CircuitBreaker | None): Circuit breaker compartido.
+        max_intentos(int): Intentos totales por llamada (incluye el primero).
+        base(float): Segundos del primer backoff.
+        maximo(float): Tope de cada backoff.
+        es_reintentable(Callable): Decide si un error se reintenta.
+
+    Methods:
+        ejecutar(fn, idempotente): Llama a fn() aplicando la política y devuelve su
+            resultado. Las llamadas no idempotentes solo se reintentan tras un 429.
+    """
+
+    def __init__(self, limiter: Optional[TokenBucket] = None,
+                 breaker: Optional[CircuitBreaker] = None, max_intentos: int = 5,
+                 base: float = 0.5, maximo: float = 32,
+                 es_reintentable: Callable[[BaseException], bool] = es_error_transitorio,
+                 sleep: Callable[[float], None] = time.sleep,
+                 rng: Optional[random.Random] = None):
+        self.limiter = limiter
+        self.breaker = breaker
+        self.max_intentos = max_intentos
+        self.base = base
+        self.maximo = maximo
+        self.es_reintentable = es_reintentable
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+
+    def backoff(self, intento: int) -> float:
+        """Espera antes del reintento número `intento` (0-based)."""
+        return self._rng.uniform(0, min(self.maximo, self.base * 2 ** intento))
+
+    def ejecutar(self, fn: Callable[[], Any], idempotente: bool = True) -> Any:
+        intento = 0
+        while True:
+            if self.breaker is not None:
+                self.breaker.antes()
+            if self.limiter is not None:
+                self.limiter.acquire()
+            try:
+                resultado = fn()
+            except Exception as error:
+                if not self.es_reintentable(error):
+                    # Error del pedido (400, 403, 404...): reintentar no cambia nada,
+                    # pero la API respondió
+                    if self.breaker is not None:
+                        self.breaker.exito()
+                    raise
+                if self.breaker is not None:
+                    self.breaker.falla()
+                intento += 1
+                if intento >= self.max_intentos:
+                    raise
+                if not idempotente and not es_rechazo_por_cuota(error):
+                    # Tras un 5xx o un timeout el pedido pudo haberse aplicado:
+                    # repetirlo duplicaría, p. ej., las filas de un append
+                    raise
+                self._sleep(self.backoff(intento - 1))
+                continue
+            if self.breaker is not None:
+                self.breaker.exito()
+            return resultado
+
+
+def politica_desde_entorno() -> PoliticaReintentos:
+    """
+    Política configurada con variables de entorno:
+    SHEETS_RATE_LIMIT (pedidos/s), SHEETS_BURST, SHEETS_MAX_RETRIES,
+    SHEETS_BREAKER_THRESHOLD y SHEETS_BREAKER_COOLDOWN (segundos).
+    """
+    return PoliticaReintentos(
+        limiter=TokenBucket(rate=float(os.getenv("SHEETS_RATE_LIMIT", "1")),
+                            capacity=float(os.getenv("SHEETS_BURST", "10"))),
+        breaker=CircuitBreaker(umbral=int(os.getenv("SHEETS_BREAKER_THRESHOLD", "5")),
+                               tiempo_apertura=float(os.getenv("SHEETS_BREAKER_COOLDOWN", "30"))),
+        max_intentos=int(os.getenv("SHEETS_MAX_RETRIES", "5")),
+    )
+
+
+_politica_compartida = None
+_politica_lock = threading.Lock()
+
+
+def politica_compartida() -> PoliticaReintentos:
+    """Política única del proceso, para que todos los clientes compartan la cuota."""
+    global _politica_compartida
+    with _politica_lock:
+        if _politica_compartida is None:
+            _politica_compartida = politica_desde_entorno()
+        return _politica_compartida
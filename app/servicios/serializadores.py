@@ -0,0 +1,90 @@
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Optional
+
+# Conversión de modelos a diccionarios para las respuestas JSON
+
+CAMPOS_AFILIADO = (
+    "id", "apellido", "nombre", "fecha_nacimiento", "dni", "email", "telefono",
+    "nacionalidad", "genero", "estado_civil", "provincia", "localidad", "direccion",
+    "codigo_postal", "nivel_educativo", "titulo_obtenido", "numero_legajo",
+    "fecha_ingreso", "comuna_donde_trabaja", "relacion_dependencia",
+    "marca_temporal_creacion", "marca_temporal_actualizacion",
+)
+
+
+def valor_json(valor: Any) -> Any:
+    """Convierte fechas a ISO 8601; el resto se devuelve sin cambios."""
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    return valor
+
+
+def afiliado_a_dict(afiliado: Any, campos: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Serializa un Afiliado (o una fila con sus columnas) a un diccionario.
+
+    Parameters:
+        afiliado: Instancia de Afiliado o Row con atributos de sus columnas.
+        campos(Iterable[str] | None): Campos a incluir; por defecto todos.
+
+    Returns:
+        Dict[str, Any]: Campos del afiliado con las fechas en ISO 8601
+    """
+    campos = CAMPOS_AFILIADO if campos is None else campos
+    return {campo: valor_json(getattr(afiliado, campo)) for campo in campos}
+
+
+def conyuge_a_dict(conyuge: Any) -> Dict[str, Any]:
+    return {
+        "id": conyuge.id,
+        "nombre_apellido": conyuge.nombre_apellido,
+        "fecha_nacimiento": valor_json(conyuge.fecha_nacimiento),
+        "dni": conyuge.dni,
+    }
+
+
+def kit_a_dict(kit: Any) -> Dict[str, Any]:
+    return {
+        "id_kit": kit.id_kit,
+        "tipo_kit": kit.tipo_kit,
+        "descripcion": kit.catalogo.descripcion if kit.catalogo else None,
+        "contiene": kit.catalogo.contiene if kit.catalogo else None,
+    }
+
+
+def hijo_a_dict(hijo: Any) -> Dict[str, Any]:
+    return {
+        "id_hijo": hijo.id_hijo,
+        "nombre_apellido": hijo.nombre_apellido,
+        "fecha_nacimiento": valor_json(hijo.fecha_nacimiento),
+        "dni": hijo.dni,
+        "kits": [kit_a_dict(kit) for kit in hijo.kits],
+    }
+
+
+def afiliado_con_familia_a_dict(afiliado: Any) -> Dict[str, Any]:
+    """Serializa un afiliado junto con sus cónyuges, hijos y los kits de cada hijo."""
+    data = afiliado_a_dict(afiliado)
+    data["conyuges"] = [conyuge_a_dict(conyuge) for conyuge in afiliado.conyuges]
+    data["hijos"] = [hijo_a_dict(hijo) for hijo in afiliado.hijos]
+    return data
+
+
+def sync_job_a_dict(job: Any) -> Dict[str, Any]:
+    return {
+        "id": job.id,
+        "modo": job.modo,
+        "estado": job.estado,
+        "progreso": {
+            "filas_leidas": job.filas_leidas,
+            "afiliados": job.afiliados,
+            "conyuges": job.conyuges,
+            "hijos": job.hijos,
+            "omitidos": job.omitidos,
+        },
+        "rechazos": job.rechazos,
+        "error": job.error,
+        "creado": valor_json(job.marca_temporal_creacion),
+        "iniciado": valor_json(job.marca_temporal_inicio),
+        "finalizado": valor_json(job.marca_temporal_fin),
+    }
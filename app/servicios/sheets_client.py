@@ -1,36 +1,16 @@
+import json
+import logging
 import os
-
-from dotenv import load_dotenv
-from googleapiclient.discovery import build
-from oauth2client.service_account import ServiceAccountCredentials
+import threading
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
-from functools import wraps
-
-# Configuración
-
-# Cargar variables de entorno desde el archivo .env
-load_dotenv()
-
-
-# Ruta al archivo
-SERVICE_ACCOUNT_FILE = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Iterator, Sequence, Tuple
 
-# Archivo JSON de la cuenta de servicio de Google
-SPREADSHEET_ID = os.getenv("SPREADSHEET_ID")
+from .rangos import RangoA1, filas_vacias
+from .instrumentacion import medir_llamada_sheets
+from .resiliencia import PoliticaReintentos, politica_compartida
 
-# En la URL de tu hoja de cálculo, el ID es la parte entre "/d/" y "/edit"
-RANGE_NAME = os.getenv("RANGE_NAME")
-
-def singleton(cls):
-    instances = {}
-    
-    @wraps(cls)
-    def get_instance(*args, **kwargs):
-        if cls not in instances:
-            instances[cls] = cls(*args, **kwargs)
-        return instances[cls]
-    return get_instance
+logger = logging.getLogger(__name__)
 
 # 1. Interfaz
 
@@ -58,29 +38,199 @@ class ISheetsClient(ABC):
         """Limpia un rango específico."""
         pass
 
+    @abstractmethod
+    def read_range_chunked(self, range_name: str, chunk_rows: int = 1000,
+                           windows_per_request: int = 1) -> Iterator[List[List[Any]]]:
+        """
+        Lee un rango por ventanas de filas y las entrega de a una, en orden. Las filas
+        vacías intermedias se entregan como listas vacías; el iterador se agota solo
+        después de confirmar que no quedan datos en el rango.
+        """
+        pass
+
+    @abstractmethod
+    def batch_update(self, updates: Sequence[Tuple[str, List[List[Any]]]]) -> Dict:
+        """Escribe varios rangos en un solo pedido, en el orden dado."""
+        pass
+
     
 
 
-# 2. Implementación concreta
+# 2. Fábrica compartida del servicio de la API
+
+class FabricaServicioSheets:
+    """
+    Crea y reutiliza los objetos de la API de Sheets de un proceso, de forma segura
+    entre hilos.
+
+    - Documento de discovery: se carga una sola vez por proceso y los servicios se
+      arman con build_from_document, sin volver a leerlo ni parsearlo. Se busca en
+      `cache_path`, luego en los documentos incluidos en googleapiclient y por
+      último en la red; se guarda en `cache_path` para poder arrancar sin red.
+    - Transporte: un servicio por hilo, cada uno con su httplib2.Http (que no es
+      seguro entre hilos) y sus conexiones HTTPS persistentes, reutilizadas entre pedidos.
+    - Credenciales: compartidas por todos los hilos y renovadas `margen_renovacion`
+      segundos antes de vencer, en lugar de esperar a que un pedido falle con 401.
+
+    Parameters:
+        credentials_file(str): Archivo JSON de la cuenta de servicio.
+        cache_path(str | None): Archivo donde se guarda el documento de discovery.
+        margen_renovacion(float): Segundos de anticipación para renovar el token.
+        timeout(float): Timeout de las conexiones HTTP, en segundos.
+
+    Methods:
+        servicio(): Servicio de la API para el hilo actual.
+        renovar_credenciales(): Renueva el token si está por vencer.
+    """
+
+    SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+    URL_DISCOVERY = "https://sheets.googleapis.com/$discovery/rest?version=v4"
+
+    def __init__(self, credentials_file: str, cache_path: Optional[str] = None,
+                 margen_renovacion: float = 300, timeout: float = 60):
+        self.credentials_file = credentials_file
+        self.cache_path = cache_path
+        self.margen_renovacion = timedelta(seconds=margen_renovacion)
+        self.timeout = timeout
+        self._documento = None
+        self._credenciales = None
+        self._http_renovacion = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._lock_token = threading.Lock()
+
+    @property
+    def documento(self) -> Dict[str, Any]:
+        if self._documento is None:
+            with self._lock:
+                if self._documento is None:
+                    self._documento = self._cargar_documento()
+        return self._documento
+
+    @property
+    def credenciales(self):
+        if self._credenciales is None:
+            with self._lock:
+                if self._credenciales is None:
+                    # Se importa acá: cargar oauth2client lleva tiempo y la mayoría
+                    # de los procesos (CLI, migraciones, workers) no lo usan
+                    from oauth2client.service_account import ServiceAccountCredentials
+                    self._credenciales = ServiceAccountCredentials.from_json_keyfile_name(
+                        self.credentials_file, self.SCOPES)
+        return self._credenciales
+
+    def servicio(self):
+        servicio = getattr(self._local, "servicio", None)
+        if servicio is None:
+            import httplib2
+            from googleapiclient.discovery import build_from_document
+
+            http = self.credenciales.authorize(httplib2.Http(timeout=self.timeout))
+            servicio = build_from_document(self.documento, http=http)
+            self._local.servicio = servicio
+        return servicio
+
+    def renovar_credenciales(self) -> None:
+        if not self._por_vencer():
+            return
+        with self._lock_token:
+            if not self._por_vencer():
+                return
+            import httplib2
+            if self._http_renovacion is None:
+                self._http_renovacion = httplib2.Http(timeout=self.timeout)
+            self.credenciales.refresh(self._http_renovacion)
+
+    def _por_vencer(self) -> bool:
+        creds = self.credenciales
+        if creds.access_token is None or creds.token_expiry is None:
+            return True
+        # oauth2client guarda token_expiry en UTC sin zona horaria
+        ahora = datetime.now(timezone.utc).replace(tzinfo=None)
+        return creds.token_expiry - ahora < self.margen_renovacion
+
+    def _cargar_documento(self) -> Dict[str, Any]:
+        if self.cache_path and os.path.exists(self.cache_path):
+            try:
+                with open(self.cache_path, encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                logger.warning("Documento de discovery inválido en %s; se vuelve a obtener",
+                               self.cache_path)
+
+        from googleapiclient import discovery_cache
+        texto = discovery_cache.get_static_doc("sheets", "v4")
+        if texto is None:
+            import httplib2
+            respuesta, contenido = httplib2.Http(timeout=self.timeout).request(self.URL_DISCOVERY)
+            if respuesta.status != 200:
+                raise RuntimeError(
+                    f"No se pudo obtener el documento de discovery de Sheets (HTTP {respuesta.status})")
+            texto = contenido.decode("utf-8")
+        documento = json.loads(texto)
+
+        if self.cache_path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+                temporal = f"{self.cache_path}.tmp"
+                with open(temporal, "w", encoding="utf-8") as f:
+                    f.write(texto)
+                os.replace(temporal, self.cache_path)
+            except OSError:
+                logger.warning("No se pudo guardar el documento de discovery en %s", self.cache_path)
+        return documento
+
+
+_fabricas: Dict[str, FabricaServicioSheets] = {}
+_fabricas_lock = threading.Lock()
+
+
+def fabrica_compartida(credentials_file: str, **opciones) -> FabricaServicioSheets:
+    """
+    Fábrica única por archivo de credenciales, compartida por todos los clientes del
+    proceso. Las opciones solo se usan la primera vez que se pide esa fábrica.
+    """
+    with _fabricas_lock:
+        fabrica = _fabricas.get(credentials_file)
+        if fabrica is None:
+            fabrica = _fabricas[credentials_file] = FabricaServicioSheets(credentials_file, **opciones)
+        return fabrica
+
+
+# 3. Implementación concreta
 
 class GoogleSheetsClient(ISheetsClient):
 
-    def __init__(self, credentials_file, spreadsheet_id):
+    def __init__(self, credentials_file, spreadsheet_id,
+                 politica: Optional[PoliticaReintentos] = None,
+                 fabrica: Optional[FabricaServicioSheets] = None):
         self.credentials_file = credentials_file
         self.spreadsheet_id = spreadsheet_id
-        self._service = None
+        # Por defecto todos los clientes del proceso comparten límite de tasa y circuito
+        self.politica = politica or politica_compartida()
+        # ...y el documento de discovery, las conexiones y el token de acceso
+        self.fabrica = fabrica or fabrica_compartida(credentials_file)
 
 
     @property
     def service(self):
-        """Propiedad que gestiona la conexión a la API (Lazy initialization)"""
-        if self._service is None:
-            scope = ["https://www.googleapis.com/auth/spreadsheets"]
-            creds = ServiceAccountCredentials.from_json_keyfile_name(
-                self.credentials_file, scope)
-            self._service = build("sheets", "v4", credentials=creds)
-        return self._service
+        """Servicio de la API del hilo actual, obtenido de la fábrica compartida"""
+        return self.fabrica.servicio()
     
+    def _execute(self, request, idempotente: bool = True):
+        """
+        Ejecuta un pedido a la API a través de la política de reintentos (límite de
+        tasa, backoff ante 429/5xx y circuit breaker), midiendo su duración total
+        para la instrumentación. Antes de cada intento se renueva el token si está
+        por vencer. Los pedidos no idempotentes solo se reintentan tras un 429.
+        """
+        def intento():
+            self.fabrica.renovar_credenciales()
+            return request.execute()
+
+        with medir_llamada_sheets():
+            return self.politica.ejecutar(intento, idempotente=idempotente)
+
     def read_range(self, range_name: str) -> List[List[Any]]:
         """
         Lee datos de un rango especificado.
@@ -91,10 +241,10 @@ class GoogleSheetsClient(ISheetsClient):
         Returns:
             List[List[Any]]: Lista de filas con los valores leídos
         """
-        result = self.service.spreadsheets().values().get(
+        result = self._execute(self.service.spreadsheets().values().get(
             spreadsheetId=self.spreadsheet_id,
             range=range_name
-        ).execute()
+        ))
         return result.get("values", [])
     
     def write_range(self, range_name: str, values: List[List[Any]]) -> Dict:
@@ -109,17 +259,18 @@ class GoogleSheetsClient(ISheetsClient):
             Dict: Respuesta de la API
         """
         body = {"values": values}
-        result = self.service.spreadsheets().values().update(
+        result = self._execute(self.service.spreadsheets().values().update(
             spreadsheetId=self.spreadsheet_id,
             range=range_name,
             valueInputOption="RAW",
             body=body
-        ).execute()
+        ))
         return result
     
     def append_rows(self, range_name: str, values: List[List[Any]]) -> Dict:
         """
-        Añade filas al final de un rango especificado.
+        Añade filas al final de un rango especificado. No es idempotente: solo se
+        reintenta si la API lo rechazó por cuota (429).
         
         Parameters:
             range_name (str): Rango en formato 'Hoja1!A1:B2'
@@ -129,13 +280,33 @@ class GoogleSheetsClient(ISheetsClient):
             Dict: Respuesta de la API
         """
         body = {"values": values}
-        result = self.service.spreadsheets().values().append(
+        result = self._execute(self.service.spreadsheets().values().append(
             spreadsheetId=self.spreadsheet_id,
             range=range_name,
             valueInputOption="RAW",
             insertDataOption="INSERT_ROWS",
             body=body
-        ).execute()
+        ), idempotente=False)
+        return result
+
+    def batch_update(self, updates: Sequence[Tuple[str, List[List[Any]]]]) -> Dict:
+        """
+        Escribe varios rangos en un solo pedido con values().batchUpdate.
+
+        Parameters:
+            updates (Sequence[Tuple[str, List[List[Any]]]]): Pares (rango, filas) a escribir
+
+        Returns:
+            Dict: Respuesta de la API
+        """
+        body = {
+            "valueInputOption": "RAW",
+            "data": [{"range": range_name, "values": values} for range_name, values in updates],
+        }
+        result = self._execute(self.service.spreadsheets().values().batchUpdate(
+            spreadsheetId=self.spreadsheet_id,
+            body=body
+        ))
         return result
 
     def clear_range(self, range_name: str) -> Dict:
@@ -148,8 +319,87 @@ class GoogleSheetsClient(ISheetsClient):
         Returns:
             Dict: Respuesta de la API
         """
-        result = self.service.spreadsheets().values().clear(
+        result = self._execute(self.service.spreadsheets().values().clear(
             spreadsheetId=self.spreadsheet_id,
             range=range_name
-        ).execute()
+        ))
         return result
+
+    def read_range_chunked(self, range_name: str, chunk_rows: int = 1000,
+                           windows_per_request: int = 1) -> Iterator[List[List[Any]]]:
+        """
+        Lee un rango en ventanas de `chunk_rows` filas usando values().batchGet.
+
+        Cada pedido a la API trae `windows_per_request` ventanas a la vez, que la API
+        resuelve en paralelo, y las ventanas se entregan en orden a medida que llegan.
+        La lectura termina al alcanzar la última fila del rango. La primera ventana
+        vacía hace pedir la cantidad de filas de la grilla y se siguen leyendo ventanas
+        hasta esa fila (o el final del rango, si es anterior), porque puede haber datos
+        después de muchas filas vacías. Si el iterador se agota, se leyó la hoja
+        completa. La API omite las filas vacías del final de cada ventana (y las
+        ventanas vacías enteras); se reponen antes de entregar la siguiente fila con
+        datos, así cada fila conserva su posición en la hoja.
+
+        Parameters:
+            range_name (str): Rango en formato 'Hoja1!A1:BZ' (puede ser abierto hacia abajo)
+            chunk_rows (int): Cantidad de filas por ventana
+            windows_per_request (int): Ventanas pedidas en cada llamada a batchGet
+
+        Returns:
+            Iterator[List[List[Any]]]: Filas de cada ventana
+        """
+        rango = RangoA1.parse(range_name)
+        inicio = rango.fila_inicio
+        fila_fin = rango.fila_fin
+        # Filas vacías desde la última fila con datos, que la API no devuelve
+        blancas = 0
+        grilla_consultada = False
+        while fila_fin is None or inicio <= fila_fin:
+            ventanas = []
+            for _ in range(windows_per_request):
+                fin = inicio + chunk_rows - 1
+                if fila_fin is not None:
+                    fin = min(fin, fila_fin)
+                ventanas.append((inicio, fin))
+                inicio = fin + 1
+                if fila_fin is not None and inicio > fila_fin:
+                    break
+
+            result = self._execute(self.service.spreadsheets().values().batchGet(
+                spreadsheetId=self.spreadsheet_id,
+                ranges=[rango.con_filas(desde, hasta) for desde, hasta in ventanas]
+            ))
+
+            value_ranges = result.get("valueRanges", [])
+            for (desde, hasta), value_range in zip(ventanas, value_ranges):
+                rows = value_range.get("values", [])
+                if not rows:
+                    # Ventana vacía: se sigue por ventanas hasta la última fila de la
+                    # grilla, sin leer de una vez todo el resto del rango
+                    if not grilla_consultada:
+                        filas_grilla = self._filas_grilla(range_name)
+                        fila_fin = filas_grilla if fila_fin is None else min(fila_fin, filas_grilla)
+                        grilla_consultada = True
+                    blancas += hasta - desde + 1
+                    continue
+                yield filas_vacias(blancas) + rows
+                blancas = hasta - desde + 1 - len(rows)
+            if len(value_ranges) < len(ventanas):
+                return
+
+    def _filas_grilla(self, range_name: str) -> int:
+        """
+        Cantidad de filas de la grilla de la hoja del rango, vacías incluidas.
+
+        Parameters:
+            range_name (str): Rango en formato 'Hoja1!A1:B2'
+
+        Returns:
+            int: Filas de la grilla (gridProperties.rowCount)
+        """
+        result = self._execute(self.service.spreadsheets().get(
+            spreadsheetId=self.spreadsheet_id,
+            ranges=[range_name],
+            fields="sheets.properties.gridProperties.rowCount"
+        ))
+        return result["sheets"][0]["properties"]["gridProperties"]["rowCount"]
@@ -1,5 +1,46 @@
 from .repository import GoogleSheetsRepository
 from .transformer import DataTransformer
+from .rangos import RangoA1
+
+
+class FilasHoja(list):
+    """
+    Lista de afiliados normalizados, uno por fila de la hoja a partir de
+    `primera_fila` (número de fila de la hoja del primer afiliado). Los datos no
+    llevan el número de fila: así la respuesta de /sync no cambia y el loader
+    igual puede ubicar los rechazos en la hoja.
+    """
+
+    def __init__(self, filas=(), primera_fila=1):
+        super().__init__(filas)
+        self.primera_fila = primera_fila
+
+
+class LecturaHoja:
+    """
+    Iterador de las filas normalizadas de una lectura en streaming.
+
+    `completa` pasa a True recién cuando el lector de la hoja se agota, es decir,
+    cuando confirmó que no quedan datos en el rango; si la lectura se corta por
+    un error o no se consume entera, queda en False. `primera_fila` es, como en
+    FilasHoja, la fila de la hoja del primer afiliado.
+    """
+
+    def __init__(self, filas, primera_fila=1):
+        self._filas = iter(filas)
+        self.primera_fila = primera_fila
+        self.completa = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._filas)
+        except StopIteration:
+            self.completa = True
+            raise
+
 
 # 5. Coordinador (antes FactoryGoogleSheetsService)
 class SheetsService:
@@ -12,7 +53,68 @@ class SheetsService:
 
     def get_normalized_data(self, range_name):
         raw = self.repo.get_raw_data(range_name)
-        normalized_rows = self.transformer.normalize_empty(raw_data=raw, num_columns=len(raw[0]))
-        # Convertir las filas normalizadas a diccionarios usando los encabezados
-        dicts = self.transformer.to_dicts(raw_data=normalized_rows[1:], headers=raw[0])
-        return self.transformer.normalize_input(dicts=dicts)
+        return self._normalize(headers=raw[0], rows=raw[1:],
+                               primera_fila=RangoA1.parse(range_name).fila_inicio + 1)
+
+    def iter_normalized_data(self, range_name, chunk_rows=1000):
+        """
+        Versión en streaming de get_normalized_data.
+
+        Devuelve un generador que normaliza y entrega un afiliado por vez, de modo que quien consume
+        (la carga a la base, una respuesta JSON) puede empezar antes de que se
+        procese toda la hoja y sin listas intermedias del tamaño de la hoja.
+
+        La hoja se lee por ventanas de `chunk_rows` filas, así que tampoco se
+        mantiene en memoria la respuesta cruda completa.
+
+        Parameters:
+            range_name(str): Rango en formato 'Hoja1!A1:B2'
+            chunk_rows(int): Filas leídas de la API por ventana
+
+        Returns:
+            LecturaHoja: Afiliados normalizados, uno por fila; `completa` indica si se
+                llegó al final de la hoja
+        """
+        rows = self.repo.iter_raw_data(range_name, chunk_rows=chunk_rows)
+        headers = next(rows, None)
+        if headers is None:
+            return LecturaHoja(())
+        return LecturaHoja(self.transformer.iter_normalize_rows(raw_data=rows, headers=headers),
+                           primera_fila=RangoA1.parse(range_name).fila_inicio + 1)
+
+    def get_incremental_data(self, range_name, ultima_fila=0):
+        """
+        Obtiene y normaliza solo las filas agregadas después de `ultima_fila`.
+
+        Se leen los encabezados (primera fila del rango) y luego únicamente el
+        tramo de filas nuevas, de modo que el costo depende de lo agregado y no
+        del tamaño total de la hoja.
+
+        Parameters:
+            range_name(str): Rango completo en formato 'Hoja1!A1:BZ'
+            ultima_fila(int): Última fila de la hoja (1-based) ya procesada; 0 si nunca se sincronizó
+
+        Returns:
+            tuple(FilasHoja, int): Filas nuevas normalizadas y la nueva última fila procesada
+        """
+        rango = RangoA1.parse(range_name)
+        fila_encabezados = rango.fila_inicio
+        desde = max(ultima_fila, fila_encabezados) + 1
+        if rango.fila_fin is not None and desde > rango.fila_fin:
+            return FilasHoja(), ultima_fila
+
+        headers = self.repo.get_raw_data(rango.con_filas(fila_encabezados, fila_encabezados))
+        if not headers:
+            return FilasHoja(), ultima_fila
+
+        rows = self.repo.get_raw_data(rango.con_filas(desde, rango.fila_fin))
+        if not rows:
+            return FilasHoja(), ultima_fila
+
+        return self._normalize(headers=headers[0], rows=rows, primera_fila=desde), desde + len(rows) - 1
+
+    def _normalize(self, headers, rows, primera_fila):
+        # El transformador devuelve un afiliado por fila, en orden: la fila de cada
+        # uno es primera_fila más su posición
+        return FilasHoja(self.transformer.normalize_rows(raw_data=rows, headers=headers),
+                         primera_fila=primera_fila)
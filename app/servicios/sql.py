@@ -0,0 +1,28 @@
+from sqlalchemy.dialects import postgresql, sqlite
+
+# Utilidades de SQL que dependen del motor de base de datos
+
+# insert() de cada motor con soporte para ON CONFLICT
+_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def insert_con_conflictos(session, model):
+    """
+    INSERT sobre la tabla de `model` (Core) del dialecto de la sesión, con
+    on_conflict_do_update / on_conflict_do_nothing.
+
+    Se inserta sobre la tabla y no con el ORM para que un lote viaje como un único
+    executemany y no pase por la persistencia fila a fila.
+
+    Raises:
+        NotImplementedError: Si el motor no es SQLite ni PostgreSQL.
+    """
+    dialecto = session.get_bind().dialect.name
+    try:
+        return _INSERTS[dialecto](model.__table__)
+    except KeyError:
+        raise NotImplementedError(
+            f"INSERT ... ON CONFLICT no está soportado para el motor '{dialecto}'") from None
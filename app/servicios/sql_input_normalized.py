@@ -1,3 +1,49 @@
+from typing import Any, Dict, List, Tuple
+
+# Mapeo de claves del afiliado
+# Asegúrate de que las claves coincidan con las de tu hoja de cálculo.
+MAPPING_AFILIADO = {
+    "Marca temporal": "marca_temporal_creacion",
+    "Apellido/s:": "apellido",
+    "Nombre/s:": "nombre",
+    "Fecha de Nacimiento:": "fecha_nacimiento",
+    "D.N.I:": "dni",
+    "Tel Contacto:": "telefono",
+    "Email:": "email",
+    "Nacionalidad:": "nacionalidad",
+    "Género:": "genero",
+    "Estado Civil:": "estado_civil",
+    "Domicilio (Calle y n°):": "direccion",
+    "Localidad:": "localidad",
+    "Provincia:": "provincia",
+    "Codigo Postal:": "codigo_postal",
+    "Estudios:": "nivel_educativo",
+    "Titulo / Carrera:": "titulo_obtenido",
+    "N° De Legajo:": "numero_legajo",
+    "Comuna del sendero donde trabaja:": "comuna_donde_trabaja",
+    "Inicio Actividad en Prevención:": "fecha_ingreso",
+    "Relación de Dependencia:": "relacion_dependencia",
+}
+
+# Mapeo de claves del cónyuge
+MAPPING_CONYUGE = {
+    "Nombre y Apellido ( Conyuge ) :": "nombre_apellido",
+    "Fecha  de Nacimiento ( Conyuge ) :": "fecha_nacimiento",
+    "D.n.i ( Conyuge ) :": "dni",
+}
+
+# Encabezados de cada hijo (1 al 7), en el orden nombre_apellido, fecha_nacimiento, dni
+MAX_HIJOS = 7
+MAPPING_HIJOS = [
+    {
+        f"Apellido/s y Nombre/s  hijo/a {i}": "nombre_apellido",
+        f"Fecha nacimiento hijo/a {i}": "fecha_nacimiento",
+        f"D.n.i hijo/a {i}": "dni",
+    }
+    for i in range(1, MAX_HIJOS + 1)
+]
+
+
 class SQLInputNormalized:
     """
     Clase para normalizar los datos de entrada de modelos de SQL.
@@ -54,59 +100,85 @@ class SQLInputNormalized:
         Mapea las claves del afiliado a un formato normalizado.
         Asegúrate de que las claves coincidan con las de tu hoja de cálculo.
         """
-        # Mapeo de claves del afiliado
-        mapping = {
-            "Marca temporal": "marca_temporal_creacion",
-            "Apellido/s:": "apellido",
-            "Nombre/s:": "nombre",
-            "Fecha de Nacimiento:": "fecha_nacimiento",
-            "D.N.I:": "dni",
-            "Tel Contacto:": "telefono",
-            "Email:": "email",
-            "Nacionalidad:": "nacionalidad",
-            "Género:": "genero",
-            "Estado Civil:": "estado_civil",
-            "Domicilio (Calle y n°):": "direccion",
-            "Localidad:": "localidad",
-            "Provincia:": "provincia",
-            "Codigo Postal:": "codigo_postal",
-            "Estudios:": "nivel_educativo",
-            "Titulo / Carrera:": "titulo_obtenido",
-            "N° De Legajo:": "numero_legajo",
-            "Comuna del sendero donde trabaja:": "comuna_donde_trabaja",
-            "Inicio Actividad en Prevención:": "fecha_ingreso",
-            "Relación de Dependencia:": "relacion_dependencia",
-            }
-        self.add_new_key(mapping, "afiliado")
+        self.add_new_key(MAPPING_AFILIADO, "afiliado")
 
     def normalize_conyuge(self):
         """ Normaliza los datos del cónyuge.
         Mapea las claves del cónyuge a un formato normalizado.
         Asegúrate de que las claves coincidan con las de tu hoja de cálculo.
         """
-        # Mapeo de claves del cónyuge
-        # Asegúrate de que las claves coincidan con las de tu hoja de cálculo
-        mapping = {
-            "Nombre y Apellido ( Conyuge ) :": "nombre_apellido",
-            "Fecha  de Nacimiento ( Conyuge ) :": "fecha_nacimiento",
-            "D.n.i ( Conyuge ) :": "dni",
-        }
-        self.add_new_key(mapping, "conyuge")
+        self.add_new_key(MAPPING_CONYUGE, "conyuge")
 
     def normalize_hijos(self):
-        for i in range(1, 8):  # Hijo 1 al 7
+        for mapping in MAPPING_HIJOS:  # Hijo 1 al 7
             hijo = {
-                "nombre_apellido": self.ram_data.get(
-                    f"Apellido/s y Nombre/s  hijo/a {i}", "no_dato"
-                ),
-                "fecha_nacimiento": self.ram_data.get(
-                    f"Fecha nacimiento hijo/a {i}", "no_dato"
-                ),
-                "dni": self.ram_data.get(f"D.n.i hijo/a {i}", "no_dato"),
+                new_key: self.ram_data.get(key, "no_dato")
+                for key, new_key in mapping.items()
             }
             # Solo agregamos si al menos un dato no es 'no_dato'
             if any(v != "no_dato" for v in hijo.values()):
                 self.afiliado["hijos"].append(hijo)
 
-            
 
+class MappingPlan:
+    """
+    Plan de mapeo compilado a partir de la fila de encabezados.
+
+    Resuelve una sola vez cada campo destino (afiliado, cónyuge, hijos 1..7) a un
+    índice de columna y luego normaliza filas crudas (listas) directamente a la
+    misma estructura que SQLInputNormalized, sin pasar por un dict intermedio por
+    fila. El costo por fila depende solo de los campos mapeados.
+
+    Parameters:
+        headers(List[str]): Fila de encabezados de la hoja.
+
+    Methods:
+        normalize_row(row): Normaliza una fila cruda.
+    """
+
+    def __init__(self, headers: List[str]):
+        # Si un encabezado se repite gana la última columna, igual que dict(zip(headers, row))
+        indices = {header: i for i, header in enumerate(headers)}
+        # Los campos cuyo encabezado no existe apuntan a una columna extra siempre vacía
+        self.ancho = len(headers) + 1
+        vacia = len(headers)
+        self.afiliado = self._compilar(MAPPING_AFILIADO, indices)
+        self.conyuge = self._compilar(MAPPING_CONYUGE, indices)
+        self.hijos = [
+            tuple(indices.get(key, vacia) for key in mapping) for mapping in MAPPING_HIJOS
+        ]
+        self.hijo_keys = tuple(MAPPING_HIJOS[0].values())
+
+    @staticmethod
+    def _compilar(mapping: Dict[str, str], indices: Dict[str, int]) -> List[Tuple[int, str]]:
+        return [(indices[key], new_key) for key, new_key in mapping.items() if key in indices]
+
+    def normalize_row(self, row: List[Any]) -> Dict[str, Any]:
+        """
+        Parameters:
+            row(List[Any]): Fila cruda tal como la devuelve la API (puede venir recortada).
+
+        Returns:
+            Dict[str, Any]: {"afiliado": {}, "conyuge": {}, "hijos": []}
+        """
+        # Completar la fila una sola vez; las celdas vacías y 'no_dato' se tratan igual
+        row = [("no_dato" if cell == "" else cell) for cell in row[:self.ancho - 1]]
+        row.extend(["no_dato"] * (self.ancho - len(row)))
+
+        afiliado = {
+            new_key: valor for i, new_key in self.afiliado
+            if (valor := row[i]) != "no_dato"
+        }
+        conyuge = {
+            new_key: valor for i, new_key in self.conyuge
+            if (valor := row[i]) != "no_dato"
+        }
+
+        hijos = []
+        for nombre, fecha, dni in self.hijos:
+            valores = (row[nombre], row[fecha], row[dni])
+            # Solo agregamos si al menos un dato no es 'no_dato'
+            if valores != ("no_dato", "no_dato", "no_dato"):
+                hijos.append(dict(zip(self.hijo_keys, valores)))
+
+        return {"afiliado": afiliado, "conyuge": conyuge, "hijos": hijos}
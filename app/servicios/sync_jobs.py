@@ -0,0 +1,201 @@
+import logging
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import or_, update
+
+from .. import db
+from ..models.modelo_sync_job import SyncJob
+from .loader import AfiliadoBulkLoader
+
+# 10. Sincronización en segundo plano
+
+logger = logging.getLogger(__name__)
+
+# Trabajo a ejecutar: recibe el loader (ya conectado al progreso) y devuelve su resumen
+Trabajo = Callable[[AfiliadoBulkLoader], Dict[str, int]]
+
+
+class SyncJobRunner:
+    """
+    Ejecuta sincronizaciones de afiliados en un pool de hilos del propio proceso,
+    sin broker externo, y registra su estado y progreso en SYNC_JOBS.
+
+    Cada trabajo corre dentro de un app_context propio, con su propia sesión.
+    El progreso (filas leídas, afiliados, cónyuges, hijos, omitidos y el informe
+    de rechazos) se guarda al terminar cada lote del loader, así el endpoint de
+    estado lo ve avanzar.
+
+    Los trabajos solo viven en el pool del proceso que los encoló. Cada trabajo
+    guarda su propietario ("host:pid") y un latido que un hilo del proceso renueva
+    cada SYNC_JOB_LATIDO segundos mientras el trabajo está pendiente o en curso.
+    Si el latido tiene más de SYNC_JOB_VENCIMIENTO segundos, el proceso se detuvo
+    y el trabajo ya no va a terminar: se marca como fallido al encolar la próxima
+    sincronización. Así varios procesos (workers de gunicorn) pueden compartir la
+    base sin marcar como fallidos los trabajos que siguen corriendo en otro.
+
+    Configuración (Config):
+        SYNC_JOB_WORKERS: hilos del pool; con 1 los trabajos corren de a uno, en orden.
+        SYNC_JOB_BATCH_SIZE: afiliados por lote (y por actualización del progreso).
+        SYNC_JOB_LATIDO: segundos entre latidos de los trabajos activos del proceso.
+        SYNC_JOB_VENCIMIENTO: segundos sin latido tras los que un trabajo se da por
+            interrumpido; tiene que ser varias veces SYNC_JOB_LATIDO.
+
+    Methods:
+        init_app(app): Guarda la app y lee la configuración.
+        marcar_interrumpidos(): Marca como fallidos los trabajos con el latido vencido.
+        encolar(modo, range_name, trabajo): Registra el trabajo y lo envía al pool.
+        shutdown(wait): Detiene el pool y los latidos.
+    """
+
+    def __init__(self, workers: int = 1, batch_size: int = 500,
+                 latido: float = 30, vencimiento: float = 300):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.latido = latido
+        self.vencimiento = vencimiento
+        self.app = None
+        self._pool = None
+        self._latidos: Optional[threading.Thread] = None
+        self._detener = threading.Event()
+
+    def init_app(self, app) -> None:
+        self.shutdown(wait=False)
+        self.app = app
+        self.workers = app.config.get("SYNC_JOB_WORKERS", self.workers)
+        self.batch_size = app.config.get("SYNC_JOB_BATCH_SIZE", self.batch_size)
+        self.latido = app.config.get("SYNC_JOB_LATIDO", self.latido)
+        self.vencimiento = app.config.get("SYNC_JOB_VENCIMIENTO", self.vencimiento)
+
+    @property
+    def propietario(self) -> str:
+        # Se calcula cada vez: gunicorn con preload crea la app antes de hacer fork
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def marcar_interrumpidos(self) -> int:
+        """
+        Marca como fallidos los trabajos pendientes o en curso cuyo latido venció,
+        de cualquier proceso. No confirma la transacción.
+
+        Returns:
+            int: Cantidad de trabajos marcados
+        """
+        ahora = datetime.now()
+        resultado = db.session.execute(
+            update(SyncJob)
+            .where(SyncJob.estado.in_([SyncJob.PENDIENTE, SyncJob.EN_CURSO]),
+                   or_(SyncJob.latido.is_(None),
+                       SyncJob.latido < ahora - timedelta(seconds=self.vencimiento)))
+            .values(estado=SyncJob.ERROR, marca_temporal_fin=ahora,
+                    error="Interrumpido: el proceso que lo ejecutaba se detuvo")
+        )
+        if resultado.rowcount:
+            logger.warning("Sincronizaciones interrumpidas marcadas como fallidas: %s",
+                           resultado.rowcount)
+        return resultado.rowcount
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        # Se crea en el primer trabajo: los procesos que nunca sincronizan no levantan hilos
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers,
+                                            thread_name_prefix="sync-job")
+        return self._pool
+
+    def encolar(self, modo: str, range_name: str, trabajo: Trabajo) -> SyncJob:
+        """
+        Parameters:
+            modo(str): "completo" o "incremental", solo informativo.
+            range_name(str): Rango que se sincroniza.
+            trabajo(Callable): Función que hace la carga usando el loader recibido.
+
+        Returns:
+            SyncJob: El trabajo recién registrado, en estado pendiente
+        """
+        self.marcar_interrumpidos()
+        job = SyncJob(modo=modo, range_name=range_name, estado=SyncJob.PENDIENTE,
+                      propietario=self.propietario, latido=datetime.now())
+        db.session.add(job)
+        db.session.commit()
+        self._iniciar_latidos()
+        self.pool.submit(self._ejecutar, job.id, trabajo)
+        return job
+
+    def renovar_latidos(self) -> int:
+        """Renueva el latido de los trabajos activos de este proceso y confirma."""
+        resultado = db.session.execute(
+            update(SyncJob)
+            .where(SyncJob.propietario == self.propietario,
+                   SyncJob.estado.in_([SyncJob.PENDIENTE, SyncJob.EN_CURSO]))
+            .values(latido=datetime.now())
+        )
+        db.session.commit()
+        return resultado.rowcount
+
+    def _iniciar_latidos(self) -> None:
+        if self._latidos is not None and self._latidos.is_alive():
+            return
+        self._detener.clear()
+        self._latidos = threading.Thread(target=self._latir, name="sync-job-latidos",
+                                         daemon=True)
+        self._latidos.start()
+
+    def _latir(self) -> None:
+        while not self._detener.wait(self.latido):
+            try:
+                with self.app.app_context():
+                    self.renovar_latidos()
+            except Exception:
+                logger.exception("Error renovando el latido de las sincronizaciones")
+
+    def _ejecutar(self, job_id: int, trabajo: Trabajo) -> None:
+        with self.app.app_context():
+            job = db.session.get(SyncJob, job_id)
+            job.estado = SyncJob.EN_CURSO
+            job.marca_temporal_inicio = job.latido = datetime.now()
+            db.session.commit()
+
+            def progreso(leidas: int, resumen: Dict[str, int]) -> None:
+                self._registrar(job, leidas, resumen, loader)
+                job.latido = datetime.now()
+                db.session.commit()
+
+            loader = AfiliadoBulkLoader(batch_size=self.batch_size, progreso=progreso)
+            try:
+                resumen = trabajo(loader)
+            except Exception as error:
+                logger.exception("Falló la sincronización %s", job_id)
+                db.session.rollback()
+                job.estado = SyncJob.ERROR
+                job.rechazos = loader.rechazos.a_dict()
+                job.error = f"{type(error).__name__}: {error}"
+            else:
+                self._registrar(job, job.filas_leidas, resumen, loader)
+                job.estado = SyncJob.COMPLETADO
+            job.marca_temporal_fin = datetime.now()
+            db.session.commit()
+
+    @staticmethod
+    def _registrar(job: SyncJob, leidas: int, resumen: Dict[str, int],
+                   loader: AfiliadoBulkLoader) -> None:
+        job.filas_leidas = leidas
+        job.rechazos = loader.rechazos.a_dict()
+        job.afiliados = resumen["afiliados"]
+        job.conyuges = resumen["conyuges"]
+        job.hijos = resumen["hijos"]
+        job.omitidos = resumen["omitidos"]
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+        if self._latidos is not None:
+            self._detener.set()
+            self._latidos = None
+
+
+sync_jobs = SyncJobRunner()
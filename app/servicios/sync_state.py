@@ -0,0 +1,77 @@
+from typing import Any, Dict, List
+
+from sqlalchemy import func, update
+
+from .. import db
+from ..models.modelo_sync_estado import SyncEstado
+from .parser import parse_marca_temporal
+
+# 7. Estado de la sincronización incremental
+
+
+class SincronizacionConcurrente(RuntimeError):
+    """Otra sincronización movió la marca de agua mientras se cargaban las filas."""
+
+
+class SyncStateRepository:
+    """
+    Persiste la "marca de agua" de la sincronización incremental: la última fila
+    de la hoja procesada y su "Marca temporal".
+
+    Methods:
+        get(range_name): Devuelve el estado del rango, creándolo si no existe.
+        avanzar(range_name, desde, ultima_fila, data): Registra el avance luego de
+            procesar filas nuevas, si nadie lo movió desde `desde`.
+        reset(range_name): Vuelve a sincronizar el rango desde el principio.
+    """
+
+    def __init__(self, session=None):
+        self.session = session or db.session
+
+    def get(self, range_name: str) -> SyncEstado:
+        estado = self.session.query(SyncEstado).filter_by(range_name=range_name).first()
+        if estado is None:
+            estado = SyncEstado(range_name=range_name, ultima_fila=0)
+            self.session.add(estado)
+            self.session.flush()
+        return estado
+
+    def avanzar(self, range_name: str, desde: int, ultima_fila: int,
+                data: List[Dict[str, Any]]) -> None:
+        """
+        Guarda la nueva última fila procesada y la marca temporal de la última fila con dato.
+
+        La actualización es una comparación e intercambio: solo se aplica si la marca
+        de agua sigue en `desde`, la fila desde la que se leyó. Si otra sincronización
+        la movió mientras tanto, no se pisa su avance.
+
+        Parameters:
+            range_name(str): Rango sincronizado.
+            desde(int): Última fila guardada al comenzar esta sincronización.
+            ultima_fila(int): Última fila de la hoja (1-based) procesada.
+            data(List[Dict]): Filas normalizadas procesadas en esta sincronización.
+
+        Raises:
+            SincronizacionConcurrente: Si la marca de agua ya no está en `desde`.
+        """
+        valores = {"ultima_fila": ultima_fila,
+                   "marca_temporal_actualizacion": func.current_timestamp()}
+        for row in reversed(data):
+            marca = parse_marca_temporal(row["afiliado"].get("marca_temporal_creacion"))
+            if marca is not None:
+                valores["ultima_marca_temporal"] = marca
+                break
+        resultado = self.session.execute(
+            update(SyncEstado)
+            .where(SyncEstado.range_name == range_name, SyncEstado.ultima_fila == desde)
+            .values(**valores)
+        )
+        if resultado.rowcount != 1:
+            raise SincronizacionConcurrente(
+                f"La marca de agua de {range_name} cambió durante la sincronización "
+                f"(se leyó desde la fila {desde})")
+
+    def reset(self, range_name: str) -> None:
+        estado = self.get(range_name)
+        estado.ultima_fila = 0
+        estado.ultima_marca_temporal = None
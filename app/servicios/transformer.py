@@ -1,5 +1,5 @@
-from typing import List, Dict, Any
-from .sql_input_normalized import SQLInputNormalized
+from typing import List, Dict, Any, Iterable, Iterator
+from .sql_input_normalized import SQLInputNormalized, MappingPlan
 
 # DataTransformer
 
@@ -10,6 +10,11 @@ class DataTransformer:
     Methods:
         normalize_empty(raw_data, default): Normaliza los datos reemplazando celdas vacías
         to_dicts(raw_data, headers): Convierte una lista de listas en una lista de diccionarios
+        normalize_input(dicts): Normaliza cada diccionario con SQLInputNormalized
+
+        iter_normalize_empty, iter_dicts, iter_normalize_input: Versiones generadoras de los
+        métodos anteriores; procesan una fila a la vez sin construir listas intermedias.
+        normalize_rows(raw_data, headers): Normaliza filas crudas con un MappingPlan compilado
     """
 
     @staticmethod
@@ -25,18 +30,19 @@ class DataTransformer:
             List[Dict[str, Any]] - Datos normalizados en formato de lista de diccionarios
     
         """
-        normalized_rows = []
+        return list(DataTransformer.iter_normalize_empty(raw_data, num_columns))
+
+    @staticmethod
+    def iter_normalize_empty(raw_data: Iterable[List[Any]], num_columns: int) -> Iterator[List[Any]]:
+        """
+        Versión generadora de normalize_empty: completa y limpia cada fila en una sola pasada.
+        """
         for row in raw_data:
-            # Agrega 'no_dato' si faltan columnas
-            extended_row = row + ["no_dato"] * (num_columns - len(row))
-            normalized_rows.append(extended_row)
-        # Reemplaza celdas vacías con 'no_dato'
-        for i in range(len(normalized_rows)):
-            normalized_rows[i] = [
-                "no_dato" if cell == "" else cell for cell in normalized_rows[i]
-            ]
-        return normalized_rows
-        
+            # Agrega 'no_dato' si faltan columnas y reemplaza celdas vacías
+            extended_row = ["no_dato" if cell == "" else cell for cell in row]
+            extended_row.extend(["no_dato"] * (num_columns - len(row)))
+            yield extended_row
+
     @staticmethod
     def to_dicts(raw_data: List[List[Any]], headers: List[str]) -> List[Dict[str, Any]]:
         """
@@ -48,7 +54,13 @@ class DataTransformer:
         Returns:
             List[Dict[str, Any]] - Datos convertidos en formato de lista de diccionarios
         """
-        return [dict(zip(headers, row)) for row in raw_data]
+        return list(DataTransformer.iter_dicts(raw_data, headers))
+
+    @staticmethod
+    def iter_dicts(raw_data: Iterable[List[Any]], headers: List[str]) -> Iterator[Dict[str, Any]]:
+        """Versión generadora de to_dicts."""
+        for row in raw_data:
+            yield dict(zip(headers, row))
     
     @staticmethod
     def normalize_input(dicts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -60,16 +72,33 @@ class DataTransformer:
         Returns:
             lista_normalizada: List[Dict[str, Any]] - Datos normalizados para SQL
         """
-        lista_normalizada = []
+        return list(DataTransformer.iter_normalize_input(dicts))
 
-        for row in range(len(dicts)):
+    @staticmethod
+    def iter_normalize_input(dicts: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Versión generadora de normalize_input."""
+        for row in dicts:
             # Crear una instancia de SQLInputNormalizer para cada fila
-            extended_row = SQLInputNormalized(ram_data=dicts[row])
-            # Normalizar la entrada
-            lista_normalizada.append(extended_row.normalize_input())
+            yield SQLInputNormalized(ram_data=row).normalize_input()
 
-        return lista_normalizada
-    
-    
-    
-   
\ No newline at end of file
+    @staticmethod
+    def normalize_rows(raw_data: Iterable[List[Any]], headers: List[str]) -> List[Dict[str, Any]]:
+        """
+        Normaliza filas crudas directamente con un MappingPlan compilado una sola vez
+        a partir de los encabezados. Equivale a normalize_empty + to_dicts + normalize_input
+        sin las listas ni los diccionarios intermedios.
+
+        Parameters:
+            raw_data: Iterable[List[Any]] - Filas de datos (sin la fila de encabezados)
+            headers: List[str] - Encabezados para las columnas
+        Returns:
+            List[Dict[str, Any]] - Datos normalizados para SQL
+        """
+        return list(DataTransformer.iter_normalize_rows(raw_data, headers))
+
+    @staticmethod
+    def iter_normalize_rows(raw_data: Iterable[List[Any]], headers: List[str]) -> Iterator[Dict[str, Any]]:
+        """Versión generadora de normalize_rows."""
+        normalize_row = MappingPlan(headers).normalize_row
+        for row in raw_data:
+            yield normalize_row(row)
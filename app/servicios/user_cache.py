@@ -0,0 +1,86 @@
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+
+from .. import db
+from ..models.modelo_login import User
+from .cache import TTLCache
+
+# Cache de usuarios para Flask-Login
+
+# Columnas de User que se guardan en la cache
+_COLUMNAS = ("id", "username", "password")
+
+# Clave de Session.info con los ids de usuario modificados en la transacción en curso
+_MODIFICADOS = "user_cache_modificados"
+
+
+class UserCache:
+    """
+    Cache por proceso de los usuarios que reconstruye Flask-Login en cada pedido.
+
+    Se guardan solo los valores de las columnas. En un acierto se arma un User
+    "detached" y se adjunta a la sesión con merge(load=False), que no ejecuta
+    SQL, así current_user sigue siendo un objeto persistente normal.
+
+    Las entradas se invalidan automáticamente cuando un User se crea, se
+    actualiza o se borra en este proceso: al hacer flush (eventos del mapper) y
+    otra vez al terminar la transacción (after_commit / after_rollback), porque
+    entre el flush y el commit otro pedido puede volver a guardar el valor
+    anterior. En otros procesos el dato puede quedar viejo como máximo
+    USER_CACHE_TTL segundos.
+
+    Methods:
+        init_app(app): Lee USER_CACHE_MAXSIZE y USER_CACHE_TTL de la configuración.
+        get_user(user_id): Devuelve el usuario, desde la cache o la base.
+        invalidate(user_id): Descarta un usuario de la cache.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def init_app(self, app) -> None:
+        self.cache = TTLCache(
+            maxsize=app.config.get("USER_CACHE_MAXSIZE", self.cache.maxsize),
+            ttl=app.config.get("USER_CACHE_TTL", self.cache.ttl),
+        )
+
+    def get_user(self, user_id: int) -> Optional[User]:
+        datos = self.cache.get(user_id)
+        if datos is None:
+            user = db.session.get(User, user_id)
+            if user is None:
+                return None
+            self.cache.set(user_id, {col: getattr(user, col) for col in _COLUMNAS})
+            return user
+
+        user = User(**datos)
+        make_transient_to_detached(user)
+        return db.session.merge(user, load=False)
+
+    def invalidate(self, user_id: int) -> None:
+        self.cache.invalidate(user_id)
+
+
+user_cache = UserCache()
+
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidar_usuario(mapper, connection, target):
+    # Alta, cambio de contraseña o de nombre, baja: la próxima lectura va a la base
+    user_cache.invalidate(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_MODIFICADOS, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _invalidar_al_terminar(session):
+    # Descarta lo que se haya guardado en la cache entre el flush y el fin de la
+    # transacción: un valor viejo (commit) o uno que nunca se confirmó (rollback)
+    for user_id in session.info.pop(_MODIFICADOS, ()):
+        user_cache.invalidate(user_id)
@@ -0,0 +1,81 @@
+"""
+Benchmark de /api/afiliados/search: latencia de búsqueda por cantidad de afiliados.
+
+Crea una base SQLite temporal con las migraciones (que arman la tabla FTS5 y sus
+triggers), la llena con una hoja sintética de FakeSheetsClient usando el loader
+y mide la latencia de búsquedas típicas (apellido parcial, nombre y apellido,
+DNI con puntos, legajo, nombre de un hijo) contra el índice FTS5 y contra un
+LIKE '%...%' sobre las tablas.
+
+Uso:
+    python -m benchmarks.bench_busqueda
+    python -m benchmarks.bench_busqueda --rows 100000 --repeat 50
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from flask_migrate import upgrade
+
+from app import create_app, db
+from app.servicios import busqueda
+from app.servicios.fake_sheets_client import FakeSheetsClient
+from app.servicios.loader import AfiliadoBulkLoader
+from app.servicios.repository import GoogleSheetsRepository
+from app.servicios.sheets_service import SheetsService
+from app.servicios.transformer import DataTransformer
+from config import Config
+
+CONSULTAS = ("gonz", "maria perez", "20.001.234", "101234", "sofia", "lopez valen")
+
+MIGRACIONES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "migrations")
+
+
+def medir(fn, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        fn()
+        tiempos.append(time.perf_counter() - inicio)
+    tiempos.sort()
+    return statistics.median(tiempos) * 1000, tiempos[int(len(tiempos) * 0.95) - 1] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(directorio, 'busqueda.db')}"
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            upgrade(directory=MIGRACIONES)
+            client = FakeSheetsClient.synthetic(rows=args.rows)
+            service = SheetsService(GoogleSheetsRepository(client), DataTransformer())
+            inicio = time.perf_counter()
+            AfiliadoBulkLoader().load(service.iter_normalized_data("Respuestas!A1:AZ"))
+            print(f"carga de {args.rows} filas (con triggers): {time.perf_counter() - inicio:.1f} s\n")
+
+            print(f"{'consulta':<16}{'resultados':>12}{'fts5 p50 ms':>14}{'p95 ms':>10}"
+                  f"{'like p50 ms':>14}")
+            for consulta in CONSULTAS:
+                terminos = busqueda.terminos_busqueda(consulta)
+                params = {"q": consulta, "limite": "20"}
+                data, _ = busqueda.buscar_afiliados(params)
+                p50, p95 = medir(lambda: busqueda.buscar_afiliados(params), args.repeat)
+                # Misma búsqueda sin índice: LIKE sobre AFILIADOS, CONYUGES e HIJOS
+                like, _ = medir(lambda: busqueda._buscar_trigramas(terminos, 21, 0),
+                                max(1, args.repeat // 10))
+                print(f"{consulta:<16}{len(data):>12}{p50:>14.2f}{p95:>10.2f}{like:>14.2f}")
+            db.session.remove()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark de escrituras en Google Sheets: pedidos a la API con y sin buffer.
+
+Simula un flujo de escritura típico (marcar N filas como importadas, una celda
+por fila, y exportar N asignaciones de kits como filas nuevas) contra
+FakeSheetsClient, escribiendo directo en el cliente o a través de
+BufferEscrituraSheets. Informa la cantidad de pedidos y el tiempo estimado con
+una latencia fija por pedido.
+
+Uso:
+    python -m benchmarks.bench_escrituras
+    python -m benchmarks.bench_escrituras --rows 1000 5000 --latency-ms 150
+"""
+import argparse
+
+from app.servicios.buffer_escritura import BufferEscrituraSheets
+from app.servicios.fake_sheets_client import FakeSheetsClient
+
+
+def escribir(client, filas):
+    for i in range(filas):
+        client.write_range(f"Respuestas!Z{i + 2}", [["importado"]])
+        client.append_rows("Kits!A1", [[i, f"kit-{i % 7}"]])
+
+
+def bench(filas, con_buffer, max_celdas):
+    fake = FakeSheetsClient()
+    if con_buffer:
+        with BufferEscrituraSheets(fake, max_celdas=max_celdas, intervalo=None) as buffer:
+            escribir(buffer, filas)
+    else:
+        escribir(fake, filas)
+    assert len(fake.read_range(f"Kits!A1:B{filas}")) == filas
+    fake.calls.pop("read_range", None)
+    return sum(fake.calls.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="*", default=[1000, 5000])
+    parser.add_argument("--latency-ms", type=float, default=150,
+                        help="Latencia supuesta de cada pedido a la API")
+    parser.add_argument("--max-celdas", type=int, default=10_000,
+                        help="Celdas pendientes que disparan un envío del buffer")
+    args = parser.parse_args()
+
+    print(f"{'filas':>8}{'modo':>10}{'pedidos':>10}{'tiempo est. s':>16}")
+    for filas in args.rows:
+        for con_buffer in (False, True):
+            pedidos = bench(filas, con_buffer, args.max_celdas)
+            modo = "buffer" if con_buffer else "directo"
+            print(f"{filas:>8}{modo:>10}{pedidos:>10}{pedidos * args.latency_ms / 1000:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
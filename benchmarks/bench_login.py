@@ -0,0 +1,57 @@
+"""
+Benchmark de verificación de contraseñas: logins por segundo por worker.
+
+Simula una ráfaga de logins concurrentes (un hilo por pedido, como un worker
+con hilos) contra PasswordHasher, para cada combinación de método de hash y
+modo de verificación (en el hilo del pedido o en un pool acotado).
+
+Uso:
+    python -m benchmarks.bench_login
+    python -m benchmarks.bench_login --methods scrypt pbkdf2:sha256:600000 --concurrency 8 --logins 200
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.servicios.passwords import PasswordHasher
+
+
+def bench(hasher, logins, concurrency):
+    pwhash = hasher.hash("contraseña-de-prueba")
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pedidos:
+        resultados = list(pedidos.map(
+            lambda _: hasher.verify(pwhash, "contraseña-de-prueba"), range(logins)))
+    duracion = time.perf_counter() - inicio
+    assert all(resultados)
+    return logins / duracion
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--methods", nargs="*",
+                        default=["scrypt", "pbkdf2:sha256:600000", "pbkdf2:sha256:100000"])
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Pedidos de login simultáneos")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="Tamaño del pool de verificación en los modos thread/process")
+    args = parser.parse_args()
+
+    modos = [("inline", 0, "thread"),
+             (f"thread x{args.workers}", args.workers, "thread"),
+             (f"process x{args.workers}", args.workers, "process")]
+
+    print(f"{'método':<28}{'verificación':<16}{'logins/s':>10}")
+    for method in args.methods:
+        for nombre, workers, executor in modos:
+            hasher = PasswordHasher(method=method, workers=workers, executor=executor)
+            try:
+                por_segundo = bench(hasher, args.logins, args.concurrency)
+            finally:
+                hasher.shutdown()
+            print(f"{method:<28}{nombre:<16}{por_segundo:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
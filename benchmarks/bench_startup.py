@@ -0,0 +1,89 @@
+"""
+Benchmark del arranque de la aplicación: tiempo de importación por módulo.
+
+Ejecuta `create_app()` en procesos nuevos con `python -X importtime`, informa
+el tiempo total de arranque (mediana de varias corridas) y los módulos que
+más tardan en importarse. Termina con código 1 si se supera el presupuesto o
+si el arranque carga módulos que deberían importarse recién en el primer uso
+(la pila de Google Sheets), así puede usarse como chequeo en CI.
+
+Uso:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --runs 5 --budget-ms 1000 --top 25
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Módulos que create_app no debe importar: se cargan recién al usar Google Sheets
+PROHIBIDOS = ("googleapiclient", "oauth2client", "httplib2")
+
+_SCRIPT = """
+import sys, time
+inicio = time.perf_counter()
+from app import create_app
+create_app()
+print("TOTAL", time.perf_counter() - inicio)
+print("MODULOS", " ".join(sorted(sys.modules)))
+"""
+
+
+def arrancar():
+    """Arranca la app en un proceso nuevo; devuelve (segundos, tiempos por módulo, módulos)."""
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", _SCRIPT],
+                             cwd=raiz, capture_output=True, text=True, check=True)
+    total, modulos = None, set()
+    for linea in proceso.stdout.splitlines():
+        if linea.startswith("TOTAL "):
+            total = float(linea.split()[1])
+        elif linea.startswith("MODULOS "):
+            modulos = set(linea.split()[1:])
+
+    # Formato de -X importtime: "import time: propio | acumulado | [sangría]módulo" (µs)
+    tiempos = {}
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|")
+        tiempos[nombre.strip()] = (int(propio), int(acumulado))
+    return total, tiempos, modulos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget-ms", type=float, default=1000,
+                        help="Máximo aceptable para la mediana del arranque")
+    parser.add_argument("--top", type=int, default=15,
+                        help="Cantidad de módulos a listar")
+    args = parser.parse_args()
+
+    corridas = [arrancar() for _ in range(args.runs)]
+    mediana_ms = statistics.median(total for total, _, _ in corridas) * 1000
+    _, tiempos, modulos = corridas[-1]
+
+    print(f"{'módulo':<50}{'propio ms':>12}{'acumulado ms':>14}")
+    for nombre, (propio, acumulado) in sorted(tiempos.items(), key=lambda t: -t[1][0])[:args.top]:
+        print(f"{nombre:<50}{propio / 1000:>12.1f}{acumulado / 1000:>14.1f}")
+    propios_app = sum(propio for nombre, (propio, _) in tiempos.items()
+                      if nombre == "app" or nombre.startswith("app."))
+    print(f"\nmódulos de app (tiempo propio): {propios_app / 1000:.1f} ms")
+    print(f"arranque (mediana de {args.runs}): {mediana_ms:.1f} ms "
+          f"(presupuesto {args.budget_ms:.0f} ms)")
+
+    errores = []
+    if mediana_ms > args.budget_ms:
+        errores.append(f"el arranque supera el presupuesto de {args.budget_ms:.0f} ms")
+    cargados = sorted(m for m in modulos if m.split(".")[0] in PROHIBIDOS)
+    if cargados:
+        errores.append("create_app importó " + ", ".join(cargados))
+    for error in errores:
+        print(f"ERROR: {error}", file=sys.stderr)
+    sys.exit(1 if errores else 0)
+
+
+if __name__ == "__main__":
+    main()
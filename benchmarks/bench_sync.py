@@ -0,0 +1,122 @@
+"""
+Benchmark de la sincronización de afiliados sin acceso a Google Sheets.
+
+Usa FakeSheetsClient con hojas sintéticas (o una grabada con --fixture) y mide
+por separado la lectura, cada etapa del transformador, el servicio completo y
+la carga en una base SQLite. Con --memory se mide además el pico de memoria de
+cada etapa (tracemalloc agrega overhead, así que los tiempos de esa corrida no
+son comparables con los de una corrida sin --memory).
+
+Uso:
+    python -m benchmarks.bench_sync --rows 1000 20000 200000
+    python -m benchmarks.bench_sync --rows 20000 --memory
+    python -m benchmarks.bench_sync --fixture respuestas.json
+    python -m benchmarks.bench_sync --rows 5000 --record respuestas.json
+"""
+import argparse
+import time
+import tracemalloc
+
+from app import create_app, db
+from app.servicios.fake_sheets_client import FakeSheetsClient
+from app.servicios.loader import AfiliadoBulkLoader
+from app.servicios.repository import GoogleSheetsRepository
+from app.servicios.sheets_service import SheetsService
+from app.servicios.transformer import DataTransformer
+from config import TestingConfig
+
+RANGE_NAME = "Respuestas!A1:CZ"
+
+
+def _medir(nombre, fn, resultados, memoria=False):
+    """Ejecuta fn midiendo tiempo (y pico de memoria si se pide); devuelve su resultado."""
+    if memoria:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = fn()
+    duracion = time.perf_counter() - inicio
+    pico = None
+    if memoria:
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    resultados.append((nombre, duracion, pico))
+    return resultado
+
+
+def bench(client, db_load=True, chunk_rows=1000, memoria=False):
+    resultados = []
+
+    def medir(nombre, fn):
+        return _medir(nombre, fn, resultados, memoria=memoria)
+
+    service = SheetsService(GoogleSheetsRepository(client), DataTransformer())
+    t = DataTransformer
+
+    raw = medir("lectura (read_range)", lambda: client.read_range(RANGE_NAME))
+    headers, rows = raw[0], raw[1:]
+    filas = medir("normalize_empty", lambda: t.normalize_empty(rows, len(headers)))
+    dicts = medir("to_dicts", lambda: t.to_dicts(filas, headers))
+    medir("normalize_input", lambda: t.normalize_input(dicts))
+    del filas, dicts
+    medir("normalize_rows (plan)", lambda: t.normalize_rows(rows, headers))
+    del raw, rows
+
+    data = medir("get_normalized_data", lambda: service.get_normalized_data(RANGE_NAME))
+    medir("iter_normalized_data",
+          lambda: sum(1 for _ in service.iter_normalized_data(RANGE_NAME, chunk_rows=chunk_rows)))
+
+    if db_load:
+        app = create_app(TestingConfig)
+        with app.app_context():
+            db.create_all()
+            medir("carga en la base (lista)", lambda: AfiliadoBulkLoader().load(data))
+            db.drop_all()
+            db.create_all()
+            medir("carga en la base (streaming)",
+                  lambda: AfiliadoBulkLoader().load(
+                      service.iter_normalized_data(RANGE_NAME, chunk_rows=chunk_rows)))
+            # Con las huellas ya guardadas, una recarga de la misma hoja no escribe nada
+            medir("recarga sin cambios", lambda: AfiliadoBulkLoader().load(data))
+    return len(data), resultados
+
+
+def imprimir(filas, resultados):
+    print(f"\n{filas} filas")
+    print(f"{'etapa':<32}{'tiempo (s)':>12}{'filas/s':>12}{'pico MiB':>12}")
+    for nombre, duracion, pico in resultados:
+        por_segundo = filas / duracion if duracion else float("inf")
+        memoria = "-" if pico is None else f"{pico / 2**20:.1f}"
+        print(f"{nombre:<32}{duracion:>12.3f}{por_segundo:>12.0f}{memoria:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="*", default=[1000, 10000],
+                        help="Tamaños de hoja sintética a medir")
+    parser.add_argument("--hijos", type=int, default=7, help="Máximo de hijos por afiliado")
+    parser.add_argument("--sparsity", type=float, default=0.1,
+                        help="Proporción de celdas opcionales vacías")
+    parser.add_argument("--fixture", help="Hoja grabada en JSON (reemplaza --rows)")
+    parser.add_argument("--record", help="Graba la hoja sintética en este archivo JSON")
+    parser.add_argument("--chunk-rows", type=int, default=1000)
+    parser.add_argument("--no-db", action="store_true", help="No medir la carga en la base")
+    parser.add_argument("--memory", action="store_true",
+                        help="Medir el pico de memoria de cada etapa con tracemalloc")
+    args = parser.parse_args()
+
+    if args.fixture:
+        clients = [FakeSheetsClient.from_json(args.fixture)]
+    else:
+        clients = [FakeSheetsClient.synthetic(rows=n, hijos=args.hijos, sparsity=args.sparsity)
+                   for n in args.rows]
+
+    for client in clients:
+        if args.record:
+            client.to_json(args.record)
+        filas, resultados = bench(client, db_load=not args.no_db,
+                                  chunk_rows=args.chunk_rows, memoria=args.memory)
+        imprimir(filas, resultados)
+
+
+if __name__ == "__main__":
+    main()
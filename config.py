@@ -1,8 +1,91 @@
 import os
 
+from dotenv import load_dotenv
+
+# Variables de entorno del archivo .env (flask run / flask CLI ya lo hacen; run.py no)
+load_dotenv()
+
+
+def _engine_options(database_uri):
+    """Engine options for the pooled (non-SQLite) databases, tuned from the environment."""
+    if database_uri.startswith('sqlite'):
+        return {}
+    return {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),  # Persistent connections per worker
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 5)),  # Extra connections under bursts
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),  # Seconds to wait for a free connection
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),  # Recycle before server-side idle timeouts
+        'pool_pre_ping': True,  # Detect dropped connections before using them
+    }
+
+
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY','dev_key') # Default secret key for development
-    SQLALCHEMY_DATABASE_URI =  'sqlite:///database.db'  # Default SQLite database
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///database.db')  # Default SQLite database
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(SQLALCHEMY_DATABASE_URI)
     SQLALCHEMY_TRACK_MODIFICATIONS = False  # Disable track modifications to save resources
     WTF_CSRF_ENABLED = True  # Enable CSRF protection
-    LOGIN_DISABLED = False  # Allow login by default
\ No newline at end of file
+    LOGIN_DISABLED = False  # Allow login by default
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 300))  # Seconds a cached login user stays valid
+    USER_CACHE_MAXSIZE = int(os.environ.get('USER_CACHE_MAXSIZE', 1024))  # Max cached users per process
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')  # werkzeug method, e.g. 'pbkdf2:sha256:600000'
+    PASSWORD_SALT_LENGTH = int(os.environ.get('PASSWORD_SALT_LENGTH', 16))
+    PASSWORD_VERIFY_WORKERS = int(os.environ.get('PASSWORD_VERIFY_WORKERS', 0))  # 0 = verify on the request thread
+    PASSWORD_VERIFY_EXECUTOR = os.environ.get('PASSWORD_VERIFY_EXECUTOR', 'thread')  # 'thread' or 'process'
+    PASSWORD_VERIFY_TIMEOUT = float(os.environ.get('PASSWORD_VERIFY_TIMEOUT', 10))  # Seconds a login waits on the verify pool before answering 503
+    INSTRUMENTACION_HABILITADA = os.environ.get('INSTRUMENTACION_HABILITADA', '0') == '1'  # Per-request timing, Server-Timing and /metrics
+    METRICS_PATH = '/metrics'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # Bearer token that can read METRICS_PATH from any address
+    METRICS_ALLOWED_NETWORKS = os.environ.get('METRICS_ALLOWED_NETWORKS', '127.0.0.1/32,::1/128')  # Comma-separated CIDRs that can read METRICS_PATH without token (behind a proxy this is the proxy's address)
+    GOOGLE_APPLICATION_CREDENTIALS = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')  # Service account JSON file
+    SPREADSHEET_ID = os.environ.get('SPREADSHEET_ID')  # Part of the sheet URL between "/d/" and "/edit"
+    RANGE_NAME = os.environ.get('RANGE_NAME')
+    SHEETS_CACHE_TTL = float(os.environ.get('SHEETS_CACHE_TTL', 300))  # Seconds /sync serves the sheet from memory
+    SHEETS_DISCOVERY_CACHE = os.environ.get(
+        'SHEETS_DISCOVERY_CACHE',
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'sheets_v4_discovery.json'),
+    )  # Sheets API discovery document kept on disk for offline starts
+    SYNC_JOB_WORKERS = int(os.environ.get('SYNC_JOB_WORKERS', 1))  # Background sync threads; 1 runs jobs one at a time
+    SYNC_JOB_BATCH_SIZE = int(os.environ.get('SYNC_JOB_BATCH_SIZE', 500))  # Afiliados per batch / progress update
+    SYNC_JOB_LATIDO = float(os.environ.get('SYNC_JOB_LATIDO', 30))  # Seconds between heartbeats of this process's running sync jobs
+    SYNC_JOB_VENCIMIENTO = float(os.environ.get('SYNC_JOB_VENCIMIENTO', 300))  # Seconds without heartbeat after which a job is failed as interrupted
+    SYNC_API_TOKEN = os.environ.get('SYNC_API_TOKEN')  # Bearer token for POST /api/afiliados/sync; without it only logged-in users can queue syncs
+
+    # PRAGMAs applied to every SQLite connection (ignored for other databases)
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',  # Readers don't block the writer and vice versa
+        'synchronous': 'NORMAL',  # Safe with WAL and much cheaper than FULL
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),  # ms to wait on a locked database
+        'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 268435456)),  # Memory-mapped I/O (256 MiB)
+    }
+
+
+class DevelopmentConfig(Config):
+    pass
+
+
+class ProductionConfig(Config):
+    SECRET_KEY = os.environ.get('SECRET_KEY')  # Must be provided in production
+
+
+class TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL', 'sqlite://')  # In-memory database
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(SQLALCHEMY_DATABASE_URI)
+    WTF_CSRF_ENABLED = False
+
+
+config_by_name = {
+    'development': DevelopmentConfig,
+    'production': ProductionConfig,
+    'testing': TestingConfig,
+}
+
+
+def get_config(name=None):
+    """Config class for the given profile name, or for APP_ENV (default: development)."""
+    name = name or os.environ.get('APP_ENV', 'development')
+    try:
+        return config_by_name[name]
+    except KeyError:
+        raise ValueError(f"Unknown APP_ENV '{name}'. Options: {', '.join(config_by_name)}") from None
@@ -51,6 +51,23 @@ def get_metadata():
     return target_db.metadata
 
 
+# Objetos de la búsqueda creados a mano en la migración c5e8a2d47b19, que no
+# están en los modelos: la tabla FTS5 AFILIADOS_BUSQUEDA con sus tablas internas
+# (SQLite) y los índices de trigramas (PostgreSQL). Sin este filtro, autogenerate
+# propone borrarlos.
+BUSQUEDA_TABLAS = 'AFILIADOS_BUSQUEDA'
+BUSQUEDA_INDICES = {'ix_afiliados_busqueda_trgm', 'ix_conyuges_nombre_apellido_trgm',
+                    'ix_hijos_nombre_apellido_trgm'}
+
+
+def include_name(name, type_, parent_names):
+    if type_ == 'table':
+        return not name.startswith(BUSQUEDA_TABLAS)
+    if type_ == 'index':
+        return name not in BUSQUEDA_INDICES
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -65,7 +82,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_name=include_name
     )
 
     with context.begin_transaction():
@@ -93,6 +111,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_name", include_name)
 
     connectable = get_engine()
 
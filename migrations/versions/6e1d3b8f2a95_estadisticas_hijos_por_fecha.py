@@ -0,0 +1,43 @@
+"""estadisticas hijos por fecha
+
+Revision ID: 6e1d3b8f2a95
+Revises: f2a7c9e1d384
+Create Date: 2026-10-18 23:41:07.318245
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e1d3b8f2a95'
+down_revision = 'f2a7c9e1d384'
+branch_labels = None
+depends_on = None
+
+
+estadisticas = sa.table('ESTADISTICAS', sa.column('dimension', sa.String()),
+                        sa.column('valor', sa.String()), sa.column('cantidad', sa.Integer()))
+hijos = sa.table('HIJOS', sa.column('fecha_nacimiento', sa.Date()))
+
+
+def _reemplazar(anterior, nueva, agrupar, valor):
+    # Se vuelven a contar los hijos con la nueva granularidad, desde HIJOS
+    conexion = op.get_bind()
+    conexion.execute(sa.delete(estadisticas).where(estadisticas.c.dimension == anterior))
+    consulta = sa.select(agrupar, sa.func.count()).group_by(agrupar)
+    filas = [{'dimension': nueva, 'valor': valor(agrupado), 'cantidad': cantidad}
+             for agrupado, cantidad in conexion.execute(consulta)]
+    if filas:
+        op.bulk_insert(estadisticas, filas)
+
+
+def upgrade():
+    # Los hijos se cuentan por fecha de nacimiento y no por año, para calcular edades exactas
+    _reemplazar('hijos_anio_nacimiento', 'hijos_fecha_nacimiento',
+                hijos.c.fecha_nacimiento, lambda fecha: fecha.isoformat())
+
+
+def downgrade():
+    _reemplazar('hijos_fecha_nacimiento', 'hijos_anio_nacimiento',
+                sa.extract('year', hijos.c.fecha_nacimiento), lambda anio: str(int(anio)))
@@ -0,0 +1,144 @@
+"""busqueda afiliados
+
+Revision ID: c5e8a2d47b19
+Revises: a91f6c3d8e25
+Create Date: 2026-10-18 19:02:11.482903
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5e8a2d47b19'
+down_revision = 'a91f6c3d8e25'
+branch_labels = None
+depends_on = None
+
+
+# Letras con tilde y su reemplazo: los nombres se indexan sin tildes para que
+# "maria" encuentre "María" (el tokenizador trigram ya ignora mayúsculas)
+CON_TILDE = 'áéíóúüñÁÉÍÓÚÜÑ'
+SIN_TILDE = 'aeiouunAEIOUUN'
+
+
+# SQLite: tabla FTS5 con tokenizador trigram (rowid = AFILIADOS.id), mantenida por triggers.
+# "familiares" junta los nombres de cónyuges e hijos del afiliado.
+#
+# IMPORTANTE: en SQLite, batch_alter_table recrea la tabla (copia, DROP y rename) y los
+# triggers de la tabla original se pierden con el DROP. Una migración posterior que use
+# batch_alter_table sobre AFILIADOS, CONYUGES o HIJOS tiene que volver a crear los
+# triggers de esa tabla (SQLITE_UPGRADE) y recalcular AFILIADOS_BUSQUEDA, o la búsqueda
+# deja de actualizarse. La tabla FTS5 y sus tablas internas quedan fuera de
+# autogenerate por el filtro include_name de migrations/env.py.
+def _sin_tildes(expresion):
+    for con, sin in zip(CON_TILDE, SIN_TILDE):
+        expresion = f"replace({expresion}, '{con}', '{sin}')"
+    return expresion
+
+
+def _familiares(id_afiliado):
+    return _sin_tildes(
+        "coalesce((SELECT group_concat(nombre_apellido, ' ') FROM ("
+        f"SELECT nombre_apellido FROM CONYUGES WHERE id_afiliado = {id_afiliado} "
+        f"UNION ALL SELECT nombre_apellido FROM HIJOS WHERE id_afiliado = {id_afiliado})), '')"
+    )
+
+
+def _nombres(fila):
+    return f"{_sin_tildes(f'{fila}.apellido')}, {_sin_tildes(f'{fila}.nombre')}"
+
+
+def _actualizar_familiares(id_afiliado):
+    return (f"UPDATE AFILIADOS_BUSQUEDA SET familiares = {_familiares(id_afiliado)} "
+            f"WHERE rowid = {id_afiliado};")
+
+
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE AFILIADOS_BUSQUEDA USING fts5("
+    "apellido, nombre, dni, numero_legajo, familiares, tokenize = 'trigram')",
+    "INSERT INTO AFILIADOS_BUSQUEDA (rowid, apellido, nombre, dni, numero_legajo, familiares) "
+    f"SELECT id, {_nombres('AFILIADOS')}, dni, numero_legajo, {_familiares('AFILIADOS.id')} "
+    "FROM AFILIADOS",
+    "CREATE TRIGGER afiliados_busqueda_ai AFTER INSERT ON AFILIADOS BEGIN "
+    "INSERT INTO AFILIADOS_BUSQUEDA (rowid, apellido, nombre, dni, numero_legajo, familiares) "
+    f"VALUES (new.id, {_nombres('new')}, new.dni, new.numero_legajo, {_familiares('new.id')}); "
+    "END",
+    "CREATE TRIGGER afiliados_busqueda_au AFTER UPDATE OF apellido, nombre, dni, numero_legajo "
+    "ON AFILIADOS BEGIN "
+    "UPDATE AFILIADOS_BUSQUEDA SET (apellido, nombre, dni, numero_legajo) = "
+    f"({_nombres('new')}, new.dni, new.numero_legajo) WHERE rowid = new.id; "
+    "END",
+    "CREATE TRIGGER afiliados_busqueda_ad AFTER DELETE ON AFILIADOS BEGIN "
+    "DELETE FROM AFILIADOS_BUSQUEDA WHERE rowid = old.id; "
+    "END",
+]
+for _tabla in ("CONYUGES", "HIJOS"):
+    _prefijo = _tabla.lower()
+    SQLITE_UPGRADE += [
+        f"CREATE TRIGGER {_prefijo}_busqueda_ai AFTER INSERT ON {_tabla} BEGIN "
+        f"{_actualizar_familiares('new.id_afiliado')} END",
+        f"CREATE TRIGGER {_prefijo}_busqueda_au AFTER UPDATE OF nombre_apellido, id_afiliado "
+        f"ON {_tabla} BEGIN "
+        f"{_actualizar_familiares('old.id_afiliado')} {_actualizar_familiares('new.id_afiliado')} END",
+        f"CREATE TRIGGER {_prefijo}_busqueda_ad AFTER DELETE ON {_tabla} BEGIN "
+        f"{_actualizar_familiares('old.id_afiliado')} END",
+    ]
+
+SQLITE_DOWNGRADE = [
+    f"DROP TRIGGER IF EXISTS {_tabla}_busqueda_{_evento}"
+    for _tabla in ("hijos", "conyuges", "afiliados")
+    for _evento in ("ad", "au", "ai")
+] + ["DROP TABLE IF EXISTS AFILIADOS_BUSQUEDA"]
+
+# PostgreSQL: índices GIN de trigramas (pg_trgm) sobre los textos sin tildes;
+# los mantiene la propia base
+_TRANSLATE = "translate({}, '" + CON_TILDE + "', '" + SIN_TILDE + "')"
+POSTGRES_UPGRADE = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    'CREATE INDEX ix_afiliados_busqueda_trgm ON "AFILIADOS" USING gin (('
+    + _TRANSLATE.format("apellido || ' ' || nombre || ' ' || dni || ' ' || numero_legajo")
+    + ") gin_trgm_ops)",
+    'CREATE INDEX ix_conyuges_nombre_apellido_trgm ON "CONYUGES" USING gin (('
+    + _TRANSLATE.format("nombre_apellido") + ") gin_trgm_ops)",
+    'CREATE INDEX ix_hijos_nombre_apellido_trgm ON "HIJOS" USING gin (('
+    + _TRANSLATE.format("nombre_apellido") + ") gin_trgm_ops)",
+]
+
+POSTGRES_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_hijos_nombre_apellido_trgm",
+    "DROP INDEX IF EXISTS ix_conyuges_nombre_apellido_trgm",
+    "DROP INDEX IF EXISTS ix_afiliados_busqueda_trgm",
+]
+
+
+def _sentencias(sqlite, postgres):
+    dialecto = op.get_bind().dialect.name
+    if dialecto == 'sqlite':
+        return sqlite
+    if dialecto == 'postgresql':
+        return postgres
+    # Otras bases: la búsqueda usa LIKE sin índice
+    return []
+
+
+def upgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    with op.batch_alter_table('CONYUGES', schema=None) as batch_op:
+        batch_op.create_index('ix_conyuges_id_afiliado', ['id_afiliado'], unique=False)
+
+    # ### end Alembic commands ###
+
+    for sentencia in _sentencias(SQLITE_UPGRADE, POSTGRES_UPGRADE):
+        op.execute(sa.text(sentencia))
+
+
+def downgrade():
+    for sentencia in _sentencias(SQLITE_DOWNGRADE, POSTGRES_DOWNGRADE):
+        op.execute(sa.text(sentencia))
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    with op.batch_alter_table('CONYUGES', schema=None) as batch_op:
+        batch_op.drop_index('ix_conyuges_id_afiliado')
+
+    # ### end Alembic commands ###
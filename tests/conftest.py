@@ -0,0 +1,53 @@
+import os
+
+import pytest
+from flask_migrate import upgrade
+
+from app import create_app, db
+from app.servicios.fake_sheets_client import FakeSheetsClient
+from app.servicios.registro_sheets import sheets
+from config import TestingConfig
+
+MIGRACIONES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "migrations")
+
+RANGO = "Respuestas!A1:AZ"
+
+
+@pytest.fixture
+def configuracion():
+    """Valores de configuración extra; los módulos de tests lo redefinen si necesitan otros."""
+    return {}
+
+
+@pytest.fixture
+def app(tmp_path, configuracion):
+    # Base en archivo (no en memoria): los trabajos de sincronización usan otros hilos
+    class Config(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'test.db'}"
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+        RANGE_NAME = RANGO
+
+    for clave, valor in configuracion.items():
+        setattr(Config, clave, valor)
+
+    app = create_app(Config)
+    with app.app_context():
+        # Las migraciones crean también la tabla FTS5 y los triggers de búsqueda
+        upgrade(directory=MIGRACIONES)
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def hoja(app):
+    """Hoja sintética de 20 respuestas conectada a la aplicación en lugar de Google Sheets."""
+    client = FakeSheetsClient.synthetic(rows=20)
+    sheets.usar_cliente(client, app)
+    return client
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
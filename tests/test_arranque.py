@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos que create_app no debe importar: se cargan recién al usar Google Sheets
+PROHIBIDOS = ("googleapiclient", "oauth2client", "httplib2")
+
+_SCRIPT = """
+import sys
+from app import create_app
+create_app()
+print(" ".join(sorted(sys.modules)))
+"""
+
+
+def test_create_app_no_importa_el_cliente_de_google():
+    # Proceso nuevo: en el de pytest otros tests ya pudieron importar esos módulos
+    proceso = subprocess.run([sys.executable, "-c", _SCRIPT], cwd=RAIZ, capture_output=True,
+                             text=True, timeout=60, env={**os.environ, "APP_ENV": "testing"})
+    assert proceso.returncode == 0, proceso.stderr
+
+    modulos = proceso.stdout.split()
+    assert "flask" in modulos
+    cargados = [m for m in modulos if m.split(".")[0] in PROHIBIDOS]
+    assert cargados == []
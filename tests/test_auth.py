@@ -0,0 +1,76 @@
+import pytest
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from app import db
+from app.models.modelo_login import User
+from app.servicios.passwords import PasswordHasher, password_hasher
+
+
+def _usuario(pwhash):
+    user = User(username="ana", password=pwhash)
+    db.session.add(user)
+    db.session.commit()
+    return user.id
+
+
+def _login(client, password="secreta"):
+    return client.post("/login", data={"username": "ana", "password": password})
+
+
+def test_login_actualiza_un_hash_con_otros_parametros(app, client):
+    anterior = generate_password_hash("secreta", method="pbkdf2:sha256:1000", salt_length=8)
+    id_usuario = _usuario(anterior)
+    assert password_hasher.needs_rehash(anterior)
+
+    respuesta = _login(client)
+
+    assert respuesta.status_code == 302
+    with client.session_transaction() as sesion:
+        assert sesion["_user_id"] == str(id_usuario)
+    nuevo = db.session.get(User, id_usuario).password
+    assert nuevo != anterior
+    assert nuevo.startswith(password_hasher.method_prefix + "$")
+    assert not password_hasher.needs_rehash(nuevo)
+    assert check_password_hash(nuevo, "secreta")
+
+    # Con el hash ya actualizado el login sigue funcionando y no lo vuelve a escribir
+    client.get("/logout")
+    assert _login(client).status_code == 302
+    assert db.session.get(User, id_usuario).password == nuevo
+
+
+def test_login_con_contrasena_incorrecta_no_actualiza_el_hash(app, client):
+    anterior = generate_password_hash("secreta", method="pbkdf2:sha256:1000", salt_length=8)
+    id_usuario = _usuario(anterior)
+
+    respuesta = _login(client, password="otra")
+
+    assert respuesta.status_code == 200
+    assert db.session.get(User, id_usuario).password == anterior
+
+
+def test_verify_respeta_el_timeout_del_pool():
+    hasher = PasswordHasher(method="pbkdf2:sha256:1000", workers=1, timeout=0.05)
+    pwhash = hasher.hash("secreta")
+    assert hasher.verify(pwhash, "secreta")
+
+    # Pool saturado: los dos lugares de espera ocupados
+    hasher._lugares.acquire()
+    hasher._lugares.acquire()
+    try:
+        with pytest.raises(TimeoutError):
+            hasher.verify(pwhash, "secreta")
+    finally:
+        hasher._lugares.release()
+        hasher._lugares.release()
+        hasher.shutdown()
+
+
+def test_login_con_el_pool_saturado_responde_503(app, client, monkeypatch):
+    _usuario(password_hasher.hash("secreta"))
+
+    def saturado(pwhash, password):
+        raise TimeoutError
+
+    monkeypatch.setattr(password_hasher, "verify", saturado)
+    assert _login(client).status_code == 503
@@ -0,0 +1,55 @@
+from app.servicios.busqueda import buscar_afiliados
+from app.servicios.fake_sheets_client import FakeSheetsClient
+from app.servicios.loader import AfiliadoBulkLoader
+from app.servicios.registro_sheets import sheets
+
+from .conftest import RANGO
+
+APELLIDOS = ("Gonzalez Perez", "Perez Gonzalez", "Gonzalezza", "Rodriguez Gonzalez")
+
+
+def _cargar_gonzalez(app):
+    # 600 apellidos que contienen "gonzalez" y, al final (id 601), el apellido exacto
+    client = FakeSheetsClient.synthetic(rows=601, hijos=0)
+    filas = client.sheets["Respuestas"]
+    for n, row in enumerate(filas[1:-1]):
+        row[1] = APELLIDOS[n % len(APELLIDOS)]
+    filas[-1][1] = "Gonzalez"
+    sheets.usar_cliente(client, app)
+    AfiliadoBulkLoader().load(sheets.service.iter_normalized_data(RANGO))
+    return filas[-1]
+
+
+def test_busqueda_pone_primero_la_coincidencia_exacta(app):
+    exacta = _cargar_gonzalez(app)
+
+    data, siguiente = buscar_afiliados({"q": "gonzalez", "limite": "10"})
+
+    assert data[0]["dni"] == exacta[4]
+    assert data[0]["apellido"] == "Gonzalez"
+    assert siguiente == 2
+
+
+def test_busqueda_pagina_todas_las_coincidencias(app):
+    _cargar_gonzalez(app)
+
+    vistos = []
+    pagina = 1
+    while pagina is not None:
+        data, pagina = buscar_afiliados({"q": "gonzalez", "limite": "100", "pagina": str(pagina)})
+        vistos += [afiliado["id"] for afiliado in data]
+
+    assert len(vistos) == 601
+    assert len(set(vistos)) == 601
+
+
+def test_busqueda_ignora_tildes_y_separadores_de_dni(app, hoja):
+    filas = hoja.sheets["Respuestas"]
+    filas[2][1] = "Núñez"
+    AfiliadoBulkLoader().load(sheets.service.iter_normalized_data(RANGO))
+
+    data, _ = buscar_afiliados({"q": "nunez"})
+    assert [afiliado["dni"] for afiliado in data] == [filas[2][4]]
+
+    data, _ = buscar_afiliados({"q": f"{int(filas[3][4]):,}".replace(",", ".")})
+    assert [afiliado["dni"] for afiliado in data] == [filas[3][4]]
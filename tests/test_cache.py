@@ -0,0 +1,131 @@
+import threading
+
+from app.servicios.cache import CachedSheetsService
+
+RANGO = "Respuestas!A1:AZ"
+
+
+class _Servicio:
+    """SheetsService de prueba: cuenta las lecturas y puede quedar frenado hasta `liberar`."""
+
+    def __init__(self, frenar=False):
+        self.lecturas = 0
+        self.version = 1
+        self.liberar = threading.Event()
+        self.leyendo = threading.Event()
+        if not frenar:
+            self.liberar.set()
+
+    def _leer(self):
+        self.lecturas += 1
+        self.leyendo.set()
+        self.liberar.wait(5)
+        return [{"version": self.version}]
+
+    def get_normalized_data(self, range_name):
+        return self._leer()
+
+    def iter_normalized_data(self, range_name):
+        yield from self._leer()
+
+
+def _en_hilos(funcion, cantidad=5):
+    resultados = []
+    hilos = [threading.Thread(target=lambda: resultados.append(funcion())) for _ in range(cantidad)]
+    for hilo in hilos:
+        hilo.start()
+    return hilos, resultados
+
+
+def test_dentro_del_ttl_responde_desde_memoria():
+    servicio = _Servicio()
+    cache = CachedSheetsService(servicio, ttl=300)
+
+    assert cache.get_normalized_data(RANGO) == [{"version": 1}]
+    servicio.version = 2
+    assert cache.get_normalized_data(RANGO) == [{"version": 1}]
+    assert servicio.lecturas == 1
+
+
+def test_vencido_responde_el_dato_viejo_con_un_solo_refresco():
+    servicio = _Servicio()
+    cache = CachedSheetsService(servicio, ttl=0)
+    cache.get_normalized_data(RANGO)
+    servicio.version = 2
+    servicio.liberar.clear()
+    servicio.leyendo.clear()
+
+    # Mientras el refresco está frenado, todas las lecturas reciben el dato anterior
+    for _ in range(5):
+        assert cache.get_normalized_data(RANGO) == [{"version": 1}]
+    assert servicio.leyendo.wait(5)
+    assert servicio.lecturas == 2
+
+    servicio.liberar.set()
+    for hilo in threading.enumerate():
+        if hilo.name.startswith("sheets-refresh-"):
+            hilo.join(5)
+    assert cache.get_normalized_data(RANGO) == [{"version": 2}]
+
+
+def test_invalidate_vuelve_a_leer_la_hoja():
+    servicio = _Servicio()
+    cache = CachedSheetsService(servicio, ttl=300)
+    cache.get_normalized_data(RANGO)
+    servicio.version = 2
+
+    cache.invalidate(RANGO)
+
+    assert cache.get_normalized_data(RANGO) == [{"version": 2}]
+    assert servicio.lecturas == 2
+
+
+def test_lecturas_simultaneas_sin_cache_consultan_una_sola_vez():
+    servicio = _Servicio(frenar=True)
+    cache = CachedSheetsService(servicio, ttl=300)
+
+    hilos, resultados = _en_hilos(lambda: cache.get_normalized_data(RANGO))
+    assert servicio.leyendo.wait(5)
+    servicio.liberar.set()
+    for hilo in hilos:
+        hilo.join(5)
+
+    assert resultados == [[{"version": 1}]] * 5
+    assert servicio.lecturas == 1
+
+
+def test_despues_de_invalidate_se_consulta_una_sola_vez():
+    servicio = _Servicio()
+    cache = CachedSheetsService(servicio, ttl=300)
+    cache.get_normalized_data(RANGO)
+    servicio.liberar.clear()
+    servicio.leyendo.clear()
+    servicio.version = 2
+    cache.invalidate(RANGO)
+
+    hilos, resultados = _en_hilos(lambda: cache.get_con_etag(RANGO)[0])
+    assert servicio.leyendo.wait(5)
+    servicio.liberar.set()
+    for hilo in hilos:
+        hilo.join(5)
+
+    assert resultados == [[{"version": 2}]] * 5
+    assert servicio.lecturas == 2
+
+
+def test_lecturas_durante_un_streaming_sin_cache_esperan_su_resultado():
+    servicio = _Servicio(frenar=True)
+    cache = CachedSheetsService(servicio, ttl=300)
+    items, etag = cache.iter_con_etag(RANGO)
+    assert etag is None
+
+    streaming, resultado = _en_hilos(lambda: list(items), cantidad=1)
+    assert servicio.leyendo.wait(5)
+    hilos, resultados = _en_hilos(lambda: cache.get_normalized_data(RANGO))
+    servicio.liberar.set()
+    for hilo in streaming + hilos:
+        hilo.join(5)
+
+    assert resultado == [[{"version": 1}]]
+    assert resultados == [[{"version": 1}]] * 5
+    assert servicio.lecturas == 1
@@ -0,0 +1,76 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from app import db
+from app.models.modelo_afiliado import Afiliado
+from app.models.modelo_catalogo_kit import CatalogoKit
+from app.servicios.consultas import CONSULTAS_POR_FAMILIA, listar_familias, obtener_afiliado_con_familia
+from app.servicios.kits import AsignadorKits
+from app.servicios.loader import AfiliadoBulkLoader
+from app.servicios.query_counter import max_consultas
+from app.servicios.registro_sheets import sheets
+from app.servicios.serializadores import afiliado_con_familia_a_dict
+
+from .conftest import RANGO
+
+
+@pytest.fixture
+def familias(app, hoja):
+    AfiliadoBulkLoader().load(sheets.service.iter_normalized_data(RANGO))
+    db.session.add_all([
+        CatalogoKit(tipo_kit="inicial", descripcion="Inicial", edad_min=0, edad_max=5, contiene="-"),
+        CatalogoKit(tipo_kit="escolar", descripcion="Escolar", edad_min=6, edad_max=17, contiene="-"),
+    ])
+    db.session.commit()
+    AsignadorKits().asignar(fecha_referencia=date(2026, 3, 1))
+    db.session.expunge_all()
+
+
+def _con_mas_familia():
+    # El afiliado con más hijos: el que más consultas haría con carga perezosa
+    return db.session.execute(
+        select(Afiliado.id).join(Afiliado.hijos).group_by(Afiliado.id)
+        .order_by(func.count().desc()).limit(1)
+    ).scalar_one()
+
+
+def test_afiliado_con_familia_en_consultas_fijas(familias):
+    id_afiliado = _con_mas_familia()
+    db.session.expunge_all()
+
+    with max_consultas(CONSULTAS_POR_FAMILIA):
+        datos = afiliado_con_familia_a_dict(obtener_afiliado_con_familia(id_afiliado))
+
+    assert len(datos["hijos"]) > 1
+    assert any(hijo["kits"] for hijo in datos["hijos"])
+
+
+def test_pagina_completa_de_familias_en_consultas_fijas(familias):
+    total = db.session.scalar(select(func.count()).select_from(Afiliado))
+
+    with max_consultas(CONSULTAS_POR_FAMILIA):
+        afiliados, siguiente = listar_familias({"limite": str(total)})
+        datos = [afiliado_con_familia_a_dict(afiliado) for afiliado in afiliados]
+
+    assert len(datos) == total and siguiente is None
+    assert sum(len(d["hijos"]) for d in datos) > total
+
+
+def test_detalle_de_afiliado_en_consultas_fijas(familias, client):
+    id_afiliado = _con_mas_familia()
+    db.session.expunge_all()
+
+    with max_consultas(CONSULTAS_POR_FAMILIA):
+        respuesta = client.get(f"/api/afiliados/{id_afiliado}")
+
+    assert respuesta.status_code == 200
+    assert len(respuesta.get_json()["data"]["hijos"]) > 1
+
+
+def test_max_consultas_detecta_carga_perezosa(familias):
+    with pytest.raises(AssertionError, match="como máximo 4 consultas"):
+        with max_consultas(4):
+            for afiliado in db.session.scalars(select(Afiliado)):
+                [hijo.kits for hijo in afiliado.hijos]
@@ -0,0 +1,65 @@
+from datetime import date
+
+from flask_migrate import downgrade, upgrade
+
+from app import db
+from app.models.modelo_estadistica import Estadistica
+from app.servicios.estadisticas import DIMENSION_HIJOS, leer_estadisticas, recalcular_estadisticas
+from app.servicios.fake_sheets_client import FakeSheetsClient
+from app.servicios.loader import AfiliadoBulkLoader
+from app.servicios.registro_sheets import sheets
+
+from .conftest import MIGRACIONES, RANGO
+
+REFERENCIA = date(2026, 1, 10)
+
+
+def _cargar(**opciones):
+    AfiliadoBulkLoader(batch_size=7, **opciones).load(sheets.service.iter_normalized_data(RANGO))
+
+
+def test_conteos_incrementales_coinciden_con_el_recalculo(app):
+    client = FakeSheetsClient.synthetic(rows=60, seed=3)
+    sheets.usar_cliente(client, app)
+    filas = client.sheets["Respuestas"]
+    _cargar()
+
+    # Cambios de dimensiones y de hijos, filas nuevas y afiliados que dejan la hoja
+    for row in filas[1:20]:
+        row[12] = "Neuquén"
+        row[17] = "Comuna 99"
+    for row in filas[20:30]:
+        if len(row) > 24:
+            row[24] = "01/01/2015"
+    del filas[45:]
+    filas += FakeSheetsClient.synthetic(rows=70, seed=4).sheets["Respuestas"][61:]
+    _cargar(eliminar_ausentes=True)
+
+    incremental = leer_estadisticas(REFERENCIA)
+    recalcular_estadisticas()
+    assert leer_estadisticas(REFERENCIA) == incremental
+
+
+def test_edad_de_los_hijos_es_exacta(app):
+    db.session.add_all([
+        Estadistica(dimension=DIMENSION_HIJOS, valor="2023-12-15", cantidad=1),  # 2 años
+        Estadistica(dimension=DIMENSION_HIJOS, valor="2023-01-10", cantidad=2),  # 3 años ese día
+        Estadistica(dimension=DIMENSION_HIJOS, valor="2026-03-01", cantidad=1),  # no nació
+    ])
+    db.session.commit()
+
+    hijos = leer_estadisticas(REFERENCIA)["hijos"]
+
+    assert {r["rango"]: r["cantidad"] for r in hijos["por_edad"]} == {
+        "0-2": 1, "3-5": 2, "6-11": 0, "12-17": 0, "18+": 0}
+    assert hijos["por_anio_nacimiento"] == {"2023": 3, "2026": 1}
+
+
+def test_migracion_de_conteos_por_anio_a_por_fecha(app, hoja):
+    _cargar()
+    esperado = leer_estadisticas(REFERENCIA)
+
+    downgrade(directory=MIGRACIONES, revision="f2a7c9e1d384")
+    upgrade(directory=MIGRACIONES)
+
+    assert leer_estadisticas(REFERENCIA) == esperado
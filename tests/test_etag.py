@@ -0,0 +1,51 @@
+from app.servicios.registro_sheets import sheets
+
+URL = "/api/afiliados/sync"
+
+
+def test_primera_respuesta_con_etag_debil(client, hoja):
+    respuesta = client.get(URL)
+
+    assert respuesta.status_code == 200
+    etag, debil = respuesta.get_etag()
+    assert etag and debil
+    assert respuesta.headers["ETag"] == f'W/"{etag}"'
+
+
+def test_if_none_match_responde_304_sin_cuerpo(client, hoja):
+    etag = client.get(URL).headers["ETag"]
+
+    respuesta = client.get(URL, headers={"If-None-Match": etag})
+
+    assert respuesta.status_code == 304
+    assert respuesta.data == b""
+    assert respuesta.headers["ETag"] == etag
+
+
+def test_ndjson_usa_su_propio_etag(client, hoja):
+    etag, _ = client.get(URL).get_etag()
+
+    respuesta = client.get(URL, query_string={"formato": "ndjson"})
+    assert respuesta.status_code == 200
+    assert respuesta.get_etag() == (f"{etag}-ndjson", True)
+    # El ETag del JSON no sirve para la variante NDJSON, y viceversa
+    assert client.get(URL, query_string={"formato": "ndjson"},
+                      headers={"If-None-Match": f'W/"{etag}"'}).status_code == 200
+    assert client.get(URL, headers={"If-None-Match": respuesta.headers["ETag"]}).status_code == 200
+
+    repetida = client.get(URL, query_string={"formato": "ndjson"},
+                          headers={"If-None-Match": respuesta.headers["ETag"]})
+    assert repetida.status_code == 304
+    assert repetida.data == b""
+
+
+def test_un_cambio_en_la_hoja_genera_otro_etag(client, hoja):
+    anterior = client.get(URL).headers["ETag"]
+    hoja.sheets["Respuestas"][1][1] = "Otro Apellido"
+    sheets.cached.invalidate()
+
+    respuesta = client.get(URL, headers={"If-None-Match": anterior})
+
+    assert respuesta.status_code == 200
+    assert respuesta.headers["ETag"] != anterior
+    assert respuesta.get_json()["data"][0]["afiliado"]["apellido"] == "Otro Apellido"
@@ -0,0 +1,32 @@
+import pytest
+
+TOKEN = "secreto-metricas"
+
+
+@pytest.fixture
+def configuracion():
+    return {"INSTRUMENTACION_HABILITADA": True, "METRICS_TOKEN": TOKEN,
+            "METRICS_ALLOWED_NETWORKS": "127.0.0.1/32, 10.1.0.0/16"}
+
+
+def _metricas(client, direccion, **headers):
+    return client.get("/metrics", headers=headers, environ_base={"REMOTE_ADDR": direccion})
+
+
+def test_metricas_desde_red_permitida(client):
+    client.get("/api/afiliados/listado")
+
+    for direccion in ("127.0.0.1", "10.1.2.3"):
+        respuesta = _metricas(client, direccion)
+        assert respuesta.status_code == 200
+        assert b"http_request_seconds_bucket" in respuesta.data
+
+
+def test_metricas_ocultas_fuera_de_las_redes_permitidas(client):
+    assert _metricas(client, "203.0.113.7").status_code == 404
+    assert _metricas(client, "203.0.113.7", Authorization="Bearer otro").status_code == 404
+
+
+def test_metricas_con_token_desde_cualquier_direccion(client):
+    respuesta = _metricas(client, "203.0.113.7", Authorization=f"Bearer {TOKEN}")
+    assert respuesta.status_code == 200
@@ -0,0 +1,72 @@
+from datetime import date
+
+import pytest
+from flask_migrate import downgrade, upgrade
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models.modelo_catalogo_kit import CatalogoKit, Kit
+from app.servicios import kits
+from app.servicios.kits import AsignadorKits
+from app.servicios.loader import AfiliadoBulkLoader
+from app.servicios.registro_sheets import sheets
+from app.servicios.sql import insert_con_conflictos
+
+from .conftest import MIGRACIONES, RANGO
+
+REFERENCIA = date(2026, 3, 1)
+
+
+@pytest.fixture
+def catalogo(app, hoja):
+    AfiliadoBulkLoader().load(sheets.service.iter_normalized_data(RANGO))
+    db.session.add_all([
+        CatalogoKit(tipo_kit="inicial", descripcion="Inicial", edad_min=0, edad_max=5, contiene="-"),
+        CatalogoKit(tipo_kit="escolar", descripcion="Escolar", edad_min=6, edad_max=17, contiene="-"),
+    ])
+    db.session.commit()
+
+
+def _pares():
+    return db.session.execute(
+        select(Kit.id_hijo, Kit.tipo_kit, func.count()).group_by(Kit.id_hijo, Kit.tipo_kit)
+    ).all()
+
+
+def test_asignacion_simultanea_no_duplica_kits(catalogo, monkeypatch):
+    def insert_con_otra_asignacion(session, model):
+        # Otra asignación inserta los mismos kits después de que esta leyó los existentes
+        monkeypatch.setattr(kits, "insert_con_conflictos", insert_con_conflictos)
+        AsignadorKits(session=db.session).asignar(fecha_referencia=REFERENCIA)
+        return insert_con_conflictos(session, model)
+
+    monkeypatch.setattr(kits, "insert_con_conflictos", insert_con_otra_asignacion)
+    resumen = AsignadorKits().asignar(fecha_referencia=REFERENCIA)
+
+    pares = _pares()
+    assert resumen["asignados"] > 0
+    assert len(pares) == resumen["asignados"]
+    assert all(cantidad == 1 for _, _, cantidad in pares)
+
+
+def test_la_base_rechaza_kits_duplicados(catalogo):
+    AsignadorKits().asignar(fecha_referencia=REFERENCIA)
+    id_hijo, tipo_kit, _ = _pares()[0]
+
+    with pytest.raises(IntegrityError):
+        db.session.execute(insert(Kit), [{"id_hijo": id_hijo, "tipo_kit": tipo_kit}])
+    db.session.rollback()
+
+
+def test_migracion_elimina_kits_duplicados(catalogo):
+    downgrade(directory=MIGRACIONES, revision="6e1d3b8f2a95")
+    filas = [{"id_hijo": id_hijo, "tipo_kit": "inicial"} for id_hijo in (1, 2, 3)]
+    db.session.execute(insert(Kit), filas + filas[:2] + [{"id_hijo": 1, "tipo_kit": "escolar"}])
+    db.session.commit()
+
+    upgrade(directory=MIGRACIONES)
+
+    assert sorted((id_hijo, tipo) for id_hijo, tipo, _ in _pares()) == [
+        (1, "escolar"), (1, "inicial"), (2, "inicial"), (3, "inicial")]
+    assert db.session.scalar(select(Kit.id_kit).where(Kit.id_hijo == 1, Kit.tipo_kit == "inicial")) == 1
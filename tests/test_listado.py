@@ -0,0 +1,108 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from app import db
+from app.models.modelo_afiliado import Afiliado
+from app.servicios.fake_sheets_client import FakeSheetsClient
+from app.servicios.loader import AfiliadoBulkLoader
+from app.servicios.registro_sheets import sheets
+
+from .conftest import RANGO
+
+URL = "/api/afiliados/listado"
+
+
+@pytest.fixture
+def afiliados(app):
+    sheets.usar_cliente(FakeSheetsClient.synthetic(rows=60, seed=5), app)
+    AfiliadoBulkLoader().load(sheets.service.iter_normalized_data(RANGO))
+    return db.session.scalars(select(Afiliado).order_by(Afiliado.id)).all()
+
+
+def _paginas(client, **params):
+    """Recorre todas las páginas siguiendo el cursor y devuelve los afiliados."""
+    data, paginas = [], 0
+    while True:
+        respuesta = client.get(URL, query_string=params)
+        assert respuesta.status_code == 200, respuesta.get_json()
+        cuerpo = respuesta.get_json()
+        assert cuerpo["total"] == len(cuerpo["data"])
+        data += cuerpo["data"]
+        paginas += 1
+        if cuerpo["siguiente"] is None:
+            return data, paginas
+        params["cursor"] = cuerpo["siguiente"]
+
+
+def test_el_cursor_recorre_todos_los_afiliados_una_vez(client, afiliados):
+    data, paginas = _paginas(client, limite=7)
+
+    assert [row["id"] for row in data] == [a.id for a in afiliados]
+    assert paginas == 9
+
+
+def test_filtro_por_igualdad_con_varios_valores(client, afiliados):
+    provincias = sorted({a.provincia for a in afiliados})[:2]
+
+    data, _ = _paginas(client, provincia=",".join(provincias), limite=5)
+
+    assert [row["id"] for row in data] == [a.id for a in afiliados if a.provincia in provincias]
+
+
+def test_filtros_combinados_se_mantienen_entre_paginas(client, afiliados):
+    provincia = afiliados[0].provincia
+    dependencia = afiliados[0].relacion_dependencia
+
+    data, _ = _paginas(client, provincia=provincia, relacion_dependencia=dependencia, limite=2)
+
+    assert [row["id"] for row in data] == [
+        a.id for a in afiliados
+        if a.provincia == provincia and a.relacion_dependencia == dependencia]
+
+
+def test_rango_de_fechas_inclusivo(client, afiliados):
+    fechas = sorted(a.fecha_ingreso for a in afiliados)
+    desde, hasta = fechas[10], fechas[40]
+
+    data, _ = _paginas(client, fecha_ingreso_desde=desde.isoformat(),
+                       fecha_ingreso_hasta=hasta.isoformat())
+
+    esperados = [a.id for a in afiliados if desde <= a.fecha_ingreso <= hasta]
+    assert [row["id"] for row in data] == esperados
+    assert len(esperados) >= 31
+
+
+def test_rango_de_creacion_incluye_el_dia_completo(client, afiliados):
+    dia = afiliados[0].marca_temporal_creacion.date()
+
+    data, _ = _paginas(client, creado_desde=dia.isoformat(), creado_hasta=dia.isoformat())
+    assert len(data) == len(afiliados)
+
+    data, _ = _paginas(client, creado_hasta=date(2000, 1, 1).isoformat())
+    assert data == []
+
+
+def test_campos_elegidos_mas_el_id(client, afiliados):
+    data, _ = _paginas(client, campos="apellido,dni", limite=500)
+
+    assert len(data) == len(afiliados)
+    assert all(set(row) == {"id", "apellido", "dni"} for row in data)
+    assert data[0]["dni"] == afiliados[0].dni
+
+
+@pytest.mark.parametrize("params", [
+    {"limite": "0"},
+    {"limite": "501"},
+    {"limite": "muchos"},
+    {"cursor": "no-es-un-cursor"},
+    {"campos": "apellido,clave"},
+    {"fecha_ingreso_desde": "01/02/2020"},
+    {"creado_hasta": "2020-13-01"},
+])
+def test_parametros_invalidos_responden_400(client, afiliados, params):
+    respuesta = client.get(URL, query_string=params)
+
+    assert respuesta.status_code == 400
+    assert respuesta.get_json()["status"] == "error"
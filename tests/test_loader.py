@@ -0,0 +1,134 @@
+from sqlalchemy import func, select
+
+from app import db
+from app.models.modelo_afiliado import Afiliado
+from app.servicios.loader import AfiliadoBulkLoader
+from app.servicios.registro_sheets import sheets
+
+from .conftest import RANGO
+
+
+def _cantidad_afiliados():
+    return db.session.scalar(select(func.count()).select_from(Afiliado))
+
+
+def _rechazos_afiliado(loader):
+    # La hoja sintética también tiene familiares incompletos: solo interesan los afiliados
+    return {motivo: cantidad for motivo, cantidad in loader.rechazos.por_motivo.items()
+            if motivo.startswith("afiliado:")}
+
+
+def test_eliminar_ausentes_sigue_despues_de_una_fila_vacia(hoja):
+    AfiliadoBulkLoader().load(sheets.service.iter_normalized_data(RANGO))
+    # Una fila vacía al final de una ventana no debe cortar la lectura
+    hoja.sheets["Respuestas"][4] = []
+
+    loader = AfiliadoBulkLoader(eliminar_ausentes=True)
+    resumen = loader.load(sheets.service.iter_normalized_data(RANGO, chunk_rows=5))
+
+    assert resumen["eliminados"] == 1
+    assert _cantidad_afiliados() == 19
+
+
+def test_eliminar_ausentes_requiere_lectura_completa(hoja):
+    filas = list(sheets.service.iter_normalized_data(RANGO))
+    AfiliadoBulkLoader().load(filas)
+
+    # Un iterador cualquiera no confirma haber leído la hoja entera
+    loader = AfiliadoBulkLoader(eliminar_ausentes=True)
+    resumen = loader.load(iter(filas[:5]))
+
+    assert resumen["eliminados"] == 0
+    assert loader.eliminacion_omitida is not None
+    assert _cantidad_afiliados() == 20
+
+
+def test_eliminar_ausentes_respeta_el_maximo(hoja):
+    filas = list(sheets.service.iter_normalized_data(RANGO))
+    AfiliadoBulkLoader().load(filas)
+
+    loader = AfiliadoBulkLoader(eliminar_ausentes=True, max_eliminaciones=10)
+    resumen = loader.load(filas[:5])
+
+    assert resumen["ausentes"] == 15
+    assert resumen["eliminados"] == 0
+    assert _cantidad_afiliados() == 20
+
+    loader = AfiliadoBulkLoader(eliminar_ausentes=True, max_eliminaciones=15)
+    assert loader.load(filas[:5])["eliminados"] == 15
+    assert _cantidad_afiliados() == 5
+
+
+def test_simular_eliminacion_lista_los_ausentes(hoja):
+    filas = list(sheets.service.iter_normalized_data(RANGO))
+    AfiliadoBulkLoader().load(filas)
+
+    loader = AfiliadoBulkLoader(eliminar_ausentes=True, simular_eliminacion=True)
+    resumen = loader.load(filas[2:])
+
+    assert resumen["eliminados"] == 0
+    assert sorted(loader.ausentes) == sorted(f["afiliado"]["dni"] for f in filas[:2])
+    assert _cantidad_afiliados() == 20
+
+
+def test_email_repetido_en_el_lote_se_rechaza(hoja):
+    filas = hoja.sheets["Respuestas"]
+    filas[3][6] = filas[2][6]
+
+    loader = AfiliadoBulkLoader()
+    resumen = loader.load(sheets.service.iter_normalized_data(RANGO))
+
+    assert resumen["omitidos"] == 1
+    assert _cantidad_afiliados() == 19
+    assert _rechazos_afiliado(loader) == {"afiliado: email repetido en el lote": 1}
+
+
+def test_legajo_y_email_de_otro_afiliado_guardado_se_rechazan(hoja):
+    filas = hoja.sheets["Respuestas"]
+    AfiliadoBulkLoader().load(sheets.service.iter_normalized_data(RANGO))
+    # Respuestas nuevas con el legajo y el email de afiliados ya cargados
+    nuevo_legajo = list(filas[1])
+    nuevo_legajo[4], nuevo_legajo[6] = "40111222", "nuevo1@example.com"
+    nuevo_email = list(filas[2])
+    nuevo_email[4], nuevo_email[16] = "40111333", "999001"
+    filas += [nuevo_legajo, nuevo_email]
+
+    loader = AfiliadoBulkLoader()
+    resumen = loader.load(sheets.service.iter_normalized_data(RANGO))
+
+    assert resumen["omitidos"] == 2
+    assert resumen["insertados"] == 0
+    assert _rechazos_afiliado(loader) == {
+        "afiliado: numero_legajo registrado con otro dni": 1,
+        "afiliado: email registrado con otro dni": 1,
+    }
+    assert _cantidad_afiliados() == 20
+
+
+def test_rechazos_informan_la_fila_de_la_hoja(hoja):
+    filas = hoja.sheets["Respuestas"]
+    filas[7][3] = "31/02/1990"  # fecha_nacimiento inválida en la fila 8 de la hoja
+
+    loader = AfiliadoBulkLoader(batch_size=3)
+    loader.load(sheets.service.iter_normalized_data(RANGO, chunk_rows=5))
+
+    rechazo, = [r for r in loader.rechazos.ejemplos if r["entidad"] == "afiliado"]
+    assert rechazo["fila"] == 8
+    assert rechazo["dni"] == filas[7][4]
+
+
+def test_rechazos_de_una_carga_incremental_informan_la_fila_de_la_hoja(hoja):
+    filas = hoja.sheets["Respuestas"]
+    AfiliadoBulkLoader().load(sheets.service.iter_normalized_data(RANGO))
+    nueva = list(filas[1])
+    nueva[4], nueva[6], nueva[16] = "40555666", "nueva@example.com", "999555"
+    nueva[18] = "sin fecha"
+    filas.append(nueva)
+
+    data, _ = sheets.service.get_incremental_data(RANGO, ultima_fila=21)
+    loader = AfiliadoBulkLoader()
+    loader.load(data)
+
+    rechazo, = [r for r in loader.rechazos.ejemplos if r["entidad"] == "afiliado"]
+    assert rechazo["fila"] == 22
+    assert rechazo["motivo"] == "fecha_ingreso inválido"
@@ -0,0 +1,9 @@
+from flask_migrate import check
+
+from .conftest import MIGRACIONES
+
+
+def test_autogenerate_no_propone_cambios(app):
+    # Los modelos coinciden con las migraciones y la tabla FTS5 de búsqueda (creada a
+    # mano) no aparece como tabla a borrar; check() termina con SystemExit si hay cambios
+    check(directory=MIGRACIONES)
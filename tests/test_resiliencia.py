@@ -0,0 +1,98 @@
+import pytest
+
+from app.servicios.buffer_escritura import AppendIncierto, BufferEscrituraSheets
+from app.servicios.fake_sheets_client import FakeHttpError, FakeSheetsClient
+from app.servicios.resiliencia import CircuitBreaker, CircuitoAbierto, PoliticaReintentos
+
+
+def _politica(**opciones):
+    return PoliticaReintentos(sleep=lambda segundos: None, **opciones)
+
+
+def _hoja(politica):
+    return FakeSheetsClient(sheets={"Hoja": [["a"]]}, default_sheet="Hoja", politica=politica)
+
+
+def test_append_no_se_reintenta_tras_un_error_del_servidor():
+    client = _hoja(_politica())
+    client.inyectar_fallas(503)
+
+    with pytest.raises(FakeHttpError):
+        client.append_rows("Hoja!A1", [["b"]])
+
+    assert client.calls["append_rows"] == 1
+
+
+def test_append_se_reintenta_tras_un_429():
+    client = _hoja(_politica())
+    client.inyectar_fallas(429)
+
+    client.append_rows("Hoja!A1", [["b"]])
+
+    assert client.calls["append_rows"] == 2
+    assert client.sheets["Hoja"] == [["a"], ["b"]]
+
+
+def test_escritura_idempotente_se_reintenta_tras_un_error_del_servidor():
+    client = _hoja(_politica())
+    client.inyectar_fallas(503, 500)
+
+    client.write_range("Hoja!A1", [["z"]])
+
+    assert client.calls["write_range"] == 3
+
+
+def test_circuito_semiabierto_deja_pasar_una_sola_prueba():
+    ahora = [0.0]
+    breaker = CircuitBreaker(umbral=1, tiempo_apertura=10, clock=lambda: ahora[0])
+    breaker.falla()
+    ahora[0] = 11
+
+    breaker.antes()
+    with pytest.raises(CircuitoAbierto):
+        breaker.antes()
+
+    breaker.exito()
+    breaker.antes()
+    breaker.antes()
+
+
+def test_circuito_vuelve_a_abrirse_si_la_prueba_falla():
+    ahora = [0.0]
+    breaker = CircuitBreaker(umbral=1, tiempo_apertura=10, clock=lambda: ahora[0])
+    breaker.falla()
+    ahora[0] = 11
+
+    breaker.antes()
+    breaker.falla()
+    with pytest.raises(CircuitoAbierto):
+        breaker.antes()
+    ahora[0] = 22
+    breaker.antes()
+
+
+def test_buffer_no_reencola_un_append_incierto():
+    client = _hoja(None)
+    buffer = BufferEscrituraSheets(client, intervalo=None)
+    buffer.append_rows("Hoja!A1", [["b"], ["c"]])
+    client.inyectar_fallas(503)
+
+    with pytest.raises(AppendIncierto) as error:
+        buffer.flush()
+
+    assert error.value.filas == [["b"], ["c"]]
+    assert buffer.pendientes == 0
+
+
+def test_buffer_reencola_un_append_rechazado_por_cuota():
+    client = _hoja(None)
+    buffer = BufferEscrituraSheets(client, intervalo=None)
+    buffer.append_rows("Hoja!A1", [["b"]])
+    client.inyectar_fallas(429)
+
+    with pytest.raises(FakeHttpError):
+        buffer.flush()
+    assert buffer.pendientes == 1
+
+    buffer.flush()
+    assert client.sheets["Hoja"] == [["a"], ["b"]]
@@ -0,0 +1,153 @@
+from app.servicios.fake_sheets_client import FakeSheetsClient
+from app.servicios.rangos import RangoA1
+from app.servicios.sheets_client import GoogleSheetsClient
+
+
+def _leer(client, rango, **opciones):
+    return [row for chunk in client.read_range_chunked(rango, **opciones) for row in chunk]
+
+
+def test_lectura_por_ventanas_sigue_despues_de_una_fila_vacia():
+    client = FakeSheetsClient.synthetic(rows=10)
+    hoja = client.sheets["Respuestas"]
+    # Fila 5 de la hoja: la última de la primera ventana de 5 filas
+    hoja[4] = []
+
+    rows = _leer(client, "Respuestas!A1:AZ", chunk_rows=5)
+
+    assert len(rows) == 11
+    assert rows[4] == []
+    assert [row[4] for row in rows if row] == [row[4] for row in hoja if row]
+
+
+def test_lectura_por_ventanas_sigue_despues_de_varias_filas_vacias():
+    client = FakeSheetsClient.synthetic(rows=10)
+    hoja = client.sheets["Respuestas"]
+    hoja[3] = hoja[4] = hoja[5] = []
+
+    for windows_per_request in (1, 2):
+        rows = _leer(client, "Respuestas!A1:AZ", chunk_rows=5,
+                     windows_per_request=windows_per_request)
+        assert len(rows) == 11
+        assert rows[3:6] == [[], [], []]
+
+
+def test_lectura_por_ventanas_omite_filas_vacias_finales():
+    client = FakeSheetsClient.synthetic(rows=10)
+    client.sheets["Respuestas"] += [[] for _ in range(7)]
+
+    assert len(_leer(client, "Respuestas!A1:AZ", chunk_rows=5)) == 11
+
+
+class _Pedido:
+    def __init__(self, respuesta):
+        self.respuesta = respuesta
+
+    def execute(self):
+        return self.respuesta
+
+
+class _ServicioHoja:
+    """
+    Responde spreadsheets().get, values().get y values().batchGet desde una hoja en
+    memoria, como la API real, y guarda los rangos de valores pedidos.
+    """
+
+    def __init__(self, fake):
+        self.fake = fake
+        self.rangos = []
+
+    def spreadsheets(self):
+        return _Planilla(self)
+
+    def values(self):
+        return self
+
+    def get(self, spreadsheetId, range):
+        self.rangos.append(range)
+        return _Pedido({"range": range, "values": self.fake.read_range(range)})
+
+    def batchGet(self, spreadsheetId, ranges):
+        self.rangos.extend(ranges)
+        return _Pedido({"valueRanges": [{"range": rango, "values": self.fake.read_range(rango)}
+                                        for rango in ranges]})
+
+
+class _Planilla:
+    def __init__(self, servicio):
+        self._servicio = servicio
+
+    def values(self):
+        return self._servicio
+
+    def get(self, spreadsheetId, ranges, fields):
+        filas = len(self._servicio.fake.sheets["Respuestas"])
+        return _Pedido({"sheets": [{"properties": {"gridProperties": {"rowCount": filas}}}]})
+
+
+class _Fabrica:
+    def __init__(self, servicio):
+        self._servicio = servicio
+
+    def servicio(self):
+        return self._servicio
+
+    def renovar_credenciales(self):
+        pass
+
+
+def test_cliente_google_sigue_despues_de_una_fila_vacia():
+    fake = FakeSheetsClient.synthetic(rows=10)
+    fake.sheets["Respuestas"][4] = []
+    client = GoogleSheetsClient(credentials_file=None, spreadsheet_id="hoja",
+                                fabrica=_Fabrica(_ServicioHoja(fake)))
+
+    rows = _leer(client, "Respuestas!A1:AZ", chunk_rows=5, windows_per_request=2)
+
+    assert len(rows) == 11
+    assert rows[4] == []
+
+
+def test_lectura_por_ventanas_confirma_el_final_del_rango():
+    client = FakeSheetsClient.synthetic(rows=10)
+    hoja = client.sheets["Respuestas"]
+    # Datos después de más filas vacías que una ventana completa
+    hoja += [[] for _ in range(12)] + [list(hoja[1])]
+
+    rows = _leer(client, "Respuestas!A1:AZ", chunk_rows=5)
+
+    assert len(rows) == len(hoja)
+    assert rows[-1] == hoja[-1]
+
+
+def test_lectura_por_ventanas_no_lee_de_una_vez_el_resto_del_rango():
+    client = FakeSheetsClient.synthetic(rows=10)
+    hoja = client.sheets["Respuestas"]
+    hoja += [[] for _ in range(30)] + [list(hoja[1]), list(hoja[2])] + [[] for _ in range(8)]
+
+    rows = _leer(client, "Respuestas!A1:AZ", chunk_rows=5)
+
+    assert len(rows) == 43
+    assert rows[-2:] == hoja[41:43]
+    assert "read_range" not in client.calls
+    assert client.calls["filas_grilla"] == 1
+    # 51 filas de grilla en ventanas de 5
+    assert client.calls["read_range_chunked"] == 11
+
+
+def test_cliente_google_lee_por_ventanas_despues_de_un_tramo_vacio():
+    fake = FakeSheetsClient.synthetic(rows=10)
+    hoja = fake.sheets["Respuestas"]
+    hoja += [[] for _ in range(30)] + [list(hoja[1])] + [[] for _ in range(4)]
+    servicio = _ServicioHoja(fake)
+    client = GoogleSheetsClient(credentials_file=None, spreadsheet_id="hoja",
+                                fabrica=_Fabrica(servicio))
+
+    rows = _leer(client, "Respuestas!A1:AZ", chunk_rows=5, windows_per_request=2)
+
+    assert len(rows) == 42
+    assert rows[-1] == hoja[41]
+    # Todos los pedidos son ventanas acotadas, ninguno abierto hasta el final de la hoja
+    ventanas = [RangoA1.parse(rango) for rango in servicio.rangos]
+    assert all(v.fila_fin is not None and v.fila_fin - v.fila_inicio < 5 for v in ventanas)
+    assert ventanas[-1].fila_fin == len(hoja)
@@ -0,0 +1,70 @@
+import gzip
+import json
+
+import pytest
+
+URL = "/api/afiliados/sync"
+
+
+@pytest.fixture
+def esperado(client, hoja):
+    """Respuesta tradicional (no streaming), contra la que se comparan las demás."""
+    return client.get(URL).get_json()
+
+
+def test_stream_devuelve_el_mismo_objeto_json(client, esperado):
+    respuesta = client.get(URL, query_string={"stream": "1"})
+
+    assert respuesta.status_code == 200
+    assert respuesta.is_streamed
+    assert respuesta.mimetype == "application/json"
+    assert "Content-Encoding" not in respuesta.headers
+    cuerpo = json.loads(respuesta.get_data())
+    assert cuerpo["data"] == esperado["data"]
+    assert cuerpo["total"] == len(esperado["data"])
+    assert cuerpo["status"] == "ok"
+
+
+@pytest.mark.parametrize("pedido", [
+    {"query_string": {"formato": "ndjson"}},
+    {"headers": {"Accept": "application/x-ndjson"}},
+])
+def test_ndjson_una_linea_por_afiliado(client, esperado, pedido):
+    respuesta = client.get(URL, **pedido)
+
+    assert respuesta.mimetype == "application/x-ndjson"
+    lineas = respuesta.get_data(as_text=True).splitlines()
+    assert [json.loads(linea) for linea in lineas] == esperado["data"]
+
+
+def test_stream_sin_cache_lee_la_hoja_en_streaming(client, hoja):
+    # Primera lectura: la cache está vacía, los datos vienen de la hoja y no hay ETag
+    respuesta = client.get(URL, query_string={"formato": "ndjson"})
+
+    assert "ETag" not in respuesta.headers
+    assert len(respuesta.get_data(as_text=True).splitlines()) == 20
+    # Al recorrerla completa, quedó en la cache
+    assert "ETag" in client.get(URL, query_string={"formato": "ndjson"}).headers
+
+
+@pytest.mark.parametrize("formato", ["ndjson", "json-stream"])
+def test_gzip_si_el_cliente_lo_acepta(client, esperado, formato):
+    respuesta = client.get(URL, query_string={"formato": formato},
+                           headers={"Accept-Encoding": "br;q=1.0, gzip;q=0.8"})
+
+    assert respuesta.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in respuesta.headers["Vary"]
+    texto = gzip.decompress(respuesta.get_data()).decode()
+    if formato == "ndjson":
+        assert [json.loads(linea) for linea in texto.splitlines()] == esperado["data"]
+    else:
+        assert json.loads(texto)["data"] == esperado["data"]
+
+
+@pytest.mark.parametrize("aceptadas", ["gzip;q=0", "identity", "br"])
+def test_sin_gzip_si_el_cliente_no_lo_acepta(client, esperado, aceptadas):
+    respuesta = client.get(URL, query_string={"stream": "1"},
+                           headers={"Accept-Encoding": aceptadas})
+
+    assert "Content-Encoding" not in respuesta.headers
+    assert json.loads(respuesta.get_data())["data"] == esperado["data"]
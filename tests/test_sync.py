@@ -0,0 +1,132 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from app import db
+from app.models.modelo_afiliado import Afiliado
+from app.models.modelo_login import User
+from app.models.modelo_sync_job import SyncJob
+from app.servicios.sync_jobs import sync_jobs
+from app.servicios.sync_state import SincronizacionConcurrente, SyncStateRepository
+
+from .conftest import RANGO
+
+
+def test_get_incremental_no_escribe_en_la_base(client, hoja):
+    response = client.get("/api/afiliados/sync?modo=incremental")
+
+    assert response.status_code == 400
+    assert db.session.scalar(select(func.count()).select_from(Afiliado)) == 0
+    assert SyncStateRepository().get(RANGO).ultima_fila == 0
+
+
+def test_carga_incremental_por_cli_avanza_la_marca_de_agua(app, hoja):
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=["afiliados", "cargar", "--incremental"])
+    assert result.exit_code == 0, result.output
+    assert SyncStateRepository().get(RANGO).ultima_fila == 21
+
+    hoja.sheets["Respuestas"].append(list(hoja.sheets["Respuestas"][1]))
+    hoja.sheets["Respuestas"][-1][4] = "40999888"
+    hoja.sheets["Respuestas"][-1][6] = "nuevo@example.com"
+    hoja.sheets["Respuestas"][-1][16] = "999999"
+    result = runner.invoke(args=["afiliados", "cargar", "--incremental"])
+    assert result.exit_code == 0, result.output
+    assert "Insertados: 1" in result.output
+    assert SyncStateRepository().get(RANGO).ultima_fila == 22
+
+
+def test_avanzar_no_pisa_el_avance_de_otra_sincronizacion(app):
+    estados = SyncStateRepository()
+    estados.get(RANGO)
+    db.session.commit()
+
+    estados.avanzar(RANGO, 0, 10, [])
+    db.session.commit()
+    # Otra sincronización que también había leído desde la fila 0
+    with pytest.raises(SincronizacionConcurrente):
+        estados.avanzar(RANGO, 0, 15, [])
+    db.session.rollback()
+
+    assert estados.get(RANGO).ultima_fila == 10
+
+
+def _job(client, **kwargs):
+    return client.post("/api/afiliados/sync?modo=incremental", **kwargs)
+
+
+def test_encolar_sync_requiere_autorizacion(app, client, hoja):
+    app.config["SYNC_API_TOKEN"] = "secreto"
+
+    assert _job(client).status_code == 401
+    assert _job(client, headers={"Authorization": "Bearer otro"}).status_code == 401
+
+    response = _job(client, headers={"Authorization": "Bearer secreto"})
+    assert response.status_code == 202
+    sync_jobs.shutdown(wait=True)
+
+
+def test_encolar_sync_acepta_usuarios_con_sesion(app, client, hoja):
+    usuario = User(username="admin", password="x")
+    db.session.add(usuario)
+    db.session.commit()
+    with client.session_transaction() as sesion:
+        sesion["_user_id"] = str(usuario.id)
+        sesion["_fresh"] = True
+
+    assert _job(client).status_code == 202
+    sync_jobs.shutdown(wait=True)
+
+
+def test_solo_se_marcan_los_trabajos_con_el_latido_vencido(app, client, hoja):
+    viejo = datetime.now() - timedelta(seconds=sync_jobs.vencimiento + 1)
+    db.session.add_all([
+        SyncJob(modo="completo", estado=SyncJob.EN_CURSO, propietario="otro:1", latido=viejo),
+        SyncJob(modo="completo", estado=SyncJob.PENDIENTE, propietario="otro:2"),
+        # Corre en otro worker que sigue vivo
+        SyncJob(modo="completo", estado=SyncJob.EN_CURSO, propietario="otro:3",
+                latido=datetime.now()),
+        SyncJob(modo="completo", estado=SyncJob.COMPLETADO, propietario="otro:1", latido=viejo),
+    ])
+    db.session.commit()
+
+    # Iniciar la aplicación no toca los trabajos
+    sync_jobs.init_app(app)
+    assert db.session.scalars(select(SyncJob.estado).order_by(SyncJob.id)).all() == [
+        SyncJob.EN_CURSO, SyncJob.PENDIENTE, SyncJob.EN_CURSO, SyncJob.COMPLETADO]
+
+    app.config["SYNC_API_TOKEN"] = "secreto"
+    assert _job(client, headers={"Authorization": "Bearer secreto"}).status_code == 202
+    sync_jobs.shutdown(wait=True)
+
+    db.session.expire_all()
+    assert db.session.scalars(select(SyncJob.estado).order_by(SyncJob.id)).all() == [
+        SyncJob.ERROR, SyncJob.ERROR, SyncJob.EN_CURSO, SyncJob.COMPLETADO, SyncJob.COMPLETADO]
+
+
+def test_el_latido_renueva_solo_los_trabajos_activos_del_proceso(app):
+    viejo = datetime(2026, 1, 1)
+    db.session.add_all([
+        SyncJob(modo="completo", estado=SyncJob.EN_CURSO, propietario=sync_jobs.propietario,
+                latido=viejo),
+        SyncJob(modo="completo", estado=SyncJob.EN_CURSO, propietario="otro:1", latido=viejo),
+        SyncJob(modo="completo", estado=SyncJob.COMPLETADO, propietario=sync_jobs.propietario,
+                latido=viejo),
+    ])
+    db.session.commit()
+
+    assert sync_jobs.renovar_latidos() == 1
+    latidos = db.session.scalars(select(SyncJob.latido).order_by(SyncJob.id)).all()
+    assert latidos[0] > viejo and latidos[1:] == [viejo, viejo]
+
+
+def test_sync_devuelve_los_afiliados_sin_numero_de_fila(client, hoja):
+    data = client.get("/api/afiliados/sync").get_json()["data"]
+    assert data and all(set(row) == {"afiliado", "conyuge", "hijos"} for row in data)
+
+    lineas = client.get("/api/afiliados/sync?formato=ndjson").get_data(as_text=True).splitlines()
+    assert len(lineas) == len(data)
+    assert all(set(json.loads(linea)) == {"afiliado", "conyuge", "hijos"} for linea in lineas)
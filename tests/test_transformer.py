@@ -0,0 +1,63 @@
+import pytest
+
+from app.servicios.fake_sheets_client import FakeSheetsClient
+from app.servicios.transformer import DataTransformer
+
+
+@pytest.fixture(scope="module")
+def hoja():
+    """Encabezados y filas crudas: celdas vacías, filas recortadas, con y sin cónyuge, 0 a 7 hijos."""
+    headers, *rows = FakeSheetsClient.synthetic(rows=400, sparsity=0.3, seed=11).sheets["Respuestas"]
+    return headers, rows
+
+
+def _pipeline_anterior(headers, rows):
+    completas = DataTransformer.normalize_empty(rows, len(headers))
+    return DataTransformer.normalize_input(DataTransformer.to_dicts(completas, headers))
+
+
+def test_la_hoja_cubre_los_casos_del_formulario(hoja):
+    headers, rows = hoja
+    normalizadas = _pipeline_anterior(headers, rows)
+
+    assert {len(row["hijos"]) for row in normalizadas} == set(range(8))
+    assert any(len(row) < len(headers) for row in rows)
+    assert any("" in row for row in rows)
+    assert any(all(v == "no_dato" for v in row["conyuge"].values()) for row in normalizadas)
+    assert any(all(v != "no_dato" for v in row["conyuge"].values()) for row in normalizadas)
+
+
+def test_mapping_plan_equivale_al_pipeline_anterior(hoja):
+    headers, rows = hoja
+
+    assert DataTransformer.normalize_rows(rows, headers) == _pipeline_anterior(headers, rows)
+
+
+def test_generadores_equivalen_a_los_metodos_de_listas(hoja):
+    headers, rows = hoja
+    completas = DataTransformer.normalize_empty(rows, len(headers))
+    dicts = DataTransformer.to_dicts(completas, headers)
+
+    assert list(DataTransformer.iter_normalize_empty(iter(rows), len(headers))) == completas
+    assert list(DataTransformer.iter_dicts(iter(completas), headers)) == dicts
+    assert list(DataTransformer.iter_normalize_input(iter(dicts))) == \
+        DataTransformer.normalize_input(dicts)
+    assert list(DataTransformer.iter_normalize_rows(iter(rows), headers)) == \
+        DataTransformer.normalize_rows(rows, headers)
+
+
+def test_pipeline_de_generadores_es_perezoso_y_equivalente(hoja):
+    headers, rows = hoja
+    leidas = []
+
+    def origen():
+        for row in rows:
+            leidas.append(row)
+            yield row
+
+    salida = DataTransformer.iter_normalize_input(DataTransformer.iter_dicts(
+        DataTransformer.iter_normalize_empty(origen(), len(headers)), headers))
+
+    primera = next(salida)
+    assert len(leidas) == 1
+    assert [primera, *salida] == _pipeline_anterior(headers, rows)
@@ -0,0 +1,43 @@
+from app import db
+from app.models.modelo_login import User
+from app.servicios.user_cache import user_cache
+
+
+def _usuario():
+    user = User(username="ana", password="hash-1")
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def test_commit_descarta_lo_cacheado_entre_flush_y_commit(app):
+    user = _usuario()
+    user.password = "hash-2"
+    db.session.flush()
+    # Otro pedido lee la fila confirmada (todavía la vieja) y la guarda en la cache
+    user_cache.cache.set(user.id, {"id": user.id, "username": "ana", "password": "hash-1"})
+
+    db.session.commit()
+
+    assert user_cache.cache.get(user.id) is None
+    assert user_cache.get_user(user.id).password == "hash-2"
+
+
+def test_rollback_descarta_valores_no_confirmados(app):
+    user = _usuario()
+    user.password = "hash-2"
+    db.session.flush()
+    assert user_cache.get_user(user.id).password == "hash-2"
+
+    db.session.rollback()
+
+    assert user_cache.cache.get(user.id) is None
+    assert user_cache.get_user(user.id).password == "hash-1"
+
+
+def test_alta_invalida_un_id_cacheado(app):
+    user_cache.cache.set(1, {"id": 1, "username": "viejo", "password": "x"})
+
+    _usuario()
+
+    assert user_cache.get_user(1).username == "ana"